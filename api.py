@@ -5,15 +5,30 @@ FastAPI-based REST API for mental health text classification
 Run with: uvicorn api:app --reload --port 8000
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-import joblib
-import numpy as np
-from typing import Dict, List
+from typing import Annotated, Dict, List, Optional
+import asyncio
+import hmac
+import json
 import os
+import tempfile
+import time
 from datetime import datetime
 
+from batcher import MicroBatcher
+from cache import PredictionCache, config_fingerprint, whole_text_config
+from executor import ExecutorSaturated, InferenceExecutor
+from inference import MIN_TEXT_LENGTH, aggregate_segments, class_names, find_model_versions, split_segments
+from limits import PayloadLimitMiddleware
+from metrics import BATCH_SIZE_BUCKETS, MetricsRegistry, StartupTimer
+from registry import ModelWatcher, load_version
+from responses import COMPACT_MEDIA_TYPE, FastJSONResponse, encode_compact_batch, wants_compact
+from store import PredictionStore
+from streaming import iter_chunks, iter_file_blocks, iter_ndjson_records, skip_until
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Mental Health Text Classifier API",
@@ -33,11 +48,167 @@ app.add_middleware(
 # Global variables for model and vectorizer
 model = None
 vectorizer = None
-class_names = ["Stress", "Depression", "Bipolar", "Personality", "Anxiety"]
+scorer = None  # model itself, or its precompiled LinearKernel
+featurizer = None  # vectorizer itself, or its precompiled FastTfidfFeaturizer
+model_version = None  # timestamp suffix of the loaded model file
+active_model = None  # registry.LoadedModel currently serving
+model_lock = asyncio.Lock()  # serializes reloads
+
+MODELS_DIR = "models"
+
+# Precompiled scoring kernel: "float64" (default), "float32" or "off" to use sklearn
+LINEAR_KERNEL = os.getenv("LINEAR_KERNEL", "float64")
+
+# Precompiled TF-IDF featurizer: "1" (default) or "0" to use vectorizer.transform
+FAST_TFIDF = os.getenv("FAST_TFIDF", "1") == "1"
+
+# Artifact format: "joblib" (default) unpickles the sklearn objects, "compiled"
+# memory-maps models/compiled_<version>/ written by `python artifacts.py`, and
+# "runtime" scores those artifacts with the numpy-only backend in runtime.py
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "joblib")
+
+# Ensemble models (ensemble.py): override the saved combination strategy with
+# "vote", "average" or "cascade", and the cascade's confidence threshold
+ENSEMBLE = {
+    "strategy": os.getenv("ENSEMBLE_STRATEGY"),
+    "threshold": float(os.environ["CASCADE_THRESHOLD"]) if os.getenv("CASCADE_THRESHOLD") else None,
+}
+
+# Seconds between checks of models/ for a newly published model (0 disables);
+# /admin/reload-model is disabled unless ADMIN_TOKEN is set, and then requires
+# it in the X-Admin-Token header
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Texts longer than LONG_TEXT_THRESHOLD characters are split into segments of
+# about SEGMENT_LENGTH characters, scored SEGMENTS_PER_JOB per executor job
+LONG_TEXT_THRESHOLD = int(os.getenv("LONG_TEXT_THRESHOLD", "10000"))
+SEGMENT_LENGTH = int(os.getenv("SEGMENT_LENGTH", "2000"))
+SEGMENTS_PER_JOB = int(os.getenv("SEGMENTS_PER_JOB", "16"))
+
+# Settings a result depends on besides the model version. Cache and store
+# keys include their fingerprint, so results scored under other settings (an
+# old cascade threshold, another segment length) are never served here.
+# Texts scored whole share keys with the Streamlit app, which scores the same
+# way; segmented texts also fingerprint the segment length
+SCORING_CONFIG = whole_text_config(float32=LINEAR_KERNEL == "float32", ensemble=ENSEMBLE)
+SEGMENTED_CONFIG = config_fingerprint({"scoring": SCORING_CONFIG, "segment_length": SEGMENT_LENGTH})
+
+# LRU prediction cache: max entries (0 disables) and time-to-live in seconds (0 = no expiry)
+prediction_cache = PredictionCache(
+    maxsize=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("PREDICTION_CACHE_TTL", "3600")),
+    config=SCORING_CONFIG,
+)
+
+# Persistent prediction store shared by all workers and restarts (store.py):
+# SQLite file path (unset disables), rows kept, rows per batched write and
+# seconds between background flushes
+PREDICTION_STORE = os.getenv("PREDICTION_STORE")
+prediction_store = PredictionStore(
+    PREDICTION_STORE,
+    max_entries=int(os.getenv("PREDICTION_STORE_MAX_ENTRIES", "1000000")),
+    batch_size=int(os.getenv("PREDICTION_STORE_BATCH", "256")),
+    flush_interval=float(os.getenv("PREDICTION_STORE_FLUSH_INTERVAL", "1")),
+) if PREDICTION_STORE else None
+store_flusher = None  # background task flushing prediction_store
+
+# Inference runs off the event loop: "thread" or "process" pool, worker count
+# (default min(4, CPUs)) and how many extra jobs may queue before we return 503
+inference_executor = InferenceExecutor(
+    kind=os.getenv("INFERENCE_EXECUTOR", "thread"),
+    workers=int(os.getenv("INFERENCE_WORKERS", "0")) or None,
+    queue_limit=int(os.getenv("INFERENCE_QUEUE_LIMIT", "64")),
+)
+
+# Executor jobs one request may have in flight at once (default a quarter of
+# the pool's capacity), so a batch or stream of long texts cannot fill it alone
+MAX_JOBS_PER_REQUEST = int(os.getenv("MAX_JOBS_PER_REQUEST", "0")) or max(1, inference_executor.capacity // 4)
+
+# Micro-batching of concurrent /predict calls: collection window in ms (0 disables)
+# and the largest batch scored in one call
+micro_batcher = MicroBatcher(
+    inference_executor.predict_batch,
+    window_ms=float(os.getenv("MICRO_BATCH_WINDOW_MS", "0")),
+    max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "32")),
+)
+
+# Records scored per vectorized chunk on /stream-predict
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "256"))
+
+# Request bodies above this many bytes are spooled to a temp file, not memory
+STREAM_SPOOL_BYTES = int(os.getenv("STREAM_SPOOL_BYTES", str(8 * 1024 * 1024)))
+
+# Hard caps: request body bytes on /predict, /batch-predict and /explain
+# (rejected with 413 before parsing) and characters per text (422)
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", "1000000"))
+MAX_TEXT_LENGTH = int(os.getenv("MAX_TEXT_LENGTH", "200000"))
+
+# Prometheus-style metrics served on /metrics
+metrics = MetricsRegistry()
+http_requests = metrics.counter("http_requests_total", "HTTP requests by endpoint, method and status")
+http_errors = metrics.counter("http_request_errors_total", "HTTP requests that returned a 4xx/5xx status")
+http_latency = metrics.histogram("http_request_duration_seconds", "End-to-end request latency by endpoint")
+stage_latency = metrics.histogram(
+    "inference_stage_duration_seconds",
+    "Latency per inference stage: validation, transform, decision_function, softmax, explanation, serialization"
+)
+batch_sizes = metrics.histogram("inference_batch_size", "Texts scored per model call", BATCH_SIZE_BUCKETS)
+cache_events = metrics.counter("prediction_cache_events_total", "Prediction cache hits, misses, evictions and expirations")
+cache_size = metrics.gauge("prediction_cache_entries", "Entries currently in the prediction cache")
+executor_in_flight = metrics.gauge("inference_executor_in_flight", "Inference jobs running or queued")
+executor_rejected = metrics.counter("inference_executor_rejected_total", "Inference jobs shed because the queue was full")
+model_load_seconds = metrics.gauge("model_load_seconds", "Time to load, compile and warm up the active model")
+startup_seconds = metrics.gauge("startup_seconds", "Seconds from process start to each startup phase")
+
+# Startup milestones; serve.py replaces this with a timer started before its imports
+startup = StartupTimer()
+PREDICTION_ENDPOINTS = ("/predict", "/batch-predict", "/stream-predict", "/explain")
+
+# /stream-predict spools its body to disk and is not capped
+app.add_middleware(
+    PayloadLimitMiddleware,
+    max_bytes=MAX_REQUEST_BYTES,
+    paths=("/predict", "/batch-predict", "/explain"),
+)
+
+def observe_inference(timings: Dict[str, float], batch_size: int):
+    """Record stage timings and batch size reported by the inference executor"""
+    for stage, seconds in timings.items():
+        stage_latency.observe(seconds, stage=stage)
+    batch_sizes.observe(batch_size)
+
+inference_executor.observer = observe_inference
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count requests and time them end to end, plus response serialization"""
+    request.state.received_at = time.perf_counter()
+    response = await call_next(request)
+    finished = time.perf_counter()
+    
+    route = request.scope.get("route")
+    endpoint = route.path if route is not None else "unmatched"
+    http_requests.inc(endpoint=endpoint, method=request.method, status=str(response.status_code))
+    if response.status_code >= 400:
+        http_errors.inc(endpoint=endpoint, status=str(response.status_code))
+    http_latency.observe(finished - request.state.received_at, endpoint=endpoint)
+    if response.status_code == 200 and endpoint in PREDICTION_ENDPOINTS:
+        startup.mark("first_prediction")
+    
+    handler_done = getattr(request.state, "handler_done", None)
+    if handler_done is not None:
+        stage_latency.observe(finished - handler_done, stage="serialization")
+    return response
+
+def observe_validation(request: Request):
+    """Time from receiving the request to entering the handler (body parsing + validation)"""
+    stage_latency.observe(time.perf_counter() - request.state.received_at, stage="validation")
 
 # Request/Response models
 class TextInput(BaseModel):
-    text: str = Field(..., min_length=10, description="Text to classify (minimum 10 characters)")
+    text: str = Field(..., min_length=10, max_length=MAX_TEXT_LENGTH,
+                      description="Text to classify (minimum 10 characters)")
     
     class Config:
         json_schema_extra = {
@@ -46,48 +217,283 @@ class TextInput(BaseModel):
             }
         }
 
+class ExplainInput(TextInput):
+    top_k: int = Field(10, ge=1, le=100, description="Number of tokens to return")
+
 class PredictionResponse(BaseModel):
     predicted_class: str
     class_number: int
     confidence_scores: Dict[str, float]
     timestamp: str
     text_length: int
+    model_version: Optional[str] = None
+    segments: Optional[List[Dict]] = None  # per-segment scores of long texts
 
 class HealthResponse(BaseModel):
     status: str
     model_loaded: bool
     version: str
     timestamp: str
+    model_version: Optional[str] = None
+
+async def activate_model(version: str):
+    """
+    Load a matched model/vectorizer pair in the background and swap it in
+    
+    The current model keeps serving while the new one loads and warms up;
+    the swap itself happens on the event loop with no await in between, so
+    every request sees either the old pipeline or the new one. Requests
+    already scoring finish on the old version.
+    """
+    global model, vectorizer, scorer, featurizer, model_version, active_model
+    
+    async with model_lock:
+        loaded = await asyncio.to_thread(
+            load_version, version, MODELS_DIR,
+            model_format=MODEL_FORMAT, linear_kernel=LINEAR_KERNEL, fast_tfidf=FAST_TFIDF,
+            ensemble=ENSEMBLE,
+        )
+        await inference_executor.restart(
+            model_path=loaded.model_path,
+            vectorizer_path=loaded.vectorizer_path,
+            linear_kernel=LINEAR_KERNEL,
+            fast_tfidf=FAST_TFIDF,
+            compiled_dir=loaded.compiled_dir,
+            scorer=loaded.scorer,
+            featurizer=loaded.featurizer,
+            runtime=loaded.model_format == "runtime",
+            ensemble=ENSEMBLE,
+            explainer=loaded.explainer,
+            version=loaded.version,
+        )
+        
+        model, vectorizer = loaded.model, loaded.vectorizer
+        scorer, featurizer = loaded.scorer, loaded.featurizer
+        model_version = loaded.version
+        active_model = loaded
+        prediction_cache.set_model_version(loaded.version)
+        model_load_seconds.set(loaded.load_seconds, version=loaded.version)
+        
+        print(f"✅ Model loaded successfully: {os.path.basename(loaded.model_path)}")
+        print(f"✅ Vectorizer loaded successfully: {os.path.basename(loaded.vectorizer_path)}")
+        return loaded
+
+model_watcher = ModelWatcher(MODELS_DIR, MODEL_WATCH_INTERVAL, activate_model)
 
 # Load model on startup
 @app.on_event("startup")
 async def load_model():
-    """Load the trained model and vectorizer"""
-    global model, vectorizer
-    
+    """Load the most recent matched model/vectorizer pair"""
     try:
-        models_dir = "models"
+        versions = find_model_versions(MODELS_DIR)
         
-        # Find the most recent model files
-        model_files = [f for f in os.listdir(models_dir) if f.startswith("mental_health_svm_model_")]
-        vectorizer_files = [f for f in os.listdir(models_dir) if f.startswith("tfidf_vectorizer_")]
-        
-        if not model_files or not vectorizer_files:
+        if not versions:
             print("⚠️ Warning: Model files not found!")
-            return
-        
-        # Get the most recent files
-        latest_model = max(model_files)
-        latest_vectorizer = max(vectorizer_files)
-        
-        model = joblib.load(f"{models_dir}/{latest_model}")
-        vectorizer = joblib.load(f"{models_dir}/{latest_vectorizer}")
-        
-        print(f"✅ Model loaded successfully: {latest_model}")
-        print(f"✅ Vectorizer loaded successfully: {latest_vectorizer}")
+        else:
+            await activate_model(versions[-1])
+            startup.mark("model_ready")
         
     except Exception as e:
         print(f"❌ Error loading model: {str(e)}")
+    
+    if MODEL_WATCH_INTERVAL > 0:
+        model_watcher.start()
+
+@app.on_event("startup")
+async def start_micro_batcher():
+    """Start coalescing /predict calls when a batching window is configured"""
+    if micro_batcher.window_ms > 0:
+        micro_batcher.start()
+
+async def flush_prediction_store():
+    """Write buffered results out even when traffic is too light to fill a batch"""
+    while True:
+        await asyncio.sleep(prediction_store.flush_interval)
+        try:
+            await asyncio.to_thread(prediction_store.flush)
+        except Exception as e:
+            print(f"⚠️ Prediction store flush failed: {str(e)}")
+
+@app.on_event("startup")
+async def start_store_flusher():
+    """Flush the persistent prediction store on a timer when one is configured"""
+    global store_flusher
+    if prediction_store is not None:
+        store_flusher = asyncio.create_task(flush_prediction_store())
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """Stop the model watcher, the micro-batcher and the inference worker pool"""
+    await model_watcher.stop()
+    await micro_batcher.stop()
+    inference_executor.shutdown()
+    if store_flusher is not None:
+        store_flusher.cancel()
+    if prediction_store is not None:
+        await asyncio.to_thread(prediction_store.flush)
+
+async def run_jobs(batches: List[List[str]], retry: bool = False) -> List[List]:
+    """
+    Score text batches on the executor, at most MAX_JOBS_PER_REQUEST at a time
+    
+    If a job fails, the others are cancelled (queued ones give their pool slot
+    back at once) before the error is raised. With `retry`, a job shed with
+    ExecutorSaturated is resubmitted on its own after a short wait; jobs that
+    already finished are kept.
+    """
+    slots = asyncio.Semaphore(MAX_JOBS_PER_REQUEST)
+    
+    async def run(batch):
+        async with slots:
+            while True:
+                try:
+                    return await inference_executor.predict_batch(batch)
+                except ExecutorSaturated:
+                    if not retry:
+                        raise
+                await asyncio.sleep(0.05)
+    
+    jobs = [asyncio.ensure_future(run(batch)) for batch in batches]
+    try:
+        return await asyncio.gather(*jobs)
+    except BaseException:
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        raise
+
+async def score_batch(texts: List[str], retry: bool = False) -> List:
+    """
+    Score a batch in one vectorized pass, segmenting any long texts
+    
+    The segments of all long texts are pooled and scored SEGMENTS_PER_JOB per
+    executor job, so a batch of long texts costs a few bounded jobs rather
+    than one or more per text (see run_jobs for `retry`). A document whose
+    segments were scored by two model versions is scored again.
+    """
+    long_docs, segments, short_idx = [], [], []
+    for i, text in enumerate(texts):
+        if len(text) > LONG_TEXT_THRESHOLD:
+            spans = split_segments(text, SEGMENT_LENGTH)
+            long_docs.append((i, spans))
+            segments.extend(text[start:end] for start, end in spans)
+        else:
+            short_idx.append(i)
+    
+    batches = [segments[i:i + SEGMENTS_PER_JOB] for i in range(0, len(segments), SEGMENTS_PER_JOB)]
+    if short_idx:
+        batches.append([texts[i] for i in short_idx])
+    scored = await run_jobs(batches, retry)
+    
+    results = [None] * len(texts)
+    if short_idx:
+        for i, result in zip(short_idx, scored.pop()):
+            results[i] = result
+    segment_results = [result for batch in scored for result in batch]
+    offset, straddled = 0, []
+    for i, spans in long_docs:
+        doc_results = segment_results[offset:offset + len(spans)]
+        offset += len(spans)
+        versions = {result["model_version"] for result in doc_results if result is not None}
+        if len(versions) > 1:
+            # The model was swapped between this document's jobs
+            straddled.append(i)
+            continue
+        results[i] = aggregate_segments(spans, doc_results)
+        results[i]["model_version"] = versions.pop()
+    
+    if straddled:
+        for i, result in zip(straddled, await score_batch([texts[i] for i in straddled], retry)):
+            results[i] = result
+    return results
+
+async def score_text(text: str) -> Dict:
+    """Score one text, through the micro-batcher when it is running"""
+    if len(text) > LONG_TEXT_THRESHOLD:
+        return (await score_batch([text]))[0]
+    if micro_batcher.running:
+        return await micro_batcher.submit(text)
+    return await inference_executor.predict_text(text)
+
+def cache_key(text: str) -> str:
+    """
+    Prediction cache and store key for a text
+    
+    Long texts are segmented by raw character offsets, so texts differing
+    only in case or whitespace can get different results; they are keyed on
+    the raw text, under SEGMENTED_CONFIG.
+    """
+    if len(text) > LONG_TEXT_THRESHOLD:
+        return prediction_cache.key(text, normalize=False, config=SEGMENTED_CONFIG)
+    return prediction_cache.key(text)
+
+async def store_results(items: List):
+    """Queue (key, result) pairs scored by the current model for the persistent store"""
+    # Like the in-memory cache, drop results whose request straddled a model swap
+    prefix = prediction_cache.model_version + ":"
+    items = [(key, result) for key, result in items if key.startswith(prefix)]
+    if items:
+        await asyncio.to_thread(prediction_store.put_many, items)
+
+async def predict_with_cache(text: str) -> Dict:
+    """
+    Predict a single text, serving repeats from the prediction cache and then
+    the persistent store
+    """
+    if not prediction_cache.enabled and prediction_store is None:
+        return await score_text(text)
+    
+    key = cache_key(text)
+    result = prediction_cache.get(key)
+    if result is None and prediction_store is not None:
+        result = await asyncio.to_thread(prediction_store.get, key)
+        if result is not None:
+            prediction_cache.put(key, result)
+    if result is None:
+        result = await score_text(text)
+        prediction_cache.put(key, result)
+        if prediction_store is not None:
+            await store_results([(key, result)])
+    return result
+
+async def predict_batch_with_cache(texts: List[str]) -> List:
+    """
+    Predict a batch, serving cache and persistent store hits directly and
+    scoring only the misses
+    """
+    if not prediction_cache.enabled and prediction_store is None:
+        return await score_batch(texts)
+    
+    results = [None] * len(texts)
+    miss_idx, miss_keys = [], []
+    
+    for i, text in enumerate(texts):
+        if len(text) < MIN_TEXT_LENGTH:
+            continue
+        key = cache_key(text)
+        results[i] = prediction_cache.get(key)
+        if results[i] is None:
+            miss_idx.append(i)
+            miss_keys.append(key)
+    
+    if miss_idx and prediction_store is not None:
+        stored = await asyncio.to_thread(prediction_store.get_many, miss_keys)
+        for i, key in zip(miss_idx, miss_keys):
+            results[i] = stored.get(key)
+            if results[i] is not None:
+                prediction_cache.put(key, results[i])
+        miss_keys = [key for i, key in zip(miss_idx, miss_keys) if results[i] is None]
+        miss_idx = [i for i in miss_idx if results[i] is None]
+    
+    if miss_idx:
+        scored = await score_batch([texts[i] for i in miss_idx])
+        for i, key, result in zip(miss_idx, miss_keys, scored):
+            results[i] = result
+            prediction_cache.put(key, result)
+        if prediction_store is not None:
+            await store_results([(key, result) for key, result in zip(miss_keys, scored) if result is not None])
+    
+    return results
 
 # API Endpoints
 @app.get("/", response_model=Dict)
@@ -100,7 +506,10 @@ async def root():
             "health": "/health",
             "predict": "/predict (POST)",
             "batch_predict": "/batch-predict (POST)",
+            "stream_predict": "/stream-predict (POST, NDJSON)",
             "categories": "/categories",
+            "reload_model": "/admin/reload-model (POST)",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -112,7 +521,8 @@ async def health_check():
         "status": "healthy" if model is not None else "model_not_loaded",
         "model_loaded": model is not None,
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "model_version": model_version
     }
 
 @app.get("/categories", response_model=Dict)
@@ -130,47 +540,96 @@ async def get_categories():
         }
     }
 
+def prediction_response(result: Dict, text_length: int, timestamp: str) -> Dict:
+    """
+    The PredictionResponse fields of a scoring result
+    
+    Endpoints return FastJSONResponse directly, which skips response_model
+    filtering, so the declared fields are picked here (no raw_scores). The
+    model version is the one the executor stamped on the result, so it stays
+    right when the model is swapped while the request is scoring.
+    """
+    response = {
+        "predicted_class": result["predicted_class"],
+        "class_number": result["class_number"],
+        "confidence_scores": result["confidence_scores"],
+        "timestamp": timestamp,
+        "text_length": text_length,
+        "model_version": result["model_version"]
+    }
+    if "segments" in result:
+        response["segments"] = result["segments"]
+    return response
+
 @app.post("/predict", response_model=PredictionResponse)
-async def predict(input_data: TextInput):
+async def predict(input_data: TextInput, request: Request):
     """
     Predict mental health category from text
     
     - **text**: The text to analyze (minimum 10 characters)
     
-    Returns the predicted category with confidence scores
+    Returns the predicted category with confidence scores. Texts longer than
+    LONG_TEXT_THRESHOLD are scored in segments; the response then also lists
+    each segment's span and scores under `segments`.
     """
     if model is None or vectorizer is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
+    observe_validation(request)
+    
     try:
-        # Transform text
-        text_tfidf = vectorizer.transform([input_data.text])
-        
-        # Get prediction
-        prediction = model.predict(text_tfidf)[0]
-        decision_scores = model.decision_function(text_tfidf)[0]
+        result = await predict_with_cache(input_data.text)
         
-        # Normalize to probabilities using softmax
-        exp_scores = np.exp(decision_scores - np.max(decision_scores))
-        normalized_scores = exp_scores / np.sum(exp_scores)
+        # Create response; returning it directly skips response_model re-validation
+        response = prediction_response(result, len(input_data.text), datetime.now().isoformat())
+        request.state.handler_done = time.perf_counter()
+        return FastJSONResponse(response)
         
-        # Create response
-        return {
-            "predicted_class": class_names[prediction],
-            "class_number": int(prediction),
-            "confidence_scores": {
-                class_name: float(score) 
-                for class_name, score in zip(class_names, normalized_scores)
-            },
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@app.post("/explain", response_model=Dict)
+async def explain(input_data: ExplainInput, request: Request):
+    """
+    Predict a text and explain the prediction
+    
+    - **text**: The text to analyze (minimum 10 characters)
+    - **top_k**: How many tokens to return (default 10)
+    
+    Returns the prediction plus, for the tokens that contributed most to the
+    predicted class, each token's TF-IDF weight times coefficient for every
+    class. Prediction and explanation come from the same TF-IDF row. Texts
+    longer than LONG_TEXT_THRESHOLD are segmented as on /predict, and the
+    explanation covers the length-weighted mean of the segment rows, so both
+    endpoints agree on the prediction.
+    """
+    loaded = active_model
+    if loaded is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    if loaded.explainer is None:
+        raise HTTPException(status_code=501, detail="Explanations need a single linear model")
+    
+    observe_validation(request)
+    
+    try:
+        text = input_data.text
+        spans = split_segments(text, SEGMENT_LENGTH) if len(text) > LONG_TEXT_THRESHOLD else None
+        result = await inference_executor.explain(text, input_data.top_k, spans)
+        request.state.handler_done = time.perf_counter()
+        return FastJSONResponse({
+            **result,
             "timestamp": datetime.now().isoformat(),
             "text_length": len(input_data.text)
-        }
-        
+        })
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Explanation error: {str(e)}")
 
 class BatchTextInput(BaseModel):
-    texts: List[str] = Field(..., min_length=1, max_length=100)
+    texts: List[Annotated[str, Field(max_length=MAX_TEXT_LENGTH)]] = Field(..., min_length=1, max_length=100)
     
     class Config:
         json_schema_extra = {
@@ -183,13 +642,18 @@ class BatchTextInput(BaseModel):
         }
 
 @app.post("/batch-predict", response_model=List[PredictionResponse])
-async def batch_predict(input_data: BatchTextInput):
+async def batch_predict(input_data: BatchTextInput, request: Request):
     """
     Predict mental health categories for multiple texts
     
     - **texts**: List of texts to analyze (max 100 texts)
     
-    Returns predictions for all texts
+    Returns predictions for all texts. Valid texts are scored together in a
+    single vectorized pass; texts under 10 characters come back as ERROR rows.
+    
+    Send `Accept: application/vnd.mental-health.batch` for the compact binary
+    format instead: an int32 class index per text plus an N x 5 float32 score
+    matrix (see responses.py).
     """
     if model is None or vectorizer is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
@@ -197,45 +661,164 @@ async def batch_predict(input_data: BatchTextInput):
     if len(input_data.texts) > 100:
         raise HTTPException(status_code=400, detail="Maximum 100 texts allowed per batch")
     
+    observe_validation(request)
+    
     try:
+        predictions = await predict_batch_with_cache(input_data.texts)
+        # Versions that scored the rows: more than one if the model was swapped mid-request
+        versions = sorted({prediction["model_version"] for prediction in predictions if prediction is not None})
+        
+        if wants_compact(request.headers.get("accept")):
+            request.state.handler_done = time.perf_counter()
+            return Response(
+                content=encode_compact_batch(predictions),
+                media_type=COMPACT_MEDIA_TYPE,
+                headers={"X-Model-Version": ",".join(versions), "X-Class-Names": ",".join(class_names)}
+            )
+        
+        timestamp = datetime.now().isoformat()
         results = []
         
-        for text in input_data.texts:
-            if len(text) < 10:
+        for text, prediction in zip(input_data.texts, predictions):
+            if prediction is None:
                 results.append({
                     "predicted_class": "ERROR",
                     "class_number": -1,
                     "confidence_scores": {},
-                    "timestamp": datetime.now().isoformat(),
-                    "text_length": len(text)
+                    "timestamp": timestamp,
+                    "text_length": len(text),
+                    "model_version": model_version
                 })
                 continue
             
-            # Transform and predict
-            text_tfidf = vectorizer.transform([text])
-            prediction = model.predict(text_tfidf)[0]
-            decision_scores = model.decision_function(text_tfidf)[0]
-            
-            # Normalize scores
-            exp_scores = np.exp(decision_scores - np.max(decision_scores))
-            normalized_scores = exp_scores / np.sum(exp_scores)
-            
-            results.append({
-                "predicted_class": class_names[prediction],
-                "class_number": int(prediction),
-                "confidence_scores": {
-                    class_name: float(score) 
-                    for class_name, score in zip(class_names, normalized_scores)
-                },
-                "timestamp": datetime.now().isoformat(),
-                "text_length": len(text)
-            })
+            results.append(prediction_response(prediction, len(text), timestamp))
         
-        return results
+        request.state.handler_done = time.perf_counter()
+        return FastJSONResponse(results)
         
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
 
+async def score_stream_chunk(chunk: List[Dict]) -> List[Dict]:
+    """Score one chunk of stream records, retrying jobs shed while the executor is saturated"""
+    chunk = [
+        {"id": record["id"], "error": "Text too long"} if len(record.get("text", "")) > MAX_TEXT_LENGTH else record
+        for record in chunk
+    ]
+    texts = [record["text"] for record in chunk if "text" in record]
+    predictions = iter(await score_batch(texts, retry=True))
+    
+    results = []
+    for record in chunk:
+        if "error" in record:
+            results.append(record)
+            continue
+        prediction = next(predictions)
+        if prediction is None:
+            results.append({"id": record["id"], "error": "Text too short"})
+            continue
+        results.append({
+            "id": record["id"],
+            "predicted_class": prediction["predicted_class"],
+            "class_number": prediction["class_number"],
+            "confidence_scores": prediction["confidence_scores"]
+        })
+    return results
+
+@app.post("/stream-predict")
+async def stream_predict(request: Request, resume_after: Optional[str] = None):
+    """
+    Classify a large corpus streamed as NDJSON
+    
+    - **body**: one `{"id": ..., "text": ...}` JSON object per line
+    - **resume_after**: id of the last result already received; records up to
+      and including it are skipped so an interrupted job can re-send its input
+    
+    The upload is spooled to a temporary file (the response stream and the
+    request stream cannot both be read concurrently), then records are scored
+    in fixed-size vectorized chunks and results are streamed back as NDJSON as
+    each chunk finishes, so memory use does not grow with the input. The last
+    line is a summary with the final id. Spool writes and reads run in worker
+    threads, so a large upload going to disk does not stall other requests.
+    
+    No result is sent until the whole body has arrived: a client disconnected
+    during the upload has no acknowledged id and must re-send from the start.
+    Split very large corpora into several requests to bound that loss.
+    """
+    if model is None or vectorizer is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    spool = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_BYTES)
+    try:
+        async for block in request.stream():
+            await asyncio.to_thread(spool.write, block)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    
+    async def generate():
+        try:
+            records = skip_until(iter_ndjson_records(iter_file_blocks(spool)), resume_after)
+            processed = errors = 0
+            last_id = resume_after
+            
+            async for chunk in iter_chunks(records, STREAM_CHUNK_SIZE):
+                results = await score_stream_chunk(chunk)
+                processed += len(results)
+                errors += sum("error" in result for result in results)
+                last_id = results[-1]["id"]
+                yield "".join(json.dumps(result) + "\n" for result in results)
+            
+            yield json.dumps({
+                "done": True,
+                "processed": processed,
+                "errors": errors,
+                "last_id": last_id,
+                "model_version": model_version
+            }) + "\n"
+        finally:
+            spool.close()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@app.post("/admin/reload-model", response_model=Dict)
+async def reload_model(version: Optional[str] = None, x_admin_token: Optional[str] = Header(None)):
+    """
+    Load a model version and swap it in without restarting
+    
+    - **version**: timestamp of a matched model/vectorizer pair in models/
+      (defaults to the most recent)
+    
+    Requires ADMIN_TOKEN to be configured and sent as X-Admin-Token.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Model reload is disabled (ADMIN_TOKEN is not set)")
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    
+    versions = find_model_versions(MODELS_DIR)
+    if not versions:
+        raise HTTPException(status_code=404, detail="No model files found")
+    
+    version = version or versions[-1]
+    if version not in versions:
+        raise HTTPException(status_code=404, detail=f"No matched model/vectorizer pair for version {version}")
+    
+    previous_version = model_version
+    try:
+        loaded = await activate_model(version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model reload error: {str(e)}")
+    
+    return {
+        "previous_version": previous_version,
+        "model": loaded.info(),
+        "available_versions": versions
+    }
+
 @app.get("/stats", response_model=Dict)
 async def get_stats():
     """Get model statistics and information"""
@@ -243,15 +826,39 @@ async def get_stats():
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     return {
-        "model_type": "Support Vector Machine (LinearSVC)",
+        "model_type": active_model.model_type(),
         "accuracy": "~81%",
         "num_categories": len(class_names),
         "categories": class_names,
-        "features": "TF-IDF with 5000 features",
+        "features": active_model.features(),
         "training_samples": 5957,
-        "model_status": "loaded"
+        "model_status": "loaded",
+        "model_version": model_version,
+        "model": active_model.info(),
+        "cache": prediction_cache.stats(),
+        "store": await asyncio.to_thread(prediction_store.stats) if prediction_store is not None else None,
+        "executor": inference_executor.stats(),
+        "micro_batching": micro_batcher.stats(),
+        "startup_seconds": startup.phases
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text-format metrics for scraping"""
+    cache_stats = prediction_cache.stats()
+    for event in ("hits", "misses", "evictions", "expirations"):
+        cache_events.set(cache_stats[event], event=event)
+    cache_size.set(cache_stats["size"])
+    
+    executor_stats = inference_executor.stats()
+    executor_in_flight.set(executor_stats["in_flight"])
+    executor_rejected.set(executor_stats["rejected"])
+    
+    for phase, seconds in startup.phases.items():
+        startup_seconds.set(seconds, phase=phase)
+    
+    return metrics.render()
+
 # Run with: uvicorn api:app --reload --port 8000
 if __name__ == "__main__":
     import uvicorn
@@ -1,11 +1,18 @@
 import streamlit as st
-import joblib
-import pandas as pd
-import numpy as np
 from datetime import datetime
+import atexit
+import hashlib
+import io
 import os
-import plotly.graph_objects as go
-import plotly.express as px
+
+# pandas, plotly and joblib are imported where they are used, so the page
+# renders without waiting for libraries a given run may not need
+from artifacts import compiled_dir_for
+from cache import text_key, whole_text_config
+from explain import ExplanationIndex
+from inference import class_names, find_latest_model_files, model_version_from_path, predict_text
+from runtime import load_runtime
+from store import PredictionStore
 
 # Page configuration
 st.set_page_config(
@@ -82,52 +89,98 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+# Texts scored per step of the bulk analysis progress bar
+BULK_CHUNK_SIZE = 1000
+
+# This app scores whole texts in float64 with the ensemble strategy saved in
+# the pickle, like an API worker on default settings does for texts under its
+# LONG_TEXT_THRESHOLD, so both read and write the same prediction store rows
+SCORING_CONFIG = whole_text_config()
+
 @st.cache_resource
 def load_model():
-    """Load the trained model and vectorizer"""
+    """Load the trained model and vectorizer, plus the version they belong to"""
     models_dir = "models"
     
     # Find the most recent model files
-    model_files = [f for f in os.listdir(models_dir) if f.startswith("mental_health_svm_model_")]
-    vectorizer_files = [f for f in os.listdir(models_dir) if f.startswith("tfidf_vectorizer_")]
+    latest = find_latest_model_files(models_dir)
     
-    if not model_files or not vectorizer_files:
+    if latest is None:
         st.error("Model files not found! Please run the training notebook first.")
-        return None, None
+        return None, None, None
+    
+    model_path, vectorizer_path = latest
+    version = model_version_from_path(model_path)
+    
+    # Prefer the memory-mapped compiled artifacts when they have been exported;
+    # the numpy-only runtime scores them without loading sklearn or scipy
+    compiled_dir = compiled_dir_for(model_path)
+    if os.path.isdir(compiled_dir):
+        return (*load_runtime(compiled_dir), version)
     
-    # Get the most recent files
-    latest_model = max(model_files)
-    latest_vectorizer = max(vectorizer_files)
+    import joblib
     
-    model = joblib.load(f"{models_dir}/{latest_model}")
-    vectorizer = joblib.load(f"{models_dir}/{latest_vectorizer}")
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
     
-    return model, vectorizer
+    return model, vectorizer, version
+
+@st.cache_resource
+def load_explainer(model_version, _model, _vectorizer):
+    """Build the per-token explanation index once per model version"""
+    try:
+        return ExplanationIndex.from_pipeline(_model, _vectorizer)
+    except ValueError:
+        return None
+
+@st.cache_resource
+def load_store():
+    """The prediction store shared with the API workers, if PREDICTION_STORE is set"""
+    path = os.getenv("PREDICTION_STORE")
+    if not path:
+        return None
+    # No flush timer here: a put writes once PREDICTION_STORE_FLUSH_INTERVAL has
+    # passed since the last write, and whatever is pending is written at exit
+    store = PredictionStore(
+        path,
+        max_entries=int(os.getenv("PREDICTION_STORE_MAX_ENTRIES", "1000000")),
+        batch_size=int(os.getenv("PREDICTION_STORE_BATCH", "256")),
+        flush_interval=float(os.getenv("PREDICTION_STORE_FLUSH_INTERVAL", "1")),
+    )
+    atexit.register(store.close)
+    return store
 
 def predict_mental_health(text, model, vectorizer):
     """Predict mental health category for given text"""
-    class_names = ["Stress", "Depression", "Bipolar", "Personality", "Anxiety"]
-    
-    # Transform text
-    text_tfidf = vectorizer.transform([text])
-    
-    # Get prediction
-    prediction = model.predict(text_tfidf)[0]
-    confidence_scores = model.decision_function(text_tfidf)[0]
+    return predict_text(text, model, vectorizer)
+
+def read_uploaded_texts(name, data):
+    """Parse an uploaded CSV (any columns) or TXT file (one text per line)"""
+    import pandas as pd
     
-    # Normalize confidence scores to probabilities using softmax
-    exp_scores = np.exp(confidence_scores - np.max(confidence_scores))
-    normalized_scores = exp_scores / np.sum(exp_scores)
+    if name.lower().endswith(".csv"):
+        return pd.read_csv(io.BytesIO(data), dtype=str)
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return pd.DataFrame({"content": [line.strip() for line in lines if line.strip()]})
+
+@st.cache_data(show_spinner=False, max_entries=1000)
+def score_upload_chunk(content_hash, model_version, column, start, near_threshold, _texts, _model, _vectorizer):
+    """
+    Score one chunk of an uploaded file, once per duplicate group
+
+    Memoized on the file's content hash, text column, chunk offset, model
+    version and near-duplicate threshold, so reruns of the script reuse
+    every chunk already scored.
+    """
+    from score_file import score_chunk
     
-    return {
-        'predicted_class': class_names[prediction],
-        'class_number': prediction,
-        'confidence_scores': dict(zip(class_names, normalized_scores)),
-        'raw_scores': dict(zip(class_names, confidence_scores))
-    }
+    return score_chunk(_texts, _model, _vectorizer, near_threshold=near_threshold)
 
-def create_confidence_chart(confidence_scores):
+def create_confidence_chart(confidence_scores, title='Confidence Distribution'):
     """Create a beautiful plotly chart for confidence scores"""
+    import pandas as pd
+    import plotly.graph_objects as go
+    
     df = pd.DataFrame(list(confidence_scores.items()), columns=['Category', 'Confidence'])
     df = df.sort_values('Confidence', ascending=True)
     
@@ -148,7 +201,7 @@ def create_confidence_chart(confidence_scores):
     ))
     
     fig.update_layout(
-        title='Confidence Distribution',
+        title=title,
         xaxis_title='Confidence Score',
         yaxis_title='',
         height=400,
@@ -170,11 +223,14 @@ def main():
     st.markdown("---")
     
     # Load model
-    model, vectorizer = load_model()
+    model, vectorizer, model_version = load_model()
     
     if model is None:
         st.stop()
     
+    explainer = load_explainer(model_version, model, vectorizer)
+    store = load_store()
+    
     # Sidebar with enhanced styling
     with st.sidebar:
         st.image("https://img.icons8.com/clouds/200/000000/mental-health.png", use_container_width=True)
@@ -217,7 +273,7 @@ def main():
         """, unsafe_allow_html=True)
     
     # Main content area with tabs
-    tab1, tab2, tab3 = st.tabs(["🔍 Analyze Text", "📝 Sample Examples", "📈 Statistics"])
+    tab1, tab2, tab3, tab4 = st.tabs(["🔍 Analyze Text", "📝 Sample Examples", "📈 Statistics", "📂 Bulk Analysis"])
     
     with tab1:
         col1, col2 = st.columns([2, 1])
@@ -242,7 +298,21 @@ def main():
             
             if predict_button and user_input.strip():
                 with st.spinner("🤖 Analyzing your text..."):
-                    result = predict_mental_health(user_input, model, vectorizer)
+                    key = text_key(user_input, model_version, config=SCORING_CONFIG)
+                    stored = store.get(key) if store is not None else None
+                    # The explanation comes with the prediction, from the same TF-IDF row,
+                    # so a stored row only saves work when there is nothing to explain
+                    if explainer is not None:
+                        result = explainer.explain(user_input, vectorizer, top_k=10)
+                    else:
+                        result = stored or predict_mental_health(user_input, model, vectorizer)
+                    # Rows the API workers scored are read above; new ones are shared with them
+                    if store is not None and stored is None:
+                        store.put(key, {
+                            **{field: result[field]
+                               for field in ("predicted_class", "class_number", "confidence_scores", "raw_scores")},
+                            "model_version": model_version,
+                        })
                 
                 # Display results with beautiful styling
                 st.markdown("---")
@@ -275,6 +345,8 @@ def main():
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Detailed breakdown
+                import pandas as pd
+                
                 st.markdown("### 🔢 Score Breakdown")
                 scores_df = pd.DataFrame([
                     {
@@ -286,6 +358,19 @@ def main():
                 ])
                 st.dataframe(scores_df, use_container_width=True, hide_index=True)
                 
+                if 'tokens' in result:
+                    st.markdown("### 🔎 Why This Prediction?")
+                    st.caption(f"Words and phrases that raised the {predicted_class} score the most (TF-IDF weight × model coefficient)")
+                    tokens_df = pd.DataFrame([
+                        {
+                            "Term": token["term"],
+                            "TF-IDF": f"{token['tfidf']:.3f}",
+                            **{cat: f"{value:+.3f}" for cat, value in token["contributions"].items()}
+                        }
+                        for token in result['tokens']
+                    ])
+                    st.dataframe(tokens_df, use_container_width=True, hide_index=True)
+                
                 # Interpretation
                 st.markdown("### 💡 Interpretation")
                 if confidence > 0.7:
@@ -412,6 +497,9 @@ def main():
             "F1-Score": [0.81, 0.80, 0.82, 0.77, 0.84]
         }
         
+        import pandas as pd
+        import plotly.graph_objects as go
+        
         df_perf = pd.DataFrame(performance_data)
         
         fig2 = go.Figure()
@@ -431,6 +519,86 @@ def main():
         
         st.plotly_chart(fig2, use_container_width=True)
     
+    with tab4:
+        st.markdown("### 📂 Bulk Analysis")
+        st.markdown("Upload a CSV file (one text per row) or a TXT file (one text per line) to classify every text at once.")
+        
+        uploaded = st.file_uploader("Upload texts", type=["csv", "txt"])
+        
+        if uploaded is not None:
+            import numpy as np
+            from score_file import attach_predictions
+            
+            data = uploaded.getvalue()
+            content_hash = hashlib.sha256(data).hexdigest()
+            df = read_uploaded_texts(uploaded.name, data)
+            
+            columns = list(df.columns)
+            column = st.selectbox(
+                "Text column", columns,
+                index=columns.index("content") if "content" in columns else 0
+            )
+            texts = df[column].fillna("").astype(str).tolist()
+            
+            # Exact duplicates always share one score; near copies only on request
+            near_threshold = None
+            if st.checkbox("Group near-duplicate texts", help="Score one text per group of near copies (e.g. reposts with small edits)"):
+                near_threshold = st.slider("Similarity threshold", 0.5, 1.0, 0.9, 0.05)
+            
+            if not texts:
+                st.warning("⚠️ The uploaded file contains no texts.")
+            else:
+                progress = st.progress(0.0, text="Scoring texts...")
+                class_numbers, confidences, n_scored = [], [], 0
+                for start in range(0, len(texts), BULK_CHUNK_SIZE):
+                    chunk_classes, chunk_confidences, chunk_scored = score_upload_chunk(
+                        content_hash, model_version, column, start, near_threshold,
+                        texts[start:start + BULK_CHUNK_SIZE], model, vectorizer
+                    )
+                    class_numbers.append(chunk_classes)
+                    confidences.append(chunk_confidences)
+                    n_scored += chunk_scored
+                    done = min(start + BULK_CHUNK_SIZE, len(texts))
+                    progress.progress(done / len(texts), text=f"Scored {done:,} of {len(texts):,} texts")
+                progress.empty()
+                
+                results = attach_predictions(df, np.concatenate(class_numbers), np.concatenate(confidences))
+                scored = results[results["class_number"] >= 0]
+                
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Texts", f"{len(results):,}")
+                col2.metric("Classified", f"{len(scored):,}")
+                col3.metric("Too Short", f"{len(results) - len(scored):,}")
+                col4.metric("Dedup Ratio", f"{1 - n_scored / len(scored):.1%}" if len(scored) else "–",
+                            help="Share of classified texts that reused the score of a duplicate")
+                
+                if len(scored):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        shares = scored["predicted_class"].value_counts(normalize=True)
+                        fig = create_confidence_chart(
+                            {name: float(shares.get(name, 0.0)) for name in class_names},
+                            title='Share of Texts per Category'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+                    with col2:
+                        fig = create_confidence_chart(
+                            {name: float(scored[f"confidence_{name}"].mean()) for name in class_names},
+                            title='Mean Confidence per Category'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+                
+                st.markdown("### 📄 Results")
+                st.dataframe(results, use_container_width=True)
+                st.download_button(
+                    "📥 Download Results (CSV)",
+                    results.to_csv(index=False).encode("utf-8"),
+                    file_name=f"predictions_{os.path.splitext(uploaded.name)[0]}.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+                st.caption(f"Model version: {model_version}")
+    
     # Footer
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1,135 @@
+"""
+Compiled Model Artifacts for Mental Health Classifier
+Exports a fitted model/vectorizer pair to raw arrays that load via mmap
+
+Layout of models/compiled_<version>/:
+    metadata.json    tokenizer settings, stop words, class names, shapes
+    weights.npy      (n_features, n_classes) contiguous coef_.T
+    intercept.npy    (n_classes,)
+    classes.npy      (n_classes,)
+    idf.npy          (n_features,)
+    vocabulary.txt   one term per line; line i is feature i (sorted order)
+
+Only weights.npy and intercept.npy stay memory-mapped and shared between
+processes; each loading process keeps private copies of the vocabulary and
+idf (see load_compiled).
+
+Run with: python artifacts.py   (exports the latest model in models/)
+"""
+
+import json
+import os
+
+import numpy as np
+
+from featurizer import FastTfidfFeaturizer
+from inference import LinearKernel, class_names, model_version_from_path
+
+COMPILED_PREFIX = "compiled_"
+FORMAT_VERSION = 1
+
+
+def compiled_dir_for(model_path: str) -> str:
+    """Compiled artifact directory matching a model file's version"""
+    return os.path.join(os.path.dirname(model_path) or ".",
+                        COMPILED_PREFIX + model_version_from_path(model_path))
+
+
+def export_compiled(model, vectorizer, out_dir: str, dtype=np.float64):
+    """Write the compiled artifact directory for a fitted model/vectorizer pair"""
+    if not hasattr(vectorizer, "vocabulary_"):
+        raise ValueError("Compiled artifacts need a vocabulary-based TfidfVectorizer; "
+                         "hashing featurizers are served from their pickle")
+    if not hasattr(model, "coef_"):
+        raise ValueError("Compiled artifacts need a single linear model; "
+                         "ensembles are served from their pickle")
+    featurizer = FastTfidfFeaturizer.from_vectorizer(vectorizer)
+    kernel = LinearKernel.from_model(model, dtype=dtype)
+
+    terms = sorted(featurizer.vocabulary, key=featurizer.vocabulary.get)
+    if [featurizer.vocabulary[t] for t in terms] != list(range(len(terms))):
+        raise ValueError("Vocabulary indices are not contiguous")
+    if any("\n" in term for term in terms):
+        raise ValueError("Vocabulary terms may not contain newlines")
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "weights.npy"), kernel.weights)
+    np.save(os.path.join(out_dir, "intercept.npy"), kernel.intercept)
+    np.save(os.path.join(out_dir, "classes.npy"), kernel.classes_)
+    np.save(os.path.join(out_dir, "idf.npy"), featurizer.idf)
+
+    with open(os.path.join(out_dir, "vocabulary.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(terms))
+
+    metadata = {
+        "format_version": FORMAT_VERSION,
+        "class_names": class_names,
+        "n_features": featurizer.n_features,
+        "dtype": np.dtype(dtype).name,
+        "token_pattern": vectorizer.token_pattern,
+        "lowercase": featurizer.lowercase,
+        "ngram_range": list(featurizer.ngram_range),
+        "norm": featurizer.norm,
+        "sublinear_tf": featurizer.sublinear_tf,
+        "stop_words": sorted(featurizer.stop_words),
+    }
+    with open(os.path.join(out_dir, "metadata.json"), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+    return out_dir
+
+
+def load_compiled(compiled_dir: str, featurizer_cls=FastTfidfFeaturizer):
+    """
+    Load a compiled artifact directory as a (scorer, featurizer) pair
+
+    The weight and intercept arrays are memory-mapped read-only, so every
+    process that loads the same directory shares their pages through the OS
+    page cache. The vocabulary and idf are not shared: each process builds
+    its own term -> index dict from vocabulary.txt and the featurizer keeps a
+    Python list copy of idf, because its tokenizing loop needs hash lookups
+    and plain floats per n-gram. Nothing is unpickled and scikit-learn is
+    never imported. `featurizer_cls` lets the numpy-only runtime
+    (runtime.py) swap in its own featurizer.
+    """
+    with open(os.path.join(compiled_dir, "metadata.json"), encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compiled format: {metadata['format_version']}")
+
+    def mmap(name):
+        return np.load(os.path.join(compiled_dir, name), mmap_mode="r")
+
+    with open(os.path.join(compiled_dir, "vocabulary.txt"), encoding="utf-8") as f:
+        terms = f.read().split("\n")
+
+    featurizer = featurizer_cls(
+        vocabulary=dict(zip(terms, range(len(terms)))),
+        idf=mmap("idf.npy"),
+        stop_words=metadata["stop_words"],
+        token_pattern=metadata["token_pattern"],
+        lowercase=metadata["lowercase"],
+        ngram_range=metadata["ngram_range"],
+        norm=metadata["norm"],
+        sublinear_tf=metadata.get("sublinear_tf", False),
+    )
+    scorer = LinearKernel(mmap("weights.npy"), mmap("intercept.npy"), np.load(os.path.join(compiled_dir, "classes.npy")))
+    return scorer, featurizer
+
+
+def main():
+    import joblib
+    from inference import find_latest_model_files
+
+    latest = find_latest_model_files("models")
+    if latest is None:
+        raise SystemExit("❌ Model files not found in models/")
+
+    model_path, vectorizer_path = latest
+    out_dir = export_compiled(joblib.load(model_path), joblib.load(vectorizer_path),
+                              compiled_dir_for(model_path))
+    print(f"✅ Compiled artifacts written to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
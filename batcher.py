@@ -0,0 +1,130 @@
+"""
+Dynamic micro-batching for the Mental Health Text Classifier API
+Coalesces concurrent single-text requests into one vectorized scoring call
+"""
+
+import asyncio
+from typing import Dict
+
+# Same buckets as the inference_batch_size metric, so the two are comparable
+from metrics import BATCH_SIZE_BUCKETS
+
+
+class MicroBatcher:
+    """
+    Collects texts submitted within `window_ms` (or until `max_batch_size`
+    texts are waiting) and scores them together with `score_batch`, an async
+    callable taking a list of texts and returning one result per text.
+    Each caller's future is resolved with its own row.
+    """
+
+    def __init__(self, score_batch, window_ms: float = 2.0, max_batch_size: int = 32):
+        self.score_batch = score_batch
+        self.window = window_ms / 1000
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.items = 0
+        self.histogram = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.histogram_overflow = 0
+        self._queue = None
+        self._task = None
+        self._pending = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the collector task on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        """Stop collecting and wait for batches already being scored"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def submit(self, text: str):
+        """Queue a text for the next batch and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                except asyncio.CancelledError:
+                    # Stopping mid-collection: score what we already took
+                    self._dispatch_later(loop, batch)
+                    raise
+
+            self._dispatch_later(loop, batch)
+
+    def _dispatch_later(self, loop, batch):
+        """Score in the background so the next batch can start collecting"""
+        task = loop.create_task(self._dispatch(batch))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _dispatch(self, batch):
+        self._record(len(batch))
+        texts = [text for text, _ in batch]
+        try:
+            results = await self.score_batch(texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _record(self, size: int):
+        self.batches += 1
+        self.items += size
+        for bucket in BATCH_SIZE_BUCKETS:
+            if size <= bucket:
+                self.histogram[bucket] += 1
+                return
+        self.histogram_overflow += 1
+
+    def stats(self) -> Dict:
+        """Configuration and observed batch sizes for monitoring"""
+        histogram: Dict[str, int] = {f"le_{bucket}": count for bucket, count in self.histogram.items()}
+        histogram["overflow"] = self.histogram_overflow
+        return {
+            "enabled": self.running,
+            "window_ms": self.window_ms,
+            "max_batch_size": self.max_batch_size,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "batch_size_histogram": histogram,
+        }
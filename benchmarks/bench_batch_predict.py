@@ -0,0 +1,87 @@
+"""
+Benchmark: looped vs batched /batch-predict scoring
+Compares the old per-text transform/predict/decision_function loop against
+the single-pass batched path in inference.py
+
+Run with: python benchmarks/bench_batch_predict.py
+"""
+
+import os
+import sys
+import time
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import class_names, find_latest_model_files, predict_batch
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+SAMPLE_TEXTS = [
+    "I've been feeling really anxious lately and having panic attacks",
+    "I feel empty inside and nothing brings me joy anymore",
+    "Work deadlines are killing me and I feel completely overwhelmed",
+    "Last week I barely slept and started five projects, now I can't get out of bed",
+    "I don't know who I really am, my opinions change depending on who I'm with",
+]
+
+
+def load_latest():
+    """Load the most recent matched model/vectorizer pair from models/"""
+    model_path, vectorizer_path = find_latest_model_files(MODELS_DIR)
+    return joblib.load(model_path), joblib.load(vectorizer_path)
+
+
+def predict_looped(texts, model, vectorizer):
+    """The original per-text loop from api.batch_predict"""
+    results = []
+    for text in texts:
+        if len(text) < 10:
+            results.append(None)
+            continue
+        text_tfidf = vectorizer.transform([text])
+        prediction = model.predict(text_tfidf)[0]
+        decision_scores = model.decision_function(text_tfidf)[0]
+        exp_scores = np.exp(decision_scores - np.max(decision_scores))
+        normalized_scores = exp_scores / np.sum(exp_scores)
+        results.append({
+            "predicted_class": class_names[prediction],
+            "class_number": int(prediction),
+            "confidence_scores": {
+                class_name: float(score)
+                for class_name, score in zip(class_names, normalized_scores)
+            }
+        })
+    return results
+
+
+def time_it(fn, repeats):
+    """Return the best wall-clock time of `repeats` calls, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    model, vectorizer = load_latest()
+    repeats = 20
+
+    print(f"{'batch':>6} {'looped (ms)':>12} {'batched (ms)':>13} {'speedup':>8}")
+    for batch_size in (1, 10, 50, 100):
+        texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(batch_size)]
+
+        looped = predict_looped(texts, model, vectorizer)
+        batched = predict_batch(texts, model, vectorizer)
+        assert [r["class_number"] for r in looped] == [r["class_number"] for r in batched]
+
+        looped_ms = time_it(lambda: predict_looped(texts, model, vectorizer), repeats)
+        batched_ms = time_it(lambda: predict_batch(texts, model, vectorizer), repeats)
+        print(f"{batch_size:>6} {looped_ms:>12.2f} {batched_ms:>13.2f} {looped_ms / batched_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: cold start of joblib pickles vs memory-mapped compiled artifacts
+vs the numpy-only runtime backend
+Each run is a fresh interpreter that imports, loads and scores one text
+
+Run with: python benchmarks/bench_cold_start.py   (after python artifacts.py)
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JOBLIB_LOAD = """
+from inference import find_latest_model_files, load_pipeline
+scorer, featurizer = load_pipeline(*find_latest_model_files("models"))
+"""
+
+COMPILED_LOAD = """
+from artifacts import compiled_dir_for, load_compiled
+from inference import find_latest_model_files
+scorer, featurizer = load_compiled(compiled_dir_for(find_latest_model_files("models")[0]))
+"""
+
+RUNTIME_LOAD = """
+from artifacts import compiled_dir_for
+from inference import find_latest_model_files
+from runtime import load_runtime
+scorer, featurizer = load_runtime(compiled_dir_for(find_latest_model_files("models")[0]))
+"""
+
+PROBE = """
+import time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+{load}
+loaded = time.perf_counter()
+from inference import predict_text
+predict_text("I feel so sad and hopeless, nothing makes me happy anymore", scorer, featurizer)
+done = time.perf_counter()
+import sys
+print(f"{{(loaded - start) * 1000:.2f}} {{(done - start) * 1000:.2f}} {{int('sklearn' in sys.modules)}} {{int('scipy' in sys.modules)}}")
+"""
+
+
+def run(load_code, repeats):
+    """Return (load_ms, first_prediction_ms, imports_sklearn, imports_scipy) medians over fresh processes"""
+    loads, firsts, sklearn, scipy = [], [], 0, 0
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(load=load_code)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        loads.append(float(out[0]))
+        firsts.append(float(out[1]))
+        sklearn, scipy = int(out[2]), int(out[3])
+    return statistics.median(loads), statistics.median(firsts), bool(sklearn), bool(scipy)
+
+
+def main():
+    repeats = 5
+    print(f"{'format':>10} {'load (ms)':>10} {'first prediction (ms)':>22} {'imports sklearn':>16} {'imports scipy':>14}")
+    for name, code in (("joblib", JOBLIB_LOAD), ("compiled", COMPILED_LOAD), ("runtime", RUNTIME_LOAD)):
+        load_ms, first_ms, sklearn, scipy = run(code, repeats)
+        print(f"{name:>10} {load_ms:>10.1f} {first_ms:>22.1f} {str(sklearn):>16} {str(scipy):>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: vocabulary TF-IDF vs hashed TF-IDF featurizers
+Trains a LinearSVC on each featurizer and reports hold-out accuracy,
+transform throughput and pickled artifact sizes side by side
+
+Run with: python benchmarks/bench_featurizers.py data/cleaned_data.csv [--output results.json]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.svm import LinearSVC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from featurizer import FastTfidfFeaturizer, HashingTfidfFeaturizer
+from report import write_results
+
+CANDIDATES = {
+    # The shipped configuration (02_baseline_model.ipynb)
+    "tfidf_5000": lambda: TfidfVectorizer(max_features=5000, stop_words="english", ngram_range=(1, 2)),
+    "hashing_2^14": lambda: HashingTfidfFeaturizer(n_features=2 ** 14),
+    "hashing_2^16": lambda: HashingTfidfFeaturizer(n_features=2 ** 16),
+    "hashing_2^18": lambda: HashingTfidfFeaturizer(n_features=2 ** 18),
+}
+
+
+def texts_per_second(transform, texts, single):
+    """Throughput of one batched call, or of one call per text"""
+    start = time.perf_counter()
+    if single:
+        for text in texts:
+            transform([text])
+    else:
+        transform(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare vocabulary and hashing featurizers")
+    parser.add_argument("data", help="CSV with content and target columns")
+    parser.add_argument("--single", type=int, default=1000, help="Texts timed one call at a time")
+    parser.add_argument("--output", default=None, help="JSON output path (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    df = pd.read_csv(args.data).dropna(subset=["content", "target"])
+    X_train, X_test, y_train, y_test = train_test_split(
+        df["content"].astype(str).tolist(), df["target"].astype(int).tolist(),
+        test_size=0.2, random_state=42, stratify=df["target"],
+    )
+
+    results = []
+    print(f"{'featurizer':>16} {'accuracy':>9} {'batch (texts/s)':>16} {'single (texts/s)':>17} "
+          f"{'vectorizer KB':>14} {'model KB':>9}")
+    for name, make in CANDIDATES.items():
+        vectorizer = make()
+        start = time.perf_counter()
+        model = LinearSVC(random_state=42).fit(vectorizer.fit_transform(X_train), y_train)
+        fit_seconds = time.perf_counter() - start
+
+        transforms = {name: vectorizer.transform}
+        if hasattr(vectorizer, "vocabulary_"):
+            transforms[name + " (fast)"] = FastTfidfFeaturizer.from_vectorizer(vectorizer).transform
+
+        for label, transform in transforms.items():
+            row = {
+                "featurizer": label,
+                "accuracy": round(accuracy_score(y_test, model.predict(transform(X_test))), 4),
+                "fit_seconds": round(fit_seconds, 2),
+                "batch_texts_per_sec": round(texts_per_second(transform, X_test, single=False)),
+                "single_texts_per_sec": round(texts_per_second(transform, X_test[:args.single], single=True)),
+                "vectorizer_kb": round(len(pickle.dumps(vectorizer)) / 1024, 1),
+                "model_kb": round(len(pickle.dumps(model)) / 1024, 1),
+            }
+            results.append(row)
+            print(f"{label:>16} {row['accuracy']:>9.4f} {row['batch_texts_per_sec']:>16,} "
+                  f"{row['single_texts_per_sec']:>17,} {row['vectorizer_kb']:>14,.1f} {row['model_kb']:>9,.1f}")
+
+    write_results("featurizers", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: inference core micro-benchmarks
+Times vectorizer.transform, decision_function and the full predict path for
+short/medium/long texts at several batch sizes, for both the shipped sklearn
+pickles and the compiled serving pipeline (FastTfidfFeaturizer + LinearKernel)
+
+Run with: python benchmarks/bench_inference.py [--output results.json] [--quick]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import warnings
+
+import joblib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import compile_pipeline, find_latest_model_files, predict_batch
+from report import ROOT, write_results
+
+SAMPLE_TEXTS = [
+    "I've been feeling really anxious lately and having panic attacks",
+    "I feel empty inside and nothing brings me joy anymore",
+    "Work deadlines are killing me and I feel completely overwhelmed",
+    "Last week I barely slept and started five projects, now I can't get out of bed",
+    "I don't know who I really am, my opinions change depending on who I'm with",
+]
+
+# Words per text for each length class
+TEXT_LENGTHS = {"short": 12, "medium": 60, "long": 400}
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def make_texts(n_words, count, seed=0):
+    """Deterministic texts of `n_words` words drawn from the sample vocabulary"""
+    rng = random.Random(seed)
+    words = " ".join(SAMPLE_TEXTS).split()
+    return [" ".join(rng.choice(words) for _ in range(n_words)) for _ in range(count)]
+
+
+def time_call(fn, budget_seconds=0.5, min_repeats=5, max_repeats=200):
+    """Median and best wall-clock time of repeated calls, in milliseconds"""
+    samples = []
+    deadline = time.perf_counter() + budget_seconds
+    while len(samples) < max_repeats and (len(samples) < min_repeats or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples), len(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmark the inference core")
+    parser.add_argument("--output", default=None, help="JSON output path (default: benchmarks/results/)")
+    parser.add_argument("--quick", action="store_true", help="Shorter time budget per measurement")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    model_path, vectorizer_path = find_latest_model_files(os.path.join(ROOT, "models"))
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    scorer, featurizer = compile_pipeline(model, vectorizer)
+    budget = 0.1 if args.quick else 0.5
+
+    pipelines = {
+        "sklearn": (model, vectorizer),
+        "compiled": (scorer, featurizer),
+    }
+
+    results = []
+    print(f"{'pipeline':>9} {'stage':>17} {'length':>7} {'batch':>6} {'median (ms)':>12} {'per text (us)':>14}")
+    for length_name, n_words in TEXT_LENGTHS.items():
+        for batch_size in BATCH_SIZES:
+            texts = make_texts(n_words, batch_size)
+            for pipeline_name, (clf, vec) in pipelines.items():
+                X = vec.transform(texts)
+                stages = {
+                    "transform": lambda: vec.transform(texts),
+                    "decision_function": lambda: clf.decision_function(X),
+                    "predict": lambda: predict_batch(texts, clf, vec),
+                }
+                for stage, fn in stages.items():
+                    median_ms, best_ms, repeats = time_call(fn, budget_seconds=budget)
+                    per_text_us = median_ms * 1000 / batch_size
+                    results.append({
+                        "pipeline": pipeline_name,
+                        "stage": stage,
+                        "text_length": length_name,
+                        "words_per_text": n_words,
+                        "batch_size": batch_size,
+                        "median_ms": round(median_ms, 4),
+                        "best_ms": round(best_ms, 4),
+                        "per_text_us": round(per_text_us, 3),
+                        "repeats": repeats,
+                    })
+                    print(f"{pipeline_name:>9} {stage:>17} {length_name:>7} {batch_size:>6} "
+                          f"{median_ms:>12.3f} {per_text_us:>14.2f}")
+
+    write_results("inference", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
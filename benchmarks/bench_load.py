@@ -0,0 +1,128 @@
+"""
+Benchmark: API load test at fixed concurrency levels
+Drives the FastAPI app in-process through httpx's ASGI transport (or a
+running server with --url) and reports throughput and p50/p95/p99 latency
+
+Run with: python benchmarks/bench_load.py [--url http://localhost:8000] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_inference import make_texts
+from report import ROOT, percentiles, write_results
+
+CONCURRENCY_LEVELS = (1, 8, 32, 64)
+BATCH_SIZE = 32
+
+
+def make_payloads(endpoint, count):
+    """Distinct request bodies, so the prediction cache never answers them"""
+    if endpoint == "/predict":
+        return [{"text": text} for text in make_texts(40, count, seed=1)]
+    texts = make_texts(40, count * BATCH_SIZE, seed=1)
+    return [{"texts": texts[i * BATCH_SIZE:(i + 1) * BATCH_SIZE]} for i in range(count)]
+
+
+async def run_level(client, endpoint, payloads, concurrency):
+    """Send every payload with `concurrency` requests in flight at a time"""
+    latencies = []
+    errors = 0
+    queue = iter(payloads)
+
+    async def worker():
+        nonlocal errors
+        for payload in queue:
+            start = time.perf_counter()
+            response = await client.post(endpoint, json=payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "requests_per_sec": round(len(latencies) / elapsed, 2),
+        **percentiles(latencies),
+    }
+
+
+async def run(url, endpoints, requests_per_level):
+    if url is None:
+        # In-process: no network stack, so numbers isolate the app itself
+        os.chdir(ROOT)
+        import api
+
+        await api.load_model()
+        await api.start_micro_batcher()
+        transport = httpx.ASGITransport(app=api.app)
+        base_url = "http://bench"
+    else:
+        api = None
+        transport = None
+        base_url = url
+
+    config = {"target": url or "in-process"}
+    if api is not None:
+        config.update({
+            "model_format": api.MODEL_FORMAT,
+            "cache_size": api.prediction_cache.maxsize,
+            "executor": api.inference_executor.kind,
+            "workers": api.inference_executor.workers,
+            "micro_batch_window_ms": api.micro_batcher.window * 1000,
+        })
+
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+            print(f"{'endpoint':>14} {'conc':>5} {'req/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'errors':>7}")
+            for endpoint in endpoints:
+                payloads = make_payloads(endpoint, requests_per_level)
+                # Warm-up so the first level doesn't pay for lazy init
+                await run_level(client, endpoint, payloads[:20], 4)
+                for concurrency in CONCURRENCY_LEVELS:
+                    result = await run_level(client, endpoint, payloads, concurrency)
+                    results.append(result)
+                    print(f"{endpoint:>14} {concurrency:>5} {result['requests_per_sec']:>9.1f} "
+                          f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                          f"{result['errors']:>7}")
+    finally:
+        if api is not None:
+            await api.shutdown_executor()
+    return config, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the classifier API")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process)")
+    parser.add_argument("--endpoints", nargs="+", default=["/predict", "/batch-predict"])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level")
+    parser.add_argument("--output", default=None, help="JSON output path (default: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    if args.url is None:
+        # Measure the model, not the cache
+        os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+
+    config, results = asyncio.run(run(args.url, args.endpoints, args.requests))
+    write_results("load", {"config": config, "levels": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
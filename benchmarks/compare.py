@@ -0,0 +1,71 @@
+"""
+Compare two benchmark result files and flag regressions
+Matches rows on their identifying fields (pipeline/stage/length/batch size
+or endpoint/concurrency) and compares the timing metric of each
+
+Run with: python benchmarks/compare.py old.json new.json [--threshold 10]
+Exits with status 1 if any row got slower by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+# benchmark name -> (identifying fields, metric where lower is better)
+KEYS = {
+    "inference": (("pipeline", "stage", "text_length", "batch_size"), "median_ms"),
+    "load": (("endpoint", "concurrency"), "p95_ms"),
+}
+
+
+def load_rows(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    results = data["results"]
+    rows = results["levels"] if isinstance(results, dict) else results
+    return data["benchmark"], data["metadata"], rows
+
+
+def compare(old_path, new_path, threshold):
+    """Print per-row changes; returns the number of regressions"""
+    name, old_meta, old_rows = load_rows(old_path)
+    new_name, new_meta, new_rows = load_rows(new_path)
+    if name != new_name:
+        raise SystemExit(f"❌ Cannot compare a '{name}' run with a '{new_name}' run")
+
+    fields, metric = KEYS[name]
+    old_by_key = {tuple(row[f] for f in fields): row for row in old_rows}
+
+    print(f"{name}: {old_meta['commit']} -> {new_meta['commit']} ({metric}, threshold {threshold:.0f}%)")
+    regressions = 0
+    for row in new_rows:
+        key = tuple(row[f] for f in fields)
+        old = old_by_key.get(key)
+        if old is None or not old[metric]:
+            continue
+        change = (row[metric] - old[metric]) / old[metric] * 100
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠️ regression"
+            regressions += 1
+        print(f"  {' / '.join(str(k) for k in key):<45} {old[metric]:>10.3f} -> {row[metric]:>10.3f} "
+              f"({change:+6.1f}%){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old", help="Baseline result JSON")
+    parser.add_argument("new", help="Candidate result JSON")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent (default: 10)")
+    args = parser.parse_args(argv)
+
+    regressions = compare(args.old, args.new, args.threshold)
+    if regressions:
+        print(f"❌ {regressions} regression(s) above {args.threshold:.0f}%")
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Shared helpers for benchmark scripts: run metadata and JSON result files
+
+Every result file records the git commit and library versions it was
+measured with, so two files can be compared with benchmarks/compare.py.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_metadata():
+    """Where and with what a benchmark ran"""
+    import sklearn
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def percentiles(samples_ms):
+    """p50/p95/p99, mean and max of a list of latencies in milliseconds"""
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "mean_ms": round(float(samples.mean()), 4),
+        "max_ms": round(float(samples.max()), 4),
+    }
+
+
+def write_results(name, results, output=None):
+    """Write {"benchmark", "metadata", "results"} as JSON; returns the path"""
+    metadata = run_metadata()
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}_{metadata['commit']}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"benchmark": name, "metadata": metadata, "results": results}, f, indent=2)
+    print(f"✅ Results written to {output}", file=sys.stderr)
+    return output
@@ -0,0 +1,146 @@
+"""
+Prediction cache for the Mental Health Text Classifier
+Bounded in-process LRU cache with TTL, keyed on normalized text + model version
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache lookups
+
+    The vectorizer lowercases and only sees word tokens, so case and runs of
+    whitespace never change a prediction and can be folded together.
+    """
+    return " ".join(text.lower().split())
+
+
+def config_fingerprint(config: Dict) -> str:
+    """Short stable hash of the scoring settings a result depends on"""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def whole_text_config(float32: bool = False, ensemble: Optional[Dict] = None) -> str:
+    """
+    config_fingerprint() of the settings that change whole-text scores
+
+    Every backend (sklearn, LinearKernel, compiled and runtime artifacts,
+    FastTfidfFeaturizer) gives the float64 result except LinearKernel's
+    float32 mode, so only that and an ensemble override count. The API and
+    the Streamlit app therefore agree on keys for texts they both score whole.
+    """
+    overrides = {name: value for name, value in (ensemble or {}).items() if value is not None}
+    return config_fingerprint({"precision": "float32" if float32 else "float64", "ensemble": overrides})
+
+
+def text_key(text: str, model_version: str, normalize: bool = True, config: str = "") -> str:
+    """
+    Cache key: hash of the normalized text plus the model version and, if
+    given, a config_fingerprint() of the scoring settings
+
+    Pass `normalize=False` when the result depends on the raw text, e.g. the
+    character offsets of a segmented long text.
+    """
+    digest = hashlib.sha256((normalize_text(text) if normalize else text).encode("utf-8")).hexdigest()
+    return f"{model_version}:{config}:{digest}" if config else f"{model_version}:{digest}"
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of prediction results
+
+    Entries expire after `ttl` seconds (0 disables expiry) and the least
+    recently used entry is evicted once `maxsize` is reached. A `maxsize` of 0
+    disables caching. Loading a different model version clears the cache.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600, model_version: str = "", config: str = ""):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.model_version = model_version
+        self.config = config  # config_fingerprint() of the scoring settings
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def key(self, text: str, normalize: bool = True, config: Optional[str] = None) -> str:
+        """Key under the current model version; `config` overrides the cache's fingerprint"""
+        return text_key(text, self.model_version, normalize, self.config if config is None else config)
+
+    def set_model_version(self, model_version: str):
+        """Switch to a new model version, dropping entries from the old one"""
+        with self._lock:
+            if model_version != self.model_version:
+                self._entries.clear()
+                self.model_version = model_version
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for `key`, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            result, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: Dict):
+        """Store a result, evicting the least recently used entry if full"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            # Results computed by a model that has since been swapped out are dropped
+            if not key.startswith(self.model_version + ":"):
+                return
+            self._entries[key] = (result, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "model_version": self.model_version,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,172 @@
+"""
+Duplicate detection for batch and bulk scoring
+Groups exact and near-duplicate texts so each group is scored once
+
+Exact duplicates are texts equal after lowercasing and collapsing
+whitespace, which the TF-IDF vectorizers here (lowercase, word tokens)
+turn into identical rows: fanning out one score is lossless.
+
+Near duplicates (optional) are found with MinHash + LSH over word 3-shingles.
+The vectorizer's own n-grams would cost nearly a full featurization pass, so
+shingles are hashed from whitespace tokens (zlib.crc32, stable across
+processes) and sketched with one-permutation hashing: every shingle is
+hashed once into one of NUM_BINS bins and each bin keeps its minimum. Texts
+are grouped greedily: a text joins the first earlier group whose
+representative shares an LSH band and has an estimated Jaccard similarity
+of at least `threshold`, so every member is close to the text that was
+actually scored.
+"""
+
+import zlib
+from itertools import chain
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from cache import normalize_text
+
+NUM_BINS = 64  # the bin is taken from the top 6 bits of the shingle hash
+SHINGLE_SIZE = 3
+
+_EMPTY = np.iinfo(np.uint64).max
+_SEED = np.uint64(0x9E3779B97F4A7C15)
+
+
+class DuplicateGroups:
+    """Representatives to score, and the group each input text belongs to"""
+
+    def __init__(self, representatives, group_of):
+        self.representatives = representatives  # index of the text scored for each group
+        self.group_of = group_of  # group number of every input text
+
+    @property
+    def n_texts(self) -> int:
+        return len(self.group_of)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.representatives)
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of texts that did not need scoring"""
+        return 1 - self.n_groups / self.n_texts if self.n_texts else 0.0
+
+    def expand(self, values):
+        """Fan per-group values (list or array, in representative order) out to every text"""
+        if isinstance(values, np.ndarray):
+            return values[self.group_of]
+        return [values[g] for g in self.group_of]
+
+
+def _lsh_shape(threshold: float):
+    """(bands, rows) whose LSH threshold (1/b)^(1/r) sits comfortably below `threshold`"""
+    best = (NUM_BINS, 1)
+    for rows in (1, 2, 4, 8, 16, 32):
+        bands = NUM_BINS // rows
+        if (1 / bands) ** (1 / rows) <= 0.9 * threshold:
+            best = (bands, rows)
+    return best
+
+
+def sketch(texts: List[str]) -> np.ndarray:
+    """One-permutation MinHash signatures, shape (len(texts), NUM_BINS)"""
+    # Text boundaries come from each text's own token count, never from a
+    # sentinel token that a text could contain or a hash could collide with
+    token_lists = [text.lower().encode("utf-8").split() for text in texts]
+    counts = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+    hashes = np.fromiter(map(zlib.crc32, chain.from_iterable(token_lists)), dtype=np.uint64, count=counts.sum())
+
+    # Shingle hash of tokens i..i+k-1 for every start that stays inside its
+    # text; texts shorter than k use their single tokens instead
+    ends = np.cumsum(counts)
+    doc = np.repeat(np.arange(len(counts)), counts)
+    shingles = hashes.copy()
+    for j in range(1, SHINGLE_SIZE):
+        shingles[:-j] = shingles[:-j] * _SEED ^ hashes[j:]
+    short = counts[doc] < SHINGLE_SIZE
+    shingles[short] = hashes[short]
+    keep = short | (np.arange(len(hashes)) + SHINGLE_SIZE <= ends[doc])
+    shingles, doc = shingles[keep], doc[keep]
+
+    # Multiply-shift: the top 6 bits pick the bin, the next 32 are the value;
+    # one sort of (bin key, value) puts each bin's minimum first
+    mixed = shingles * _SEED
+    key = (doc.astype(np.uint64) << np.uint64(6)) | (mixed >> np.uint64(58))
+    combined = (key << np.uint64(32)) | ((mixed >> np.uint64(26)) & np.uint64(0xFFFFFFFF))
+    combined.sort()
+    key = combined >> np.uint64(32)
+    first = np.r_[True, key[1:] != key[:-1]] if len(key) else np.zeros(0, dtype=bool)
+
+    signatures = np.full(len(counts) * NUM_BINS, _EMPTY, dtype=np.uint64)
+    signatures[key[first].astype(np.int64)] = combined[first] & np.uint64(0xFFFFFFFF)
+    return _densify(signatures.reshape(len(counts), NUM_BINS))
+
+
+def _densify(signatures: np.ndarray) -> np.ndarray:
+    """
+    Fill each empty bin from the next non-empty one (circularly), offset by
+    the distance; otherwise texts would collide on their shared empty bins
+    """
+    empty = signatures == _EMPTY
+    bins = np.arange(NUM_BINS)
+    filled = np.where(empty, 2 * NUM_BINS, bins)
+    following = np.minimum.accumulate(filled[:, ::-1], axis=1)[:, ::-1]
+    wrapped = filled.min(axis=1, keepdims=True) + NUM_BINS
+    source = np.where(following < 2 * NUM_BINS, following, wrapped)
+
+    rows = np.arange(len(signatures))[:, None]
+    dense = signatures[rows, source % NUM_BINS] + (source - bins).astype(np.uint64) * _SEED
+    # Texts without a single token stay all-empty
+    return np.where(empty.all(axis=1, keepdims=True), _EMPTY, dense)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+def find_duplicates(texts: List[str], threshold: Optional[float] = None,
+                    key: Optional[Callable[[str], str]] = normalize_text) -> DuplicateGroups:
+    """
+    Group exact duplicates, and near duplicates too when `threshold` (estimated
+    Jaccard similarity of word 3-shingles, e.g. 0.9) is given
+
+    `key=None` groups identical strings only, skipping normalization.
+    """
+    group_of = np.empty(len(texts), dtype=np.int64)
+    representatives = []
+    seen = {}
+    for i, text in enumerate(texts):
+        text_key = key(text) if key else text
+        group = seen.get(text_key)
+        if group is None:
+            group = seen[text_key] = len(representatives)
+            representatives.append(i)
+        group_of[i] = group
+
+    if threshold is None or len(representatives) < 2:
+        return DuplicateGroups(np.array(representatives, dtype=np.int64), group_of)
+
+    # Near-duplicate pass over the exact representatives only
+    signatures = sketch([texts[i] for i in representatives])
+    bands, rows = _lsh_shape(threshold)
+    band_keys = signatures[:, :bands * rows].reshape(len(representatives), bands, rows)
+    band_keys = (band_keys * _SEED).sum(axis=2).tolist()  # wraps; only equality matters
+
+    merged = np.arange(len(representatives))
+    leaders = []
+    buckets = [{} for _ in range(bands)]
+    for g, keys in enumerate(band_keys):
+        for candidate in dict.fromkeys(c for band, k in enumerate(keys) for c in buckets[band].get(k, ())):
+            if similarity(signatures[g], signatures[candidate]) >= threshold:
+                merged[g] = merged[candidate]
+                break
+        else:
+            merged[g] = len(leaders)
+            leaders.append(g)
+            for band, k in enumerate(keys):
+                buckets[band].setdefault(k, []).append(g)
+
+    near_representatives = np.array(representatives, dtype=np.int64)[leaders]
+    return DuplicateGroups(near_representatives, merged[group_of])
@@ -0,0 +1,237 @@
+"""
+Ensemble Serving for Mental Health Classifier
+Several models scored off one shared TF-IDF pass, combined by a strategy
+
+Strategies:
+    vote      hard majority vote (ties go to the highest mean probability)
+    average   mean of the members' calibrated probabilities
+    cascade   the first (cheap) member answers when its top probability is at
+              least `threshold`; the remaining rows escalate to `average`
+
+An EnsembleModel is saved as the model half of an ordinary version pair
+(mental_health_svm_model_<ts>.pkl + the shared tfidf_vectorizer_<ts>.pkl), so
+the API, app and CLI load it like any other model. Its decision_function
+returns log-probabilities, which the shared softmax turns back into the
+combined probabilities.
+
+Build with: python ensemble.py data/cleaned_data.csv [--strategy cascade] [--threshold 0.8]
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from inference import LinearKernel, find_model_versions, model_files_for_version, save_model_pair, softmax
+
+STRATEGIES = ("vote", "average", "cascade")
+
+# Below this many rows members are scored one after another: thread handoff
+# costs more than the linear members take
+PARALLEL_MIN_ROWS = 64
+
+
+class EnsembleMember:
+    """
+    One ensemble member and how to get calibrated probabilities from it
+
+    Linear models are stored as a LinearKernel and calibrated with a softmax
+    temperature (1.0 reproduces LogisticRegression's multinomial
+    predict_proba exactly); anything else uses its own predict_proba.
+    """
+
+    def __init__(self, name, model, temperature=None):
+        self.name = name
+        if temperature is not None and hasattr(model, "coef_"):
+            model = LinearKernel.from_model(model)
+        self.model = model
+        self.temperature = temperature
+        self.classes_ = np.asarray(model.classes_)
+
+    def predict_proba(self, X):
+        if self.temperature is not None:
+            return softmax(self.model.decision_function(X) / self.temperature)
+        return self.model.predict_proba(X)
+
+
+class EnsembleModel:
+    """Stands in for a fitted classifier: exposes classes_ and decision_function"""
+
+    def __init__(self, members, strategy="cascade", threshold=0.8):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown ensemble strategy: {strategy!r}")
+        classes = members[0].classes_
+        if any(not np.array_equal(m.classes_, classes) for m in members):
+            raise ValueError("Ensemble members must share the same classes")
+
+        self.members = list(members)
+        self.strategy = strategy
+        self.threshold = threshold
+        self.classes_ = classes
+        self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def with_strategy(self, strategy=None, threshold=None):
+        """Copy sharing the same members with a different strategy/threshold"""
+        return EnsembleModel(
+            self.members,
+            strategy=strategy or self.strategy,
+            threshold=self.threshold if threshold is None else threshold,
+        )
+
+    def _member_probas(self, X, members):
+        """Probabilities from each member, scored in parallel for large batches"""
+        if len(members) == 1 or X.shape[0] < PARALLEL_MIN_ROWS:
+            return [m.predict_proba(X) for m in members]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=len(self.members), thread_name_prefix="ensemble")
+        return list(self._pool.map(lambda m: m.predict_proba(X), members))
+
+    def _average(self, X):
+        return np.mean(self._member_probas(X, self.members), axis=0)
+
+    def _vote(self, X):
+        probas = self._member_probas(X, self.members)
+        votes = np.zeros_like(probas[0])
+        for proba in probas:
+            votes[np.arange(len(proba)), proba.argmax(axis=1)] += 1
+        # Vote share, with a small mean-probability term that only breaks ties
+        combined = votes + 1e-3 * np.mean(probas, axis=0)
+        return combined / combined.sum(axis=1, keepdims=True)
+
+    def _cascade(self, X):
+        proba = self.members[0].predict_proba(X)
+        escalate = np.flatnonzero(proba.max(axis=1) < self.threshold)
+        if len(escalate) and len(self.members) > 1:
+            proba = proba.copy()
+            proba[escalate] = self._average(X[escalate])
+        return proba
+
+    def predict_proba(self, X):
+        return getattr(self, "_" + self.strategy)(X)
+
+    def decision_function(self, X):
+        """Log of the combined probabilities; softmax of these recovers them"""
+        return np.log(np.clip(self.predict_proba(X), 1e-12, 1.0))
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def escalation_rate(self, X):
+        """Fraction of rows the cascade would send past the first member"""
+        return float(np.mean(self.members[0].predict_proba(X).max(axis=1) < self.threshold))
+
+
+def fit_temperature(decision_scores, labels, classes):
+    """Softmax temperature minimizing log loss on held-out decision scores"""
+    targets = np.searchsorted(classes, labels)
+    best_t, best_loss = 1.0, np.inf
+    for t in np.logspace(-2, 1, 61):
+        proba = softmax(decision_scores / t)
+        loss = -np.mean(np.log(np.clip(proba[np.arange(len(targets)), targets], 1e-12, 1.0)))
+        if loss < best_loss:
+            best_t, best_loss = t, loss
+    return float(best_t)
+
+
+def default_members():
+    """The members of the notebook's voting ensembles, cheapest first"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.svm import LinearSVC
+
+    return {
+        "SVM": LinearSVC(random_state=42),
+        "LogisticRegression": LogisticRegression(max_iter=1000, random_state=42),
+        "RandomForest": RandomForestClassifier(n_estimators=200, n_jobs=-1, random_state=42),
+    }
+
+
+def build_ensemble(X_fit, y_fit, X_cal, y_cal, estimators=None, strategy="cascade", threshold=0.8):
+    """
+    Fit each estimator on the shared features and calibrate it on a held-out
+    split; the first estimator is the cascade's cheap first stage
+    """
+    estimators = estimators or default_members()
+    members = []
+    for name, estimator in estimators.items():
+        estimator.fit(X_fit, y_fit)
+        temperature = None
+        if hasattr(estimator, "coef_"):
+            has_proba = hasattr(estimator, "predict_proba")
+            temperature = 1.0 if has_proba else fit_temperature(
+                estimator.decision_function(X_cal), y_cal, estimator.classes_
+            )
+        members.append(EnsembleMember(name, estimator, temperature))
+    return EnsembleModel(members, strategy=strategy, threshold=threshold)
+
+
+def evaluate(ensemble, X, y, thresholds=(0.5, 0.6, 0.7, 0.8, 0.9)):
+    """Accuracy of each member and strategy, plus cascade escalation rates"""
+    y = np.asarray(y)
+    report = {"members": {}, "strategies": {}, "cascade": []}
+    for member in ensemble.members:
+        predictions = member.classes_[member.predict_proba(X).argmax(axis=1)]
+        report["members"][member.name] = float(np.mean(predictions == y))
+    for strategy in ("vote", "average"):
+        report["strategies"][strategy] = float(np.mean(ensemble.with_strategy(strategy).predict(X) == y))
+    for threshold in thresholds:
+        cascade = ensemble.with_strategy("cascade", threshold)
+        report["cascade"].append({
+            "threshold": threshold,
+            "accuracy": float(np.mean(cascade.predict(X) == y)),
+            "escalation_rate": cascade.escalation_rate(X),
+        })
+    return report
+
+
+def main(argv=None):
+    import joblib
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    parser = argparse.ArgumentParser(description="Build an ensemble on the shared TF-IDF features")
+    parser.add_argument("data", help="CSV with content and target columns")
+    parser.add_argument("--models-dir", default="models", help="Directory with the model versions")
+    parser.add_argument("--base", default=None, help="Version whose vectorizer to share (default: latest)")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="cascade")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Cascade confidence threshold")
+    args = parser.parse_args(argv)
+
+    versions = find_model_versions(args.models_dir)
+    if not versions:
+        raise SystemExit(f"❌ Model files not found in {args.models_dir}/")
+    vectorizer = joblib.load(model_files_for_version(args.base or versions[-1], args.models_dir)[1])
+
+    df = pd.read_csv(args.data).dropna(subset=["content", "target"])
+    texts, labels = df["content"].astype(str).tolist(), df["target"].astype(int).to_numpy()
+    train_idx, test_idx = train_test_split(np.arange(len(texts)), test_size=0.2, random_state=42, stratify=labels)
+    fit_idx, cal_idx = train_test_split(train_idx, test_size=0.2, random_state=42, stratify=labels[train_idx])
+
+    X = vectorizer.transform(texts)
+    ensemble = build_ensemble(X[fit_idx], labels[fit_idx], X[cal_idx], labels[cal_idx],
+                              strategy=args.strategy, threshold=args.threshold)
+    report = evaluate(ensemble, X[test_idx], labels[test_idx])
+
+    for name, accuracy in report["members"].items():
+        print(f"   {name:>20}: {accuracy:.4f}")
+    for name, accuracy in report["strategies"].items():
+        print(f"   {name:>20}: {accuracy:.4f}")
+    for row in report["cascade"]:
+        print(f"   {'cascade @ ' + str(row['threshold']):>20}: {row['accuracy']:.4f} "
+              f"({row['escalation_rate']:.0%} escalated)")
+
+    version = save_model_pair(ensemble, vectorizer, args.models_dir)
+    with open(os.path.join(args.models_dir, f"ensemble_{version}.json"), "w", encoding="utf-8") as f:
+        json.dump({"strategy": args.strategy, "threshold": args.threshold, **report}, f, indent=2)
+    print(f"✅ Ensemble saved as version {version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Inference executor for the Mental Health Text Classifier API
+Runs CPU-bound scoring off the asyncio event loop with bounded concurrency
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from artifacts import load_compiled
+from explain import ExplanationIndex
+from inference import load_pipeline, predict_batch, predict_text
+from runtime import load_runtime
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the inference queue is full and the request should be shed"""
+
+
+# Per-process pipeline used by process pool workers
+_worker_scorer = None
+_worker_featurizer = None
+_worker_explainer = None
+
+
+def _init_worker(model_path, vectorizer_path, linear_kernel, fast_tfidf, compiled_dir=None,
+                 runtime=False, ensemble=None):
+    """Process pool initializer: load and compile the model once per worker"""
+    global _worker_scorer, _worker_featurizer, _worker_explainer
+    if compiled_dir:
+        loader = load_runtime if runtime else load_compiled
+        _worker_scorer, _worker_featurizer = loader(compiled_dir)
+    else:
+        _worker_scorer, _worker_featurizer = load_pipeline(
+            model_path, vectorizer_path, linear_kernel=linear_kernel, fast_tfidf=fast_tfidf,
+            ensemble=ensemble,
+        )
+    try:
+        _worker_explainer = ExplanationIndex.from_pipeline(_worker_scorer, _worker_featurizer)
+    except ValueError:
+        _worker_explainer = None
+
+
+def _worker_ready():
+    return True
+
+
+def _timed_predict_text(text, scorer, featurizer):
+    timings = {}
+    return predict_text(text, scorer, featurizer, timings=timings), timings
+
+
+def _timed_predict_batch(texts, scorer, featurizer):
+    timings = {}
+    return predict_batch(texts, scorer, featurizer, timings=timings), timings
+
+
+def _timed_explain(text, top_k, spans, explainer, featurizer):
+    timings = {}
+    return explainer.explain(text, featurizer, top_k, spans, timings=timings), timings
+
+
+def _worker_predict_text(text):
+    return _timed_predict_text(text, _worker_scorer, _worker_featurizer)
+
+
+def _worker_predict_batch(texts):
+    return _timed_predict_batch(texts, _worker_scorer, _worker_featurizer)
+
+
+def _worker_explain(text, top_k, spans):
+    return _timed_explain(text, top_k, spans, _worker_explainer, _worker_featurizer)
+
+
+class InferenceExecutor:
+    """
+    Bounded pool that scores texts away from the event loop
+
+    kind="thread" shares the in-process pipeline set with `set_pipeline`;
+    kind="process" preloads the model (and its explanation index) in every
+    worker from the given paths. At most `workers + queue_limit` jobs may be
+    in flight; beyond that `predict_text`/`predict_batch`/`explain` raise
+    ExecutorSaturated instead of queueing.
+
+    `observer`, if set, is called as observer(stage_timings, batch_size) after
+    every job with the per-stage seconds measured inside the worker.
+
+    Every result is stamped with the `version` of the pipeline that scored it
+    (set with the pool), so a model swap while a job runs cannot mislabel it.
+    """
+
+    def __init__(self, kind: str = "thread", workers: Optional[int] = None, queue_limit: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind!r}")
+
+        self.kind = kind
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._scorer = None
+        self._featurizer = None
+        self._explainer = None
+        self.version = None
+        self.observer = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_limit
+
+    def _create_pool(self, model_path, vectorizer_path, linear_kernel, fast_tfidf, compiled_dir, runtime,
+                     ensemble):
+        if self.kind == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(model_path, vectorizer_path, linear_kernel, fast_tfidf, compiled_dir, runtime,
+                          ensemble),
+            )
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+
+    def _swap(self, pool, scorer, featurizer, explainer, version):
+        """Make `pool` current; the old pool finishes its queued jobs, then exits"""
+        old_pool = self._pool
+        self._pool = pool
+        self.set_pipeline(scorer, featurizer, explainer, version)
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+
+    def start(self, model_path=None, vectorizer_path=None, linear_kernel="float64", fast_tfidf=True,
+              compiled_dir=None, scorer=None, featurizer=None, runtime=False, ensemble=None, explainer=None,
+              version=None):
+        """
+        Create the worker pool; process pools need the model file paths, or a
+        compiled artifact directory to memory-map instead (`runtime` loads it
+        with the numpy-only backend), and the same `ensemble` override
+        """
+        pool = self._create_pool(model_path, vectorizer_path, linear_kernel, fast_tfidf, compiled_dir, runtime,
+                                 ensemble)
+        self._swap(pool, scorer, featurizer, explainer, version)
+
+    async def restart(self, model_path=None, vectorizer_path=None, linear_kernel="float64",
+                      fast_tfidf=True, compiled_dir=None, scorer=None, featurizer=None, runtime=False,
+                      ensemble=None, explainer=None, version=None):
+        """
+        Build and warm up a pool for a new model, then swap it in
+
+        Jobs already running on the old pool complete on the old model.
+        """
+        pool = self._create_pool(model_path, vectorizer_path, linear_kernel, fast_tfidf, compiled_dir, runtime,
+                                 ensemble)
+        if self.kind == "process":
+            await asyncio.get_running_loop().run_in_executor(pool, _worker_ready)
+        self._swap(pool, scorer, featurizer, explainer, version)
+
+    def set_pipeline(self, scorer, featurizer, explainer=None, version=None):
+        """Set the scorer/featurizer (and explanation index) used by thread workers"""
+        self._scorer = scorer
+        self._featurizer = featurizer
+        self._explainer = explainer
+        self.version = version
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturated(f"Inference queue full ({self.capacity} jobs in flight)")
+            self.in_flight += 1
+
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # A job holds its slot until the pool is done with it, not until its
+        # caller stops waiting; cancelling a queued job frees the slot at once
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future=None):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _observe(self, timings, batch_size):
+        if self.observer is not None:
+            self.observer(timings, batch_size)
+
+    @staticmethod
+    def _stamp(result, version):
+        # Callers read `version` before their first await, in the same step as
+        # _submit picks the pool (and thread workers the pipeline)
+        if result is not None:
+            result["model_version"] = version
+        return result
+
+    async def predict_text(self, text: str):
+        version = self.version
+        if self.kind == "process":
+            result, timings = await self._submit(_worker_predict_text, text)
+        else:
+            result, timings = await self._submit(_timed_predict_text, text, self._scorer, self._featurizer)
+        self._observe(timings, 1)
+        return self._stamp(result, version)
+
+    async def predict_batch(self, texts: List[str]):
+        version = self.version
+        if self.kind == "process":
+            results, timings = await self._submit(_worker_predict_batch, texts)
+        else:
+            results, timings = await self._submit(_timed_predict_batch, texts, self._scorer, self._featurizer)
+        self._observe(timings, len(texts))
+        return [self._stamp(result, version) for result in results]
+
+    async def explain(self, text: str, top_k: int = 10, spans=None):
+        """Explain one text with the explanation index (see explain.ExplanationIndex.explain)"""
+        version = self.version
+        if self.kind == "process":
+            result, timings = await self._submit(_worker_explain, text, top_k, spans)
+        else:
+            result, timings = await self._submit(
+                _timed_explain, text, top_k, spans, self._explainer, self._featurizer
+            )
+        self._observe(timings, 1)
+        return self._stamp(result, version)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+            }
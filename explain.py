@@ -0,0 +1,120 @@
+"""
+Prediction explanations for the Mental Health Text Classifier
+Per-token contributions to each class score, from an index built at model load
+
+For a linear model the decision score of class c is
+    intercept[c] + sum over the text's features f of tfidf[f] * coef[c, f]
+so each term of that sum is exactly one n-gram's contribution. The index
+holds the feature index -> n-gram strings and the (n_features, n_classes)
+weights; an explanation reads the one sparse TF-IDF row of the text and
+costs a gather over its non-zero features, not a pass over the vocabulary.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import time
+
+import numpy as np
+
+from inference import MIN_TEXT_LENGTH, LinearKernel, build_result, softmax
+
+
+class ExplanationIndex:
+    """Feature index -> n-gram string plus per-class coefficients"""
+
+    def __init__(self, terms, weights, intercept, classes):
+        self.terms = terms  # array of n-gram strings, or None for hashed features
+        self.weights = weights
+        self.intercept = intercept
+        self.classes_ = np.asarray(classes)
+
+    @classmethod
+    def from_pipeline(cls, model, vectorizer):
+        """
+        Build the index for a linear model and its vectorizer
+
+        `model` may be a fitted linear estimator or a LinearKernel; the
+        vocabulary comes from a TfidfVectorizer's `vocabulary_` or a
+        FastTfidfFeaturizer's `vocabulary`. Hashing featurizers have no
+        vocabulary, so their features are reported by index.
+        """
+        if isinstance(model, LinearKernel):
+            kernel = model
+        elif hasattr(model, "coef_"):
+            kernel = LinearKernel.from_model(model)
+        else:
+            raise ValueError("Explanations need a single linear model")
+
+        vocabulary = getattr(vectorizer, "vocabulary_", None) or getattr(vectorizer, "vocabulary", None)
+        terms = None
+        if vocabulary:
+            terms = np.empty(kernel.weights.shape[0], dtype=object)
+            for term, index in vocabulary.items():
+                terms[index] = term
+        return cls(terms, kernel.weights, kernel.intercept, kernel.classes_)
+
+    def _weighted_row(self, text, spans, featurizer):
+        """(indices, values) of the length-weighted mean TF-IDF row of the segments"""
+        spans = [(start, end) for start, end in spans if end - start >= MIN_TEXT_LENGTH]
+        rows = featurizer.transform([text[start:end] for start, end in spans])
+        lengths = np.array([end - start for start, end in spans], dtype=self.weights.dtype)
+        row_weights = np.repeat(lengths / lengths.sum(), np.diff(rows.indptr))
+        indices, inverse = np.unique(np.asarray(rows.indices), return_inverse=True)
+        values = np.bincount(inverse, weights=np.asarray(rows.data) * row_weights, minlength=len(indices))
+        return indices, values.astype(self.weights.dtype)
+
+    def term(self, index: int) -> str:
+        return self.terms[index] if self.terms is not None else f"feature_{index}"
+
+    def explain(self, text: str, featurizer, top_k: int = 10,
+                spans: Optional[List[Tuple[int, int]]] = None,
+                timings: Optional[Dict[str, float]] = None) -> Dict:
+        """
+        Predict `text` and explain it from the same TF-IDF row
+
+        Returns the usual prediction fields plus each class's intercept and
+        the `top_k` tokens with the largest contribution to the predicted
+        class, each with its contribution to every class.
+
+        `spans` (from inference.split_segments) explains a long text the way
+        the API scores it: segments too short to score are skipped and the
+        other rows are averaged weighted by length, as in
+        inference.aggregate_segments, before the contributions are taken.
+
+        If `timings` is given, seconds spent in the "transform",
+        "decision_function" and "explanation" stages are added to it.
+        """
+        start = time.perf_counter()
+        if spans is None or len(spans) == 1:
+            row = featurizer.transform([text])
+            indices = np.asarray(row.indices)
+            tfidf = np.asarray(row.data, dtype=self.weights.dtype)
+        else:
+            indices, tfidf = self._weighted_row(text, spans, featurizer)
+
+        transformed = time.perf_counter()
+        contributions = self.weights[indices] * tfidf[:, None]  # (nnz, n_classes)
+        decision = contributions.sum(axis=0) + self.intercept
+        best = int(decision.argmax())
+        scored = time.perf_counter()
+
+        result = build_result(
+            self.classes_[best].item(), decision.tolist(), softmax(decision[None, :])[0].tolist()
+        )
+        order = np.argsort(-contributions[:, best], kind="stable")[:top_k]
+        names = list(result["raw_scores"])
+        result["intercepts"] = dict(zip(names, self.intercept.tolist()))
+        result["tokens"] = [
+            {
+                "term": self.term(int(indices[i])),
+                "tfidf": float(tfidf[i]),
+                "contributions": dict(zip(names, contributions[i].tolist())),
+            }
+            for i in order
+        ]
+
+        if timings is not None:
+            timings["transform"] = timings.get("transform", 0.0) + transformed - start
+            timings["decision_function"] = timings.get("decision_function", 0.0) + scored - transformed
+            timings["explanation"] = timings.get("explanation", 0.0) + time.perf_counter() - scored
+        return result
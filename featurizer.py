@@ -0,0 +1,202 @@
+"""
+TF-IDF featurizers for the Mental Health Text Classifier
+FastTfidfFeaturizer reproduces a fitted TfidfVectorizer's transform in one
+pass over each text; HashingTfidfFeaturizer hashes terms instead of keeping
+a vocabulary
+"""
+
+import math
+import re
+from collections import Counter
+import numpy as np
+
+
+class FastTfidfFeaturizer:
+    """
+    Precompiled replacement for `TfidfVectorizer.transform`
+
+    Built once from a fitted vectorizer's `vocabulary_`, `idf_` and stop word
+    list. Each text is lowercased, tokenized with the compiled token pattern,
+    stop-word filtered, expanded into n-grams, looked up, weighted (optionally
+    with sublinear tf) and L2-normalized in a single loop, and the rows are
+    assembled straight into a CSR matrix. Output matches sklearn's transform
+    exactly.
+    """
+
+    def __init__(self, vocabulary, idf, stop_words=None,
+                 token_pattern=r"(?u)\b\w\w+\b", lowercase=True,
+                 ngram_range=(1, 1), norm="l2", sublinear_tf=False):
+        if norm not in ("l2", None):
+            raise ValueError(f"Unsupported norm: {norm!r}")
+
+        self.vocabulary = dict(vocabulary)
+        self.idf = np.asarray(idf, dtype=np.float64)
+        # Per-process copy: indexing a list in the n-gram loop is much faster
+        # than indexing a (possibly memory-mapped) array
+        self._idf_list = self.idf.tolist()
+        self.stop_words = frozenset(stop_words or ())
+        self.lowercase = lowercase
+        self.ngram_range = tuple(ngram_range)
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self._tokenize = re.compile(token_pattern).findall
+        self.n_features = len(self.idf)
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer):
+        """Build a featurizer from a fitted TfidfVectorizer"""
+        unsupported = {
+            "analyzer": ("word",),
+            "preprocessor": (None,),
+            "tokenizer": (None,),
+            "strip_accents": (None,),
+            "binary": (False,),
+            "use_idf": (True,),
+            "input": ("content",),
+        }
+        for param, allowed in unsupported.items():
+            if getattr(vectorizer, param) not in allowed:
+                raise ValueError(
+                    f"FastTfidfFeaturizer does not support {param}={getattr(vectorizer, param)!r}"
+                )
+
+        return cls(
+            vocabulary=vectorizer.vocabulary_,
+            idf=vectorizer.idf_,
+            stop_words=vectorizer.get_stop_words(),
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+            ngram_range=vectorizer.ngram_range,
+            norm=vectorizer.norm,
+            sublinear_tf=vectorizer.sublinear_tf,
+        )
+
+    def _term_counts(self, text):
+        """Map each in-vocabulary n-gram of `text` to its feature index and count"""
+        if self.lowercase:
+            text = text.lower()
+
+        stop_words = self.stop_words
+        tokens = [t for t in self._tokenize(text) if t not in stop_words]
+
+        lookup = self.vocabulary.get
+        features = []
+        min_n, max_n = self.ngram_range
+        n_tokens = len(tokens)
+
+        for n in range(min_n, min(max_n, n_tokens) + 1):
+            if n == 1:
+                grams = tokens
+            elif n == 2:
+                grams = [a + " " + b for a, b in zip(tokens, tokens[1:])]
+            else:
+                grams = [" ".join(tokens[i:i + n]) for i in range(n_tokens - n + 1)]
+            features += [idx for idx in map(lookup, grams) if idx is not None]
+
+        counts = Counter(features)
+        return counts
+
+    def transform_arrays(self, texts):
+        """
+        Featurize a list of texts into raw CSR (data, indices, indptr) arrays
+
+        Needs only numpy, so the scipy-free runtime backend shares this code.
+        """
+        if isinstance(texts, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+
+        idf = self._idf_list
+        indptr = [0]
+        indices = []
+        data = []
+
+        for text in texts:
+            counts = self._term_counts(text)
+            row_indices = sorted(counts)
+            if self.sublinear_tf:
+                row_data = [(math.log(counts[i]) + 1) * idf[i] for i in row_indices]
+            else:
+                row_data = [counts[i] * idf[i] for i in row_indices]
+
+            if self.norm == "l2" and row_data:
+                # Same accumulation order as sklearn's inplace_csr_row_normalize_l2
+                total = 0.0
+                for value in row_data:
+                    total += value * value
+                total = math.sqrt(total)
+                row_data = [value / total for value in row_data]
+
+            indices.extend(row_indices)
+            data.extend(row_data)
+            indptr.append(len(indices))
+
+        return (
+            np.array(data, dtype=np.float64),
+            np.array(indices, dtype=np.int32),
+            np.array(indptr, dtype=np.int32),
+        )
+
+    def transform(self, texts):
+        """Transform a list of texts into an L2-normalized TF-IDF CSR matrix"""
+        import scipy.sparse as sp
+
+        data, indices, indptr = self.transform_arrays(texts)
+        return sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, self.n_features))
+
+
+class HashingTfidfFeaturizer:
+    """
+    TF-IDF over hashed term buckets instead of a learned vocabulary
+
+    Terms and n-grams are mapped to one of `n_features` columns by sklearn's
+    HashingVectorizer (murmurhash, no per-token dict lookups). The only fitted
+    state is the idf vector, so the pickle is a fixed size regardless of how
+    many distinct terms the corpus has. Workers need nothing else to
+    transform. Colliding terms share a column, which is the accuracy cost.
+
+    Selectable at training time (train.py's "hashing" config) and saved as the
+    pair's vectorizer; anything that calls `.transform` loads it unchanged.
+    """
+
+    def __init__(self, n_features=2 ** 14, ngram_range=(1, 2), stop_words="english",
+                 lowercase=True, sublinear_tf=False, norm="l2"):
+        # Imported here so the vocabulary featurizer stays sklearn-free
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.hasher = HashingVectorizer(
+            n_features=n_features, ngram_range=self.ngram_range, stop_words=stop_words,
+            lowercase=lowercase, alternate_sign=False, norm=None,
+        )
+        self.idf_ = None
+
+    def fit(self, texts, y=None):
+        """Learn smoothed idf weights per bucket, as TfidfVectorizer does per term"""
+        counts = self.hasher.transform(texts)
+        n_samples = counts.shape[0]
+        df = np.bincount(counts.indices, minlength=self.n_features)
+        self.idf_ = np.log((1 + n_samples) / (1 + df)) + 1
+        return self
+
+    def transform(self, texts):
+        """Transform a list of texts into an L2-normalized TF-IDF CSR matrix"""
+        from sklearn.preprocessing import normalize
+
+        if isinstance(texts, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+
+        X = self.hasher.transform(texts).tocsr()
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        X.data *= self.idf_[X.indices]
+
+        if self.norm:
+            normalize(X, norm=self.norm, copy=False)
+        return X
+
+    def fit_transform(self, texts, y=None):
+        return self.fit(texts).transform(texts)
@@ -0,0 +1,302 @@
+"""
+Inference core for the Mental Health Text Classifier
+TF-IDF + LinearSVC scoring shared by the API and the Streamlit app
+
+Importing this module needs only numpy; joblib is imported when pickles are
+loaded or saved.
+"""
+
+import os
+import time
+from datetime import datetime
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from dedup import find_duplicates
+from featurizer import FastTfidfFeaturizer
+
+class_names = ["Stress", "Depression", "Bipolar", "Personality", "Anxiety"]
+
+# Texts shorter than this are rejected instead of scored
+MIN_TEXT_LENGTH = 10
+
+MODEL_PREFIX = "mental_health_svm_model_"
+VECTORIZER_PREFIX = "tfidf_vectorizer_"
+
+
+def find_model_versions(models_dir: str = "models") -> List[str]:
+    """
+    Versions (timestamp suffixes) in `models_dir` that have both a model and
+    a vectorizer file, oldest first
+    """
+    files = set(os.listdir(models_dir))
+    versions = [
+        f[len(MODEL_PREFIX):-len(".pkl")]
+        for f in files
+        if f.startswith(MODEL_PREFIX) and f.endswith(".pkl")
+    ]
+    return sorted(v for v in versions if f"{VECTORIZER_PREFIX}{v}.pkl" in files)
+
+
+def model_files_for_version(version: str, models_dir: str = "models") -> Tuple[str, str]:
+    """(model_path, vectorizer_path) of one matched artifact pair"""
+    return (
+        os.path.join(models_dir, f"{MODEL_PREFIX}{version}.pkl"),
+        os.path.join(models_dir, f"{VECTORIZER_PREFIX}{version}.pkl"),
+    )
+
+
+def find_latest_model_files(models_dir: str = "models") -> Optional[Tuple[str, str]]:
+    """
+    Return (model_path, vectorizer_path) for the most recent matched pair in
+    `models_dir`, or None if there is none
+
+    The model and vectorizer always come from the same timestamp, so a
+    half-written newer model can never be paired with an older vectorizer.
+    """
+    versions = find_model_versions(models_dir)
+    if not versions:
+        return None
+    return model_files_for_version(versions[-1], models_dir)
+
+
+def model_version_from_path(model_path: str) -> str:
+    """Timestamp suffix of a model file, e.g. 20251007_094723"""
+    return os.path.basename(model_path)[len(MODEL_PREFIX):-len(".pkl")]
+
+
+def save_model_pair(model, vectorizer, models_dir: str = "models") -> str:
+    """
+    Write a model/vectorizer pair under a new timestamp version; returns it
+
+    The vectorizer is written first, so a loader polling `models_dir` never
+    sees the version until both files exist. Versions have one-second
+    resolution; a second save within the same second waits for the next.
+    """
+    import joblib
+
+    os.makedirs(models_dir, exist_ok=True)
+    while True:
+        version = datetime.now().strftime("%Y%m%d_%H%M%S")
+        model_path, vectorizer_path = model_files_for_version(version, models_dir)
+        if not (os.path.exists(model_path) or os.path.exists(vectorizer_path)):
+            break
+        time.sleep(0.1)
+
+    joblib.dump(vectorizer, vectorizer_path)
+    joblib.dump(model, model_path)
+    return version
+
+
+def softmax(decision_scores):
+    """Row-wise softmax over a (n_samples, n_classes) score matrix"""
+    scores = np.atleast_2d(decision_scores)
+    exp_scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return exp_scores / exp_scores.sum(axis=1, keepdims=True)
+
+
+class LinearKernel:
+    """
+    Precompiled scoring kernel for a fitted multiclass LinearSVC
+
+    Exports `coef_` and `intercept_` into a contiguous (n_features, n_classes)
+    weight matrix so scoring is a direct sparse-dense product, skipping the
+    estimator validation sklearn runs on every `decision_function` call.
+    Exposes `classes_` and `decision_function` so it can stand in for the model.
+    """
+
+    def __init__(self, weights, intercept, classes, dtype=None):
+        weights = np.asarray(weights)
+        if weights.ndim != 2 or weights.shape[1] != len(classes):
+            raise ValueError("LinearKernel only supports multiclass (one-vs-rest) linear models")
+
+        # Already-contiguous weights of the right dtype (e.g. memory-mapped) are not copied
+        self.weights = np.ascontiguousarray(weights, dtype=dtype)
+        self.intercept = np.ascontiguousarray(intercept, dtype=self.weights.dtype)
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = self.weights.shape[0]
+
+    @classmethod
+    def from_model(cls, model, dtype=np.float64):
+        """Build a kernel from a fitted linear estimator"""
+        return cls(model.coef_.T, model.intercept_, model.classes_, dtype=dtype)
+
+    def decision_function(self, X):
+        """Return X @ coef_.T + intercept_ for a CSR TF-IDF matrix"""
+        if X.dtype != self.weights.dtype:
+            X = X.astype(self.weights.dtype)
+        return X @ self.weights + self.intercept
+
+
+def compile_pipeline(model, vectorizer, linear_kernel="float64", fast_tfidf=True, ensemble=None):
+    """
+    Build the (scorer, featurizer) pair used for serving
+
+    `linear_kernel` is "float64", "float32" or "off" (use the sklearn model);
+    `fast_tfidf` swaps a TfidfVectorizer's `transform` for a FastTfidfFeaturizer.
+    `ensemble` ({"strategy": ..., "threshold": ...}) overrides how an
+    ensemble.EnsembleModel combines its members.
+    """
+    if ensemble and hasattr(model, "with_strategy"):
+        model = model.with_strategy(**ensemble)
+
+    # Ensembles keep their linear members precompiled and score as-is
+    if linear_kernel in ("float32", "float64") and hasattr(model, "coef_"):
+        scorer = LinearKernel.from_model(model, dtype=np.dtype(linear_kernel))
+    else:
+        scorer = model
+
+    # Only vocabulary-based vectorizers have a precompiled equivalent; a
+    # HashingTfidfFeaturizer is served as-is
+    if fast_tfidf and hasattr(vectorizer, "vocabulary_"):
+        featurizer = FastTfidfFeaturizer.from_vectorizer(vectorizer)
+    else:
+        featurizer = vectorizer
+    return scorer, featurizer
+
+
+def load_pipeline(model_path, vectorizer_path, linear_kernel="float64", fast_tfidf=True, ensemble=None):
+    """Load a model/vectorizer pair from disk and compile it for serving"""
+    # Imported here so the compiled/runtime backends never pay for joblib
+    import joblib
+
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    return compile_pipeline(model, vectorizer, linear_kernel=linear_kernel, fast_tfidf=fast_tfidf,
+                            ensemble=ensemble)
+
+
+def score_texts(texts, model, vectorizer, timings: Optional[Dict[str, float]] = None):
+    """
+    Score a list of texts in one vectorized pass
+
+    Runs a single `transform` and a single `decision_function` call over the
+    whole batch and maps the argmax of the scores back through `model.classes_`,
+    which is exactly what `model.predict` does internally.
+
+    If `timings` is given, seconds spent in the "transform",
+    "decision_function" and "softmax" stages are added to it.
+
+    Returns (predictions, decision_scores, normalized_scores) as arrays.
+    """
+    start = time.perf_counter()
+    text_tfidf = vectorizer.transform(texts)
+    transformed = time.perf_counter()
+    decision_scores = np.atleast_2d(model.decision_function(text_tfidf))
+    predictions = np.asarray(model.classes_)[decision_scores.argmax(axis=1)]
+    scored = time.perf_counter()
+    normalized_scores = softmax(decision_scores)
+
+    if timings is not None:
+        timings["transform"] = timings.get("transform", 0.0) + transformed - start
+        timings["decision_function"] = timings.get("decision_function", 0.0) + scored - transformed
+        timings["softmax"] = timings.get("softmax", 0.0) + time.perf_counter() - scored
+
+    return predictions, decision_scores, normalized_scores
+
+
+def build_result(prediction, decision_row, normalized_row) -> Dict:
+    """Build the per-text result dict from one row of the score matrices"""
+    return {
+        "predicted_class": class_names[prediction],
+        "class_number": prediction,
+        "confidence_scores": dict(zip(class_names, normalized_row)),
+        "raw_scores": dict(zip(class_names, decision_row)),
+    }
+
+
+def predict_text(text: str, model, vectorizer, timings: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    Predict the mental health category for a single text
+
+    Decision scores are computed once; the class, softmax confidences and
+    raw scores are all derived from that one result.
+    """
+    predictions, decision_scores, normalized_scores = score_texts([text], model, vectorizer, timings)
+    return build_result(
+        predictions.tolist()[0], decision_scores[0].tolist(), normalized_scores[0].tolist()
+    )
+
+
+def predict_batch(texts: List[str], model, vectorizer, min_length: int = MIN_TEXT_LENGTH,
+                  timings: Optional[Dict[str, float]] = None) -> List[Optional[Dict]]:
+    """
+    Predict mental health categories for a batch of texts
+
+    Texts shorter than `min_length` are skipped and returned as None at their
+    original position; every other distinct text is scored once, in a single
+    sparse matrix pass, and repeats share its result.
+    """
+    results: List[Optional[Dict]] = [None] * len(texts)
+    valid_idx = [i for i, text in enumerate(texts) if len(text) >= min_length]
+
+    if not valid_idx:
+        return results
+
+    groups = find_duplicates([texts[i] for i in valid_idx], key=None)
+    predictions, decision_scores, normalized_scores = score_texts(
+        [texts[valid_idx[i]] for i in groups.representatives], model, vectorizer, timings
+    )
+
+    scored = [
+        build_result(prediction, decision_row, normalized_row)
+        for prediction, decision_row, normalized_row in zip(
+            predictions.tolist(), decision_scores.tolist(), normalized_scores.tolist()
+        )
+    ]
+    for i, result in zip(valid_idx, groups.expand(scored)):
+        results[i] = result
+
+    return results
+
+
+def split_segments(text: str, segment_length: int) -> List[Tuple[int, int]]:
+    """
+    (start, end) spans of about `segment_length` characters covering `text`
+
+    Cuts fall on the last whitespace of each window when there is one in its
+    second half, so words are not split; a tail shorter than half a segment
+    is merged into the previous span.
+    """
+    spans = []
+    start = 0
+    while len(text) - start > segment_length:
+        end = start + segment_length
+        cut = text.rfind(" ", start + segment_length // 2, end)
+        end = cut + 1 if cut != -1 else end
+        spans.append((start, end))
+        start = end
+    if spans and len(text) - start < segment_length // 2:
+        spans[-1] = (spans[-1][0], len(text))
+    else:
+        spans.append((start, len(text)))
+    return spans
+
+
+def aggregate_segments(spans: List[Tuple[int, int]], segment_results: List[Optional[Dict]]) -> Dict:
+    """
+    Document-level result from per-segment results
+
+    Raw scores are averaged weighted by segment length (the decision function
+    is linear, so this tracks scoring the segments as one text) and pushed
+    through the softmax again. Per-segment scores are kept under "segments".
+    """
+    weights, raw_scores, segments = [], [], []
+    for (start, end), result in zip(spans, segment_results):
+        if result is None:
+            continue
+        weights.append(end - start)
+        raw_scores.append([result["raw_scores"][name] for name in class_names])
+        segments.append({
+            "start": start,
+            "end": end,
+            "predicted_class": result["predicted_class"],
+            "confidence_scores": result["confidence_scores"],
+        })
+    if not segments:
+        raise ValueError("No segment of the document could be scored")
+
+    decision = np.average(np.array(raw_scores), axis=0, weights=weights)
+    result = build_result(int(decision.argmax()), decision.tolist(), softmax(decision)[0].tolist())
+    result["segments"] = segments
+    return result
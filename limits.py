@@ -0,0 +1,50 @@
+"""
+Request size limits for the Mental Health Text Classifier API
+Reject oversized payloads before the body is read or parsed
+"""
+
+from typing import Iterable
+
+from fastapi import HTTPException
+from fastapi.responses import PlainTextResponse
+
+
+class PayloadLimitMiddleware:
+    """
+    ASGI middleware capping request bodies at `max_bytes` on `paths`
+
+    A Content-Length over the cap gets a 413 straight away, without reading
+    a byte of the body. Bodies without one (chunked uploads) are counted as
+    they arrive, and reading stops with a 413 as soon as the cap is passed,
+    before any JSON is parsed.
+    """
+
+    def __init__(self, app, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = PlainTextResponse(f"Request body exceeds {self.max_bytes} bytes", status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions from the body read as-is
+                    raise HTTPException(status_code=413, detail=f"Request body exceeds {self.max_bytes} bytes")
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,162 @@
+"""
+Model registry for the Mental Health Text Classifier API
+Loads matched model/vectorizer pairs by version and watches models/ for new ones
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+
+from artifacts import compiled_dir_for, load_compiled
+from explain import ExplanationIndex
+from runtime import load_runtime
+from inference import compile_pipeline, find_model_versions, model_files_for_version, predict_text
+
+WARMUP_TEXT = "I've been feeling really anxious lately and having panic attacks"
+
+
+class LoadedModel:
+    """A model/vectorizer pair of one version, compiled and warmed up for serving"""
+
+    def __init__(self, version, model_path, vectorizer_path, compiled_dir,
+                 model, vectorizer, scorer, featurizer, load_seconds, model_format="joblib",
+                 explainer=None):
+        self.version = version
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.compiled_dir = compiled_dir
+        self.model = model
+        self.vectorizer = vectorizer
+        self.scorer = scorer
+        self.featurizer = featurizer
+        self.load_seconds = load_seconds
+        self.model_format = model_format  # format actually loaded, after any fallback
+        self.explainer = explainer  # explain.ExplanationIndex, None for non-linear models
+        self.loaded_at = datetime.now().isoformat()
+
+    def model_type(self) -> str:
+        """Estimator description, e.g. "LinearSVC" or an ensemble's strategy and members"""
+        if hasattr(self.scorer, "members"):
+            members = ", ".join(m.name for m in self.scorer.members)
+            return f"Ensemble ({self.scorer.strategy}) of {members}"
+        if self.model_format != "joblib":
+            return f"Linear model ({self.model_format} artifacts)"
+        return type(self.model).__name__
+
+    def features(self) -> str:
+        """Feature space description, e.g. 'TF-IDF with 5,000 features'"""
+        kind = "Hashed TF-IDF" if hasattr(self.featurizer, "hasher") else "TF-IDF"
+        members = [m.model for m in getattr(self.scorer, "members", ())]
+        for component in (self.scorer, self.model, *members, self.featurizer):
+            n_features = getattr(component, "n_features_in_", None) or getattr(component, "n_features", None)
+            if n_features:
+                return f"{kind} with {int(n_features):,} features"
+        return kind
+
+    def info(self):
+        ensemble = None
+        if hasattr(self.scorer, "members"):
+            ensemble = {
+                "strategy": self.scorer.strategy,
+                "threshold": self.scorer.threshold,
+                "members": [m.name for m in self.scorer.members],
+            }
+        return {
+            "version": self.version,
+            "model_file": os.path.basename(self.model_path),
+            "vectorizer_file": os.path.basename(self.vectorizer_path),
+            "compiled": self.compiled_dir is not None,
+            "model_format": self.model_format,
+            "load_seconds": round(self.load_seconds, 4),
+            "explanations": self.explainer is not None,
+            "ensemble": ensemble,
+            "loaded_at": self.loaded_at,
+        }
+
+
+def load_version(version, models_dir="models", model_format="joblib",
+                 linear_kernel="float64", fast_tfidf=True, ensemble=None) -> LoadedModel:
+    """
+    Load, compile and warm up one matched model/vectorizer pair
+
+    Blocking; the API runs it in a worker thread so serving continues on the
+    currently active model while a new one loads.
+    """
+    start = time.perf_counter()
+    model_path, vectorizer_path = model_files_for_version(version, models_dir)
+    compiled_dir = compiled_dir_for(model_path)
+
+    if model_format in ("compiled", "runtime") and os.path.isdir(compiled_dir):
+        # Memory-mapped arrays: shared across workers, nothing to unpickle;
+        # "runtime" also scores without scipy (runtime.py)
+        loader = load_runtime if model_format == "runtime" else load_compiled
+        scorer, featurizer = loader(compiled_dir)
+        model, vectorizer = scorer, featurizer
+    else:
+        if model_format != "joblib":
+            print(f"⚠️ Warning: {compiled_dir} not found, falling back to joblib")
+        import joblib
+
+        model_format = "joblib"
+        compiled_dir = None
+        model = joblib.load(model_path)
+        vectorizer = joblib.load(vectorizer_path)
+        scorer, featurizer = compile_pipeline(
+            model, vectorizer, linear_kernel=linear_kernel, fast_tfidf=fast_tfidf, ensemble=ensemble
+        )
+
+    # Warm-up prediction so the first real request doesn't pay for lazy init
+    predict_text(WARMUP_TEXT, scorer, featurizer)
+
+    try:
+        explainer = ExplanationIndex.from_pipeline(scorer, featurizer)
+    except ValueError:
+        explainer = None
+
+    return LoadedModel(
+        version, model_path, vectorizer_path, compiled_dir,
+        model, vectorizer, scorer, featurizer, time.perf_counter() - start,
+        model_format=model_format, explainer=explainer,
+    )
+
+
+class ModelWatcher:
+    """
+    Polls `models_dir` every `interval` seconds and calls `on_new_version`
+    (an async callable) when a newer matched pair than any seen before
+    appears. A version pinned through the admin endpoint is left alone
+    until another model is published.
+    """
+
+    def __init__(self, models_dir, interval, on_new_version):
+        self.models_dir = models_dir
+        self.interval = interval
+        self.on_new_version = on_new_version
+        self._latest_seen = None
+        self._task = None
+
+    def start(self):
+        versions = find_model_versions(self.models_dir)
+        self._latest_seen = versions[-1] if versions else None
+        self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                versions = find_model_versions(self.models_dir)
+                if versions and versions[-1] != self._latest_seen:
+                    await self.on_new_version(versions[-1])
+                    self._latest_seen = versions[-1]
+            except Exception as e:
+                print(f"❌ Error reloading model: {str(e)}")
@@ -0,0 +1,61 @@
+"""
+Response encoding for the Mental Health Text Classifier API
+Fast JSON responses and a compact binary batch format
+
+Compact batch layout (all little-endian), media type COMPACT_MEDIA_TYPE:
+    uint32          n_rows
+    uint32          n_classes
+    int32[n]        class index per row, -1 for texts that were too short
+    float32[n, k]   confidence scores in class_names order, NaN for -1 rows
+"""
+
+import struct
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from inference import class_names
+
+try:
+    import orjson  # noqa: F401
+    FastJSONResponse = ORJSONResponse
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    FastJSONResponse = JSONResponse
+
+COMPACT_MEDIA_TYPE = "application/vnd.mental-health.batch"
+
+_HEADER = struct.Struct("<II")
+
+
+def wants_compact(accept: Optional[str]) -> bool:
+    """True if the Accept header asks for the compact batch format"""
+    if not accept:
+        return False
+    return any(part.split(";")[0].strip() == COMPACT_MEDIA_TYPE for part in accept.split(","))
+
+
+def encode_compact_batch(predictions: List[Optional[Dict]]) -> bytes:
+    """Pack batch predictions (None for short texts) into the compact layout"""
+    n_rows, n_classes = len(predictions), len(class_names)
+    missing = [float("nan")] * n_classes
+    class_numbers = np.array(
+        [-1 if p is None else p["class_number"] for p in predictions], dtype="<i4"
+    )
+    scores = np.array(
+        [missing if p is None else [p["confidence_scores"][name] for name in class_names]
+         for p in predictions],
+        dtype="<f4",
+    ).reshape(n_rows, n_classes)
+
+    return _HEADER.pack(n_rows, n_classes) + class_numbers.tobytes() + scores.tobytes()
+
+
+def decode_compact_batch(body: bytes):
+    """Unpack the compact layout into (class_numbers, scores) arrays"""
+    n_rows, n_classes = _HEADER.unpack_from(body)
+    offset = _HEADER.size
+    class_numbers = np.frombuffer(body, dtype="<i4", count=n_rows, offset=offset)
+    offset += class_numbers.nbytes
+    scores = np.frombuffer(body, dtype="<f4", count=n_rows * n_classes, offset=offset)
+    return class_numbers, scores.reshape(n_rows, n_classes)
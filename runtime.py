@@ -0,0 +1,61 @@
+"""
+Lightweight runtime backend for the Mental Health Text Classifier
+Scores compiled artifacts with numpy alone: no scikit-learn, scipy or joblib
+
+The compiled artifact directory (see artifacts.py) is the portable graph:
+tokenizer settings, vocabulary, idf, weights and intercept as plain JSON,
+text and .npy files that any runtime can read. This backend runs it with a
+featurizer that emits raw CSR arrays and a sparse-dense product written
+in numpy, so a serving process only needs numpy installed.
+
+Select it with MODEL_FORMAT=runtime in the API.
+"""
+
+import numpy as np
+
+from artifacts import load_compiled
+from featurizer import FastTfidfFeaturizer
+
+
+class SparseRows:
+    """
+    Minimal CSR matrix: just enough of scipy's csr_matrix for LinearKernel
+
+    Supports `shape`, `dtype`, `astype` and `rows @ dense`.
+    """
+
+    def __init__(self, data, indices, indptr, n_features):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = (len(indptr) - 1, n_features)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def astype(self, dtype):
+        return SparseRows(self.data.astype(dtype), self.indices, self.indptr, self.shape[1])
+
+    def __matmul__(self, weights):
+        """(n_rows, n_features) @ (n_features, k) -> dense (n_rows, k)"""
+        out = np.zeros((self.shape[0], weights.shape[1]), dtype=np.result_type(self.data, weights))
+        if self.data.size:
+            contributions = weights[self.indices] * self.data[:, None]
+            # reduceat sums each row's slice; empty rows are skipped and stay 0
+            non_empty = np.diff(self.indptr) > 0
+            out[non_empty] = np.add.reduceat(contributions, self.indptr[:-1][non_empty], axis=0)
+        return out
+
+
+class RuntimeFeaturizer(FastTfidfFeaturizer):
+    """FastTfidfFeaturizer that returns SparseRows instead of a scipy matrix"""
+
+    def transform(self, texts):
+        data, indices, indptr = self.transform_arrays(texts)
+        return SparseRows(data, indices, indptr, self.n_features)
+
+
+def load_runtime(compiled_dir: str):
+    """Load a compiled artifact directory as a numpy-only (scorer, featurizer) pair"""
+    return load_compiled(compiled_dir, featurizer_cls=RuntimeFeaturizer)
@@ -0,0 +1,206 @@
+"""
+Bulk File Scoring for Mental Health Classifier
+Classifies a CSV or Parquet file with a `content` column across all cores
+
+Within each chunk, exact duplicates (after lowercasing and collapsing
+whitespace) are scored once; --near-duplicates THRESHOLD also shares the
+score of near copies (see dedup.py).
+
+Run with: python score_file.py data/cleaned_data.csv predictions.csv [--near-duplicates 0.9]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dedup import find_duplicates
+from inference import (
+    MIN_TEXT_LENGTH,
+    class_names,
+    find_latest_model_files,
+    load_pipeline,
+    model_version_from_path,
+    score_texts,
+)
+
+# Per-process pipeline loaded by the pool initializer
+_scorer = None
+_featurizer = None
+
+
+def _init_worker(model_path, vectorizer_path):
+    global _scorer, _featurizer
+    _scorer, _featurizer = load_pipeline(model_path, vectorizer_path)
+
+
+def score_chunk(texts, scorer=None, featurizer=None, near_threshold=None):
+    """
+    Score one chunk of texts with the given pipeline, or the worker process's
+
+    Only one text per duplicate group is scored (near duplicates too when
+    `near_threshold` is set). Returns (class_numbers, confidences, n_scored):
+    texts shorter than MIN_TEXT_LENGTH get class -1 and NaN confidences.
+    """
+    if scorer is None:
+        scorer, featurizer = _scorer, _featurizer
+
+    class_numbers = np.full(len(texts), -1, dtype=np.int64)
+    confidences = np.full((len(texts), len(class_names)), np.nan)
+
+    valid = np.array([len(text) >= MIN_TEXT_LENGTH for text in texts], dtype=bool)
+    if not valid.any():
+        return class_numbers, confidences, 0
+
+    valid_texts = [text for text, ok in zip(texts, valid) if ok]
+    groups = find_duplicates(valid_texts, threshold=near_threshold)
+    predictions, _, normalized_scores = score_texts(
+        [valid_texts[i] for i in groups.representatives], scorer, featurizer
+    )
+    class_numbers[valid] = groups.expand(predictions)
+    confidences[valid] = groups.expand(normalized_scores)
+
+    return class_numbers, confidences, groups.n_groups
+
+
+def import_pyarrow():
+    """(pyarrow, pyarrow.parquet); Parquet files need the optional pyarrow package"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading or writing .parquet files needs pyarrow: pip install pyarrow") from e
+    return pa, pq
+
+
+def read_chunks(path, chunk_size, text_column):
+    """Stream a CSV or Parquet file as DataFrames of at most `chunk_size` rows"""
+    if path.endswith(".parquet"):
+        _, pq = import_pyarrow()
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype={text_column: str})
+
+
+class ChunkWriter:
+    """Append scored chunks to a CSV or Parquet output file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._first = True
+
+    def write(self, df):
+        if self.parquet:
+            pa, pq = import_pyarrow()
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def attach_predictions(df, class_numbers, confidences):
+    """Add predicted_class, class_number and one confidence column per class"""
+    labels = np.array(class_names + ["ERROR"], dtype=object)
+    df = df.copy()
+    df["predicted_class"] = labels[class_numbers]
+    df["class_number"] = class_numbers
+    for i, name in enumerate(class_names):
+        df[f"confidence_{name}"] = confidences[:, i]
+    return df
+
+
+def score_file(input_path, output_path, models_dir="models", text_column="content",
+               chunk_size=5000, workers=None, near_threshold=None):
+    """
+    Score `input_path` into `output_path`; returns (rows, dedup_ratio, seconds),
+    where dedup_ratio is the fraction of scorable rows that reused a result
+    """
+    latest = find_latest_model_files(models_dir)
+    if latest is None:
+        raise FileNotFoundError(f"Model files not found in {models_dir}/")
+    model_path, vectorizer_path = latest
+    workers = workers or os.cpu_count() or 1
+    if input_path.endswith(".parquet") or output_path.endswith(".parquet"):
+        import_pyarrow()  # fail before starting the pool, not after the first chunk
+
+    print(f"✅ Model version: {model_version_from_path(model_path)}")
+    print(f"⚙️  Scoring {input_path} with {workers} workers, {chunk_size} rows per chunk")
+
+    writer = ChunkWriter(output_path)
+    rows = valid = scored = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_path, vectorizer_path)) as pool:
+        # Keep a bounded window of chunks in flight so memory stays flat
+        pending = []
+        chunks = read_chunks(input_path, chunk_size, text_column)
+
+        def drain(limit):
+            nonlocal rows, valid, scored
+            while len(pending) > limit:
+                df, future = pending.pop(0)
+                class_numbers, confidences, n_scored = future.result()
+                writer.write(attach_predictions(df, class_numbers, confidences))
+                rows += len(df)
+                valid += int((class_numbers >= 0).sum())
+                scored += n_scored
+                elapsed = time.perf_counter() - start
+                print(f"   {rows:,} rows  ({rows / elapsed:,.0f} rows/sec)", file=sys.stderr)
+
+        for df in chunks:
+            if text_column not in df.columns:
+                raise KeyError(f"Input has no '{text_column}' column")
+            texts = df[text_column].fillna("").astype(str).tolist()
+            pending.append((df, pool.submit(score_chunk, texts, near_threshold=near_threshold)))
+            drain(2 * workers)
+
+        drain(0)
+
+    writer.close()
+    return rows, 1 - scored / valid if valid else 0.0, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify a CSV/Parquet file of texts")
+    parser.add_argument("input", help="CSV or .parquet file with a text column")
+    parser.add_argument("output", help="Output CSV or .parquet file")
+    parser.add_argument("--column", default="content", help="Name of the text column (default: content)")
+    parser.add_argument("--models-dir", default="models", help="Directory with the trained model files")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per chunk (default: 5000)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--near-duplicates", type=float, default=None, metavar="THRESHOLD",
+                        help="Also share scores between near duplicates with at least this "
+                             "estimated similarity, e.g. 0.9 (default: exact duplicates only)")
+    args = parser.parse_args(argv)
+
+    rows, dedup_ratio, seconds = score_file(
+        args.input, args.output,
+        models_dir=args.models_dir,
+        text_column=args.column,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        near_threshold=args.near_duplicates,
+    )
+    print(f"✅ Scored {rows:,} rows in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/sec) -> {args.output}")
+    print(f"🔁 Dedup ratio: {dedup_ratio:.1%} of rows reused the score of a duplicate")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Slim serving entry point for the Mental Health Text Classifier API
+Starts the API with only what inference needs and logs startup timings
+
+MODEL_FORMAT defaults to "runtime" here, so once models/compiled_<version>/
+has been exported (python artifacts.py) the process never imports
+scikit-learn, scipy or joblib. Startup milestones (imports, model_ready,
+first_prediction) are logged in ms since this script began executing and
+are also reported by /stats and /metrics.
+
+Install with: pip install -r requirements-serve.txt
+Run with: python serve.py   (HOST and PORT env vars, default 0.0.0.0:8000)
+"""
+
+import time
+
+STARTED_AT = time.perf_counter()
+
+import os
+import sys
+
+os.environ.setdefault("MODEL_FORMAT", "runtime")
+
+import uvicorn
+
+import api
+from metrics import StartupTimer
+
+HEAVY_MODULES = ("sklearn", "scipy", "joblib", "pandas")
+
+api.startup = StartupTimer(STARTED_AT)
+api.startup.mark("imports")
+
+
+@api.app.on_event("startup")
+async def report_imports():
+    """Log which heavy libraries the loaded model pulled in (ideally none)"""
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(f"📦 Heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+
+def main():
+    uvicorn.run(
+        api.app,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Persistent prediction store for the Mental Health Text Classifier
+SQLite table of results shared by API workers, the Streamlit app and restarts
+
+Keys are cache.text_key() values (model version + fingerprint of the scoring
+settings + hash of the text), so a new model version or a process scoring
+with other settings never reads another's results; those simply age out.
+The database runs in WAL mode, so any number of processes read while one
+writes. Writes are buffered and flushed as one transaction,
+and lookups bump entries' last-used time in that same flush, so hits cost
+no extra write. Once the table holds more than `max_entries` rows, the
+least recently used are deleted; the row count is kept in `store_meta` and
+updated in the same transaction, so no flush has to count the table.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_used_at ON predictions (used_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT INTO store_meta SELECT 'size', (SELECT COUNT(*) FROM predictions)
+    WHERE NOT EXISTS (SELECT 1 FROM store_meta WHERE name = 'size');
+"""
+
+
+class PredictionStore:
+    """
+    On-disk prediction results, looked up before inference
+
+    Results passed to `put_many` are served from memory to this process at
+    once and written to disk once `batch_size` of them are pending or
+    `flush_interval` seconds have passed since the last flush (checked on
+    every put; the API also flushes on a timer and at shutdown).
+    """
+
+    def __init__(self, path: str, max_entries: int = 1_000_000, batch_size: int = 256,
+                 flush_interval: float = 1.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}
+        self._touched: Dict[str, None] = {}
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Results for whichever of `keys` are stored, as {key: result}"""
+        found = {}
+        with self._lock:
+            lookup = []
+            for key in keys:
+                if key in self._pending:
+                    found[key] = self._pending[key]
+                else:
+                    lookup.append(key)
+
+            for i in range(0, len(lookup), _QUERY_CHUNK):
+                chunk = lookup[i:i + _QUERY_CHUNK]
+                rows = self._db.execute(
+                    f"SELECT key, result FROM predictions WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, result in rows:
+                    found[key] = json.loads(result)
+                    self._touched[key] = None
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Iterable):
+        """Queue (key, result) pairs for the next batched write"""
+        with self._lock:
+            for key, result in items:
+                self._pending[key] = result
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def put(self, key: str, result: Dict):
+        self.put_many([(key, result)])
+
+    def flush(self):
+        """Write pending results and last-used times in one transaction, then evict"""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not (self._pending or self._touched):
+                return
+            now = time.time()
+            rows = [(key, json.dumps(result), now) for key, result in self._pending.items()]
+            touched = [(now, key) for key in self._touched if key not in self._pending]
+
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                added = len(rows) - self._count_existing([key for key, _, _ in rows])
+                self._db.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)", rows)
+                self._db.executemany("UPDATE predictions SET used_at = ? WHERE key = ?", touched)
+                size = self._size() + added
+                if size > self.max_entries:
+                    evicted = self._db.execute(
+                        "DELETE FROM predictions WHERE key IN "
+                        "(SELECT key FROM predictions ORDER BY used_at LIMIT ?)", (size - self.max_entries,)
+                    ).rowcount
+                    size -= evicted
+                    self.evictions += evicted
+                self._db.execute("UPDATE store_meta SET value = ? WHERE name = 'size'", (size,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+            self.writes += len(rows)
+            self._pending.clear()
+            self._touched.clear()
+
+    def _count_existing(self, keys: List[str]) -> int:
+        """How many of `keys` are already stored (primary key lookups, not a scan)"""
+        existing = 0
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            existing += self._db.execute(
+                f"SELECT COUNT(*) FROM predictions WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchone()[0]
+        return existing
+
+    def _size(self) -> int:
+        return self._db.execute("SELECT value FROM store_meta WHERE name = 'size'").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def stats(self) -> Dict:
+        """Counters for monitoring; may wait on a flush, so call it off the event loop"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "size": self._size(),
+                "max_entries": self.max_entries,
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,92 @@
+"""
+NDJSON streaming helpers for the Mental Health Text Classifier API
+Incrementally parse `{id, text}` records and group them into scoring chunks
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, BinaryIO, Dict, List
+
+# Read size used when replaying a spooled request body
+READ_BLOCK_SIZE = 64 * 1024
+
+
+async def iter_file_blocks(fileobj: BinaryIO, block_size: int = READ_BLOCK_SIZE) -> AsyncIterator[bytes]:
+    """Yield a binary file in fixed-size blocks, read in a worker thread"""
+    while True:
+        block = await asyncio.to_thread(fileobj.read, block_size)
+        if not block:
+            return
+        yield block
+
+
+async def iter_ndjson_records(byte_stream: AsyncIterator[bytes]) -> AsyncIterator[Dict]:
+    """
+    Yield one dict per NDJSON line from a stream of byte chunks
+
+    Lines are split as bytes arrive, so only the current partial line is
+    buffered. Blank lines are skipped; lines that are not a JSON object with
+    an `id` and a string `text` are yielded as `{"id": ..., "error": ...}`.
+    """
+    buffer = b""
+    line_number = 0
+
+    async for chunk in byte_stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            record = parse_record(line, line_number)
+            if record is not None:
+                yield record
+
+    if buffer:
+        record = parse_record(buffer, line_number + 1)
+        if record is not None:
+            yield record
+
+
+def parse_record(line: bytes, line_number: int):
+    """Parse one NDJSON line into a record, an error record, or None if blank"""
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return {"id": None, "error": f"Invalid JSON on line {line_number}"}
+
+    if not isinstance(record, dict) or "id" not in record:
+        return {"id": None, "error": f"Missing id on line {line_number}"}
+    if not isinstance(record.get("text"), str):
+        return {"id": record["id"], "error": "Missing text"}
+
+    return {"id": record["id"], "text": record["text"]}
+
+
+async def iter_chunks(records: AsyncIterator[Dict], size: int) -> AsyncIterator[List[Dict]]:
+    """Group records into lists of at most `size`"""
+    chunk = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def skip_until(records: AsyncIterator[Dict], last_id) -> AsyncIterator[Dict]:
+    """
+    Drop records up to and including the one whose id equals `last_id`
+
+    Used to resume a stream: the client re-sends the same input and passes
+    the last id it acknowledged. If that id never appears nothing is yielded.
+    """
+    resumed = last_id is None
+    async for record in records:
+        if resumed:
+            yield record
+        elif str(record["id"]) == str(last_id):
+            resumed = True
@@ -161,6 +161,23 @@ def test_batch_prediction():
     except Exception as e:
         print(f"❌ Error: {e}")
 
+def test_explanation():
+    """Test per-token prediction explanations"""
+    print_section("TEST 8: Prediction Explanation (/explain)")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/explain",
+            json={"text": "I've been feeling really anxious lately and having panic attacks", "top_k": 5}
+        )
+        print(f"✅ Status Code: {response.status_code}")
+        result = response.json()
+        predicted_class = result['predicted_class']
+        print(f"🎯 Predicted: {predicted_class}")
+        for token in result['tokens']:
+            print(f"   {token['term']:<20} {token['contributions'][predicted_class]:+.3f}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
 def test_error_handling():
     """Test error handling with invalid inputs"""
     print_section("TEST 7: Error Handling")
@@ -213,6 +230,7 @@ def run_all_tests():
         # Prediction tests
         test_single_prediction()
         test_batch_prediction()
+        test_explanation()
         
         # Error handling tests
         test_error_handling()
@@ -0,0 +1,31 @@
+"""
+Compiled Artifact Tests for Mental Health Classifier
+"""
+
+import joblib
+import numpy as np
+
+from artifacts import export_compiled, load_compiled
+from inference import find_latest_model_files, score_texts
+
+TEXTS = [
+    "I feel so sad and hopeless, nothing makes me happy anymore",
+    "Work deadlines are overwhelming me, I feel constant pressure and tension",
+    "My mood swings are extreme, one moment I'm energetic and the next I'm down",
+]
+
+
+def test_compiled_roundtrip_matches_sklearn(tmp_path):
+    """Memory-mapped artifacts score exactly like the pickled pair"""
+    model_path, vectorizer_path = find_latest_model_files("models")
+    model, vectorizer = joblib.load(model_path), joblib.load(vectorizer_path)
+
+    export_compiled(model, vectorizer, str(tmp_path / "compiled"))
+    scorer, featurizer = load_compiled(str(tmp_path / "compiled"))
+
+    X = vectorizer.transform(TEXTS)
+    assert (featurizer.transform(TEXTS) != X).nnz == 0
+
+    predictions, decision_scores, _ = score_texts(TEXTS, scorer, featurizer)
+    assert list(predictions) == list(model.predict(X))
+    assert np.allclose(decision_scores, model.decision_function(X))
@@ -0,0 +1,62 @@
+"""
+Micro-Batcher Tests for Mental Health Classifier
+"""
+
+import asyncio
+
+from batcher import MicroBatcher
+
+
+def test_concurrent_submissions_share_a_batch():
+    """Requests arriving within the window are scored in one call, in order"""
+    calls = []
+
+    async def score_batch(texts):
+        calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+    async def scenario():
+        batcher = MicroBatcher(score_batch, window_ms=20, max_batch_size=8)
+        batcher.start()
+        results = await asyncio.gather(*(batcher.submit(f"text {i}") for i in range(5)))
+        await batcher.stop()
+        return batcher, results
+
+    batcher, results = asyncio.run(scenario())
+
+    assert results == [f"TEXT {i}" for i in range(5)]
+    assert calls == [[f"text {i}" for i in range(5)]]
+    assert batcher.stats()["batch_size_histogram"]["le_8"] == 1
+
+
+def test_max_batch_size_splits_batches():
+    """No batch is larger than max_batch_size"""
+    sizes = []
+
+    async def score_batch(texts):
+        sizes.append(len(texts))
+        return texts
+
+    async def scenario():
+        batcher = MicroBatcher(score_batch, window_ms=20, max_batch_size=3)
+        batcher.start()
+        await asyncio.gather(*(batcher.submit(str(i)) for i in range(7)))
+        await batcher.stop()
+
+    asyncio.run(scenario())
+    assert sizes == [3, 3, 1]
+
+
+def test_errors_reach_every_caller():
+    """A failing batch fails each waiting request"""
+    async def score_batch(texts):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        batcher = MicroBatcher(score_batch, window_ms=5)
+        batcher.start()
+        results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(scenario()))
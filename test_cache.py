@@ -0,0 +1,70 @@
+"""
+Prediction Cache Tests for Mental Health Classifier
+"""
+
+from cache import PredictionCache, config_fingerprint, normalize_text, text_key, whole_text_config
+
+
+def test_normalized_text_shares_a_key():
+    """Case and whitespace differences map to the same cache entry"""
+    cache = PredictionCache(maxsize=10, model_version="v1")
+    assert normalize_text("  I feel\tSO  anxious\n") == "i feel so anxious"
+    assert cache.key("I feel SO anxious") == cache.key("i  feel so anxious ")
+    assert cache.key("I feel SO anxious", normalize=False) != cache.key("i  feel so anxious ", normalize=False)
+
+
+def test_lru_eviction_and_counters():
+    """The least recently used entry is evicted once the cache is full"""
+    cache = PredictionCache(maxsize=2, ttl=0, model_version="v1")
+    a, b, c = cache.key("text a"), cache.key("text b"), cache.key("text c")
+    cache.put(a, {"class_number": 0})
+    cache.put(b, {"class_number": 1})
+    assert cache.get(a) == {"class_number": 0}
+
+    cache.put(c, {"class_number": 2})
+    assert cache.get(b) is None
+    assert cache.get(c) == {"class_number": 2}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL are treated as misses"""
+    cache = PredictionCache(maxsize=2, ttl=1e-9, model_version="v1")
+    key = cache.key("text a")
+    cache.put(key, {"class_number": 0})
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_new_model_version_invalidates():
+    """Switching model version drops every cached prediction"""
+    cache = PredictionCache(maxsize=10, model_version="v1")
+    key = cache.key("I feel so anxious")
+    cache.put(key, {"class_number": 4})
+
+    cache.set_model_version("v2")
+    assert cache.key("I feel so anxious") != key
+    assert cache.stats()["size"] == 0
+
+    # A result that was still being scored by the old model is not stored
+    cache.put(key, {"class_number": 4})
+    assert cache.stats()["size"] == 0
+
+
+def test_scoring_config_is_part_of_the_key():
+    """Results scored under different settings never share an entry"""
+    default = PredictionCache(model_version="v1", config=config_fingerprint({"ensemble": None}))
+    cascade = PredictionCache(model_version="v1", config=config_fingerprint({"ensemble": "cascade"}))
+    assert default.key("I feel so anxious") != cascade.key("I feel so anxious")
+    assert default.key("I feel so anxious").startswith("v1:")
+
+
+def test_whole_text_keys_match_across_equivalent_settings():
+    """Unset ensemble overrides and float64 backends fingerprint the same; float32 does not"""
+    app = text_key("I feel anxious", "v1", config=whole_text_config())
+    api = text_key("I  feel ANXIOUS", "v1", config=whole_text_config(ensemble={"strategy": None, "threshold": None}))
+    assert app == api
+    assert whole_text_config(float32=True) != whole_text_config()
+    assert whole_text_config(ensemble={"strategy": "cascade"}) != whole_text_config()
@@ -0,0 +1,79 @@
+"""
+Tests for duplicate detection
+Run with: pytest test_dedup.py
+"""
+
+import random
+
+from dedup import find_duplicates, sketch, similarity
+from inference import find_latest_model_files, load_pipeline, predict_batch
+
+WORDS = ("anxious worried panic sad hopeless tired stressed work deadline mood swings "
+         "sleep energy friends family alone heart racing breathe cry empty").split()
+
+
+def make_text(rng, n_words=40):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def test_exact_duplicates_ignore_case_and_spacing():
+    """Normalized copies share a group; key=None only merges identical strings"""
+    texts = ["I feel so anxious today", "i feel  so ANXIOUS today", "I feel so anxious today", "Something else"]
+
+    groups = find_duplicates(texts)
+    assert groups.representatives.tolist() == [0, 3]
+    assert groups.group_of.tolist() == [0, 0, 0, 1]
+    assert groups.ratio == 0.5
+    assert groups.expand(["a", "b"]) == ["a", "a", "a", "b"]
+
+    assert find_duplicates(texts, key=None).group_of.tolist() == [0, 1, 0, 2]
+
+
+def test_near_duplicates_are_grouped_above_the_threshold():
+    """One-word edits join their original; unrelated texts stay apart"""
+    rng = random.Random(0)
+    originals = [make_text(rng) for _ in range(50)]
+    edited = []
+    for text in originals:
+        words = text.split()
+        words[rng.randrange(len(words))] = "typo"
+        edited.append(" ".join(words))
+
+    groups = find_duplicates(originals + edited, threshold=0.7)
+    assert groups.n_groups == 50
+    assert groups.group_of[:50].tolist() == groups.group_of[50:].tolist()
+
+    signatures = sketch(originals + edited)
+    for i, group in enumerate(groups.group_of):
+        assert similarity(signatures[i], signatures[groups.representatives[group]]) >= 0.7
+    assert find_duplicates(originals + edited).n_groups == 100  # exact only
+
+
+def test_sketch_boundaries_survive_nul_tokens():
+    """A standalone NUL token inside a text does not shift later signatures"""
+    texts = ["hello world foo bar", "a \x00 b c d e", "hello world foo bar", "", "x"]
+    signatures = sketch(texts)
+
+    assert signatures.shape == (5, 64)
+    assert (signatures[0] == signatures[2]).all()
+    assert (signatures[1] == sketch(["a \x00 b c d e"])[0]).all()
+    assert find_duplicates(texts, threshold=0.5, key=None).n_groups == 4
+
+
+def test_predict_batch_scores_repeats_once():
+    """Repeated texts in a batch are featurized once and share the result"""
+    scorer, featurizer = load_pipeline(*find_latest_model_files("models"))
+    seen = []
+
+    class CountingFeaturizer:
+        def transform(self, texts):
+            seen.extend(texts)
+            return featurizer.transform(texts)
+
+    texts = ["I can't stop worrying about everything", "short", "I feel empty and sad",
+             "I can't stop worrying about everything"]
+    results = predict_batch(texts, scorer, CountingFeaturizer())
+
+    assert seen == ["I can't stop worrying about everything", "I feel empty and sad"]
+    assert results[1] is None
+    assert results[0] == results[3]
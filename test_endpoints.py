@@ -0,0 +1,228 @@
+"""
+In-process API Tests for Mental Health Classifier
+Drive api.app through fastapi.testclient, with the model in models/
+Run with: pytest test_endpoints.py
+"""
+
+import asyncio
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from responses import COMPACT_MEDIA_TYPE, decode_compact_batch
+from store import PredictionStore
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(api.app) as client:
+        yield client
+
+
+def long_texts(count, length=1000):
+    """Distinct texts of about `length` characters, so the cache never answers them"""
+    return [(f"text {i} I feel anxious and cannot sleep at night " * length)[:length] for i in range(count)]
+
+
+@pytest.fixture
+def tight_pool(monkeypatch):
+    """Segment texts over 300 characters and leave room for only two extra jobs"""
+    monkeypatch.setattr(api, "LONG_TEXT_THRESHOLD", 300)
+    monkeypatch.setattr(api, "SEGMENT_LENGTH", 100)
+    monkeypatch.setattr(api, "SEGMENTS_PER_JOB", 2)
+    monkeypatch.setattr(api, "MAX_JOBS_PER_REQUEST", 2)
+    monkeypatch.setattr(api.inference_executor, "queue_limit", 2)
+    return api.inference_executor
+
+
+def test_batch_of_long_texts_fits_the_pool(client, tight_pool):
+    """Segments of every long text share bounded jobs instead of flooding the pool"""
+    rejected = tight_pool.stats()["rejected"]
+    texts = long_texts(20) + ["I keep worrying about everything"]
+
+    response = client.post("/batch-predict", json={"texts": texts})
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert [len(row["segments"]) for row in rows[:-1]] == [10] * 20
+    assert "segments" not in rows[-1]
+    assert tight_pool.stats()["rejected"] == rejected
+    assert tight_pool.stats()["in_flight"] == 0
+
+
+def test_stream_of_long_texts_finishes(client, tight_pool):
+    """A stream chunk of long texts completes without being shed or resubmitted"""
+    rejected = tight_pool.stats()["rejected"]
+    body = "".join(json.dumps({"id": i, "text": text}) + "\n" for i, text in enumerate(long_texts(30, 900)))
+
+    response = client.post("/stream-predict", content=body)
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert [line["id"] for line in lines[:-1]] == list(range(30))
+    assert lines[-1]["processed"] == 30 and lines[-1]["errors"] == 0
+    assert tight_pool.stats()["rejected"] == rejected
+
+
+def test_failed_job_cancels_its_siblings(monkeypatch):
+    """One failing job cancels the rest of the request's jobs instead of leaving them running"""
+    cancelled = []
+
+    async def predict_batch(batch):
+        if batch == ["bad"]:
+            raise ValueError("bad batch")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(batch)
+            raise
+
+    monkeypatch.setattr(api.inference_executor, "predict_batch", predict_batch)
+    monkeypatch.setattr(api, "MAX_JOBS_PER_REQUEST", 3)
+
+    with pytest.raises(ValueError):
+        asyncio.run(api.run_jobs([["slow"], ["bad"], ["slow"]]))
+    assert cancelled == [["slow"], ["slow"]]
+
+
+def test_reload_is_refused_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", None)
+    response = client.post("/admin/reload-model", headers={"X-Admin-Token": "anything"})
+    assert response.status_code == 403
+
+
+def test_reload_requires_the_admin_token(client, monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload-model").status_code == 403
+    assert client.post("/admin/reload-model", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_reload_swaps_in_a_new_version(client, monkeypatch, tmp_path):
+    """A newly published pair is served, and labelled, after an authorized reload"""
+    original = api.model_version
+    for name in os.listdir("models"):
+        if name.endswith(".pkl"):
+            shutil.copy(os.path.join("models", name), tmp_path / name)
+            shutil.copy(os.path.join("models", name), tmp_path / name.replace(original, "29990101_000000"))
+    monkeypatch.setattr(api, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+
+    try:
+        response = client.post("/admin/reload-model", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["previous_version"] == original
+        assert response.json()["model"]["version"] == "29990101_000000"
+
+        prediction = client.post("/predict", json={"text": "I feel hopeless and empty inside"}).json()
+        assert prediction["model_version"] == "29990101_000000"
+        assert client.get("/health").json()["model_version"] == "29990101_000000"
+    finally:
+        client.post("/admin/reload-model", params={"version": original}, headers=headers)
+    assert api.model_version == original
+
+
+def stream(client, lines, **params):
+    """POST NDJSON lines to /stream-predict; returns the parsed result lines"""
+    response = client.post("/stream-predict", content="".join(line + "\n" for line in lines), params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_spools_to_disk_and_chunks(client, monkeypatch):
+    """A body past the spool size goes to disk and comes back in order, chunk by chunk"""
+    monkeypatch.setattr(api, "STREAM_SPOOL_BYTES", 1024)
+    monkeypatch.setattr(api, "STREAM_CHUNK_SIZE", 7)
+    lines = [json.dumps({"id": f"r{i}", "text": f"record {i}: I cannot stop worrying about work"}) for i in range(50)]
+
+    results = stream(client, lines)
+
+    assert [result["id"] for result in results[:-1]] == [f"r{i}" for i in range(50)]
+    assert all(result["predicted_class"] in api.class_names for result in results[:-1])
+    assert results[-1] == {"done": True, "processed": 50, "errors": 0, "last_id": "r49",
+                           "model_version": api.model_version}
+
+
+def test_stream_reports_bad_records_in_place(client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_TEXT_LENGTH", 100)
+    lines = [
+        json.dumps({"id": 1, "text": "I feel hopeless and empty inside"}),
+        "{not json",
+        json.dumps({"id": 3, "text": "too short"}),
+        json.dumps({"id": 4}),
+        json.dumps({"id": 5, "text": "x" * 101}),
+        json.dumps({"id": 6, "text": "My heart races and I panic in crowds"}),
+    ]
+
+    results = stream(client, lines)
+
+    assert [(result["id"], result.get("error")) for result in results[:-1]] == [
+        (1, None), (None, "Invalid JSON on line 2"), (3, "Text too short"), (4, "Missing text"),
+        (5, "Text too long"), (6, None),
+    ]
+    assert results[-1]["processed"] == 6 and results[-1]["errors"] == 4
+
+
+def test_stream_resumes_after_the_last_acknowledged_id(client):
+    lines = [json.dumps({"id": i, "text": f"record {i}: I feel so tired and sad"}) for i in range(10)]
+
+    results = stream(client, lines, resume_after=6)
+
+    assert [result["id"] for result in results[:-1]] == [7, 8, 9]
+    assert results[-1]["processed"] == 3 and results[-1]["last_id"] == 9
+
+
+def test_batch_negotiates_the_compact_format(client):
+    """The compact body carries the same classes and scores as the JSON rows"""
+    texts = ["I feel hopeless and empty inside", "short", "Deadlines at work are crushing me"]
+
+    rows = client.post("/batch-predict", json={"texts": texts}).json()
+    response = client.post("/batch-predict", json={"texts": texts},
+                           headers={"Accept": f"application/json;q=0.5, {COMPACT_MEDIA_TYPE}"})
+
+    assert response.headers["content-type"] == COMPACT_MEDIA_TYPE
+    assert response.headers["x-model-version"] == api.model_version
+    assert response.headers["x-class-names"] == ",".join(api.class_names)
+    class_numbers, scores = decode_compact_batch(response.content)
+    assert class_numbers.tolist() == [row["class_number"] for row in rows]
+    assert class_numbers[1] == -1
+    assert np.allclose(scores[0], [rows[0]["confidence_scores"][name] for name in api.class_names])
+    assert np.isnan(scores[1]).all()
+
+
+def test_batch_json_rows_have_only_the_declared_fields(client):
+    rows = client.post("/batch-predict", json={"texts": ["I feel hopeless and empty inside", "short"]}).json()
+    assert set(rows[0]) == set(api.PredictionResponse.model_fields) - {"segments"}
+    assert rows[1]["predicted_class"] == "ERROR"
+
+
+def test_batch_misses_are_scored_once_then_served_from_the_store(client, monkeypatch, tmp_path):
+    """Cache misses fall through to the store, and only store misses reach the executor"""
+    store = PredictionStore(str(tmp_path / "predictions.db"))
+    monkeypatch.setattr(api, "prediction_store", store)
+    scored = []
+    predict_batch = api.inference_executor.predict_batch
+
+    async def counting_predict_batch(texts):
+        scored.extend(texts)
+        return await predict_batch(texts)
+
+    monkeypatch.setattr(api.inference_executor, "predict_batch", counting_predict_batch)
+    texts = ["Store routing: I feel hopeless", "Store routing: my heart races", "short"]
+
+    first = client.post("/batch-predict", json={"texts": texts}).json()
+    assert scored == texts[:2]  # too-short texts are never scored
+    assert store.stats()["pending"] + store.stats()["size"] == 2
+
+    api.prediction_cache.clear()
+    second = client.post("/batch-predict", json={"texts": texts + ["Store routing: deadlines crush me"]}).json()
+    assert scored == texts[:2] + ["Store routing: deadlines crush me"]
+    assert store.stats()["hits"] == 2
+    assert [row["confidence_scores"] for row in second[:3]] == [row["confidence_scores"] for row in first]
+    store.close()
@@ -0,0 +1,73 @@
+"""
+Tests for ensemble serving
+Run with: pytest test_ensemble.py
+"""
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import LinearSVC
+
+from ensemble import build_ensemble
+from inference import load_pipeline, model_files_for_version, predict_batch, save_model_pair, softmax
+from registry import load_version
+from test_train import make_dataset
+
+
+def make_ensemble(strategy="cascade", threshold=0.8):
+    texts, labels = make_dataset(seed=0)
+    cal_texts, cal_labels = make_dataset(per_class=10, seed=1)
+    vectorizer = TfidfVectorizer(stop_words="english").fit(texts)
+    estimators = {
+        "SVM": LinearSVC(),
+        "LogisticRegression": LogisticRegression(max_iter=1000),
+        "RandomForest": RandomForestClassifier(n_estimators=20, random_state=0),
+    }
+    ensemble = build_ensemble(vectorizer.transform(texts), labels,
+                              vectorizer.transform(cal_texts), cal_labels,
+                              estimators=estimators, strategy=strategy, threshold=threshold)
+    return ensemble, vectorizer, estimators
+
+
+def test_strategies_combine_member_probabilities():
+    """average/vote/cascade all produce distributions; LR keeps its own probabilities"""
+    ensemble, vectorizer, estimators = make_ensemble()
+    X = vectorizer.transform(make_dataset(seed=2)[0])
+    probas = [m.predict_proba(X) for m in ensemble.members]
+
+    assert np.allclose(probas[1], estimators["LogisticRegression"].predict_proba(X))
+    average = ensemble.with_strategy("average")
+    assert np.allclose(average.predict_proba(X), np.mean(probas, axis=0))
+    assert np.allclose(softmax(average.decision_function(X)), average.predict_proba(X))
+
+    votes = ensemble.with_strategy("vote").predict_proba(X)
+    assert np.allclose(votes.sum(axis=1), 1.0)
+    majority = np.array([np.bincount([p[i].argmax() for p in probas]).max() for i in range(X.shape[0])])
+    assert np.allclose(np.round(votes.max(axis=1) * 3), majority)
+
+    # Threshold 0 never escalates; above 1 always does
+    assert np.allclose(ensemble.with_strategy("cascade", 0.0).predict_proba(X), probas[0])
+    assert np.allclose(ensemble.with_strategy("cascade", 1.01).predict_proba(X), np.mean(probas, axis=0))
+
+
+def test_ensemble_is_served_like_any_model_version(tmp_path):
+    """Saved as an ordinary pair; the loader can override the strategy"""
+    ensemble, vectorizer, _ = make_ensemble(strategy="vote")
+    version = save_model_pair(ensemble, vectorizer, str(tmp_path))
+    texts = ["panic worry nervous heart racing", "hopeless empty sad crying"]
+
+    scorer, featurizer = load_pipeline(*model_files_for_version(version, str(tmp_path)),
+                                       ensemble={"strategy": "cascade", "threshold": 0.5})
+    assert (scorer.strategy, scorer.threshold) == ("cascade", 0.5)
+    results = predict_batch(texts, scorer, featurizer)
+    expected = ensemble.with_strategy("cascade", 0.5).predict_proba(vectorizer.transform(texts))
+    for result, row in zip(results, expected):
+        assert np.isclose(max(result["confidence_scores"].values()), row.max())
+
+    loaded = load_version(version, str(tmp_path))
+    assert loaded.model_type() == "Ensemble (vote) of SVM, LogisticRegression, RandomForest"
+    assert loaded.features().startswith("TF-IDF with ")
+    info = loaded.info()
+    assert info["ensemble"] == {"strategy": "vote", "threshold": 0.8,
+                                "members": ["SVM", "LogisticRegression", "RandomForest"]}
@@ -0,0 +1,115 @@
+"""
+Inference Executor Tests for Mental Health Classifier
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import executor as executor_module
+from executor import ExecutorSaturated, InferenceExecutor
+
+
+def test_rejects_jobs_beyond_capacity(monkeypatch):
+    """Once workers + queue_limit jobs are in flight, new jobs are shed"""
+    release = threading.Event()
+    monkeypatch.setattr(executor_module, "predict_batch",
+                        lambda texts, *args, **kwargs: release.wait(5) and [None] * len(texts))
+
+    pool = InferenceExecutor(kind="thread", workers=1, queue_limit=1)
+    pool.start()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.predict_batch(["text"])) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated):
+            await pool.predict_batch(["text"])
+        release.set()
+        await asyncio.gather(*running)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_results_carry_the_version_that_scored_them(monkeypatch):
+    """A model swap while a job runs does not relabel that job's results"""
+    release = threading.Event()
+    monkeypatch.setattr(executor_module, "predict_batch",
+                        lambda texts, *args, **kwargs: release.wait(5) and [{"class_number": 0} for _ in texts])
+
+    pool = InferenceExecutor(kind="thread", workers=1, queue_limit=1)
+    pool.start(version="v1")
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.predict_batch(["text"]))
+        await asyncio.sleep(0.05)
+        pool.set_pipeline(None, None, version="v2")
+        release.set()
+        return await running, await pool.predict_batch(["text"])
+
+    try:
+        before, after = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert before[0]["model_version"] == "v1"
+    assert after[0]["model_version"] == "v2"
+
+
+def test_event_loop_stays_responsive():
+    """Other coroutines keep running while a job is busy in the pool"""
+    release = threading.Event()
+    pool = InferenceExecutor(kind="thread", workers=1, queue_limit=0)
+    pool.start()
+
+    async def scenario():
+        job = asyncio.ensure_future(pool._submit(release.wait, 5))
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        release.set()
+        await job
+        return ticks
+
+    try:
+        assert asyncio.run(scenario()) == 5
+    finally:
+        pool.shutdown()
+
+
+def test_explanations_share_the_pool_and_its_limit():
+    """explain() runs on the bounded pool and reports its stage timings"""
+    from explain import ExplanationIndex
+    from inference import find_latest_model_files, load_pipeline
+
+    scorer, featurizer = load_pipeline(*find_latest_model_files("models"))
+    observed = []
+    pool = InferenceExecutor(kind="thread", workers=1, queue_limit=0)
+    pool.observer = lambda timings, batch_size: observed.append(sorted(timings))
+    pool.start(scorer=scorer, featurizer=featurizer, explainer=ExplanationIndex.from_pipeline(scorer, featurizer))
+    release = threading.Event()
+
+    async def scenario():
+        result = await pool.explain("I feel anxious and my heart races", top_k=2)
+        busy = asyncio.ensure_future(pool._submit(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated):
+            await pool.explain("I feel anxious and my heart races")
+        release.set()
+        await busy
+        return result
+
+    try:
+        result = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert len(result["tokens"]) == 2
+    assert observed == [["decision_function", "explanation", "transform"]]
@@ -0,0 +1,63 @@
+"""
+Tests for prediction explanations
+Run with: pytest test_explain.py
+"""
+
+import numpy as np
+import pytest
+
+from artifacts import export_compiled
+from explain import ExplanationIndex
+from inference import class_names, find_latest_model_files, predict_text
+from runtime import load_runtime
+
+TEXT = "I've been feeling really anxious lately and having panic attacks"
+
+
+def test_contributions_add_up_to_the_raw_scores(tmp_path):
+    """Token contributions plus intercepts are the model's decision scores"""
+    import joblib
+
+    model_path, vectorizer_path = find_latest_model_files("models")
+    model, vectorizer = joblib.load(model_path), joblib.load(vectorizer_path)
+    export_compiled(model, vectorizer, str(tmp_path))
+
+    for scorer, featurizer in ((model, vectorizer), load_runtime(str(tmp_path))):
+        explanation = ExplanationIndex.from_pipeline(scorer, featurizer).explain(TEXT, featurizer, top_k=100)
+        expected = predict_text(TEXT, model, vectorizer)
+
+        assert explanation["predicted_class"] == expected["predicted_class"]
+        for name in class_names:
+            total = explanation["intercepts"][name] + sum(t["contributions"][name] for t in explanation["tokens"])
+            assert np.isclose(total, expected["raw_scores"][name])
+
+        best = [t["contributions"][expected["predicted_class"]] for t in explanation["tokens"]]
+        assert best == sorted(best, reverse=True)
+        assert "anxious" in [t["term"] for t in explanation["tokens"][:3]]
+
+
+def test_non_linear_models_are_rejected():
+    """Ensembles and other non-linear models have no contribution index"""
+    with pytest.raises(ValueError):
+        ExplanationIndex.from_pipeline(object(), None)
+
+
+def test_segmented_explanation_matches_aggregated_segments():
+    """With spans, the explanation adds up to the segment-aggregated scores"""
+    import joblib
+
+    from inference import aggregate_segments, predict_batch, split_segments
+
+    model_path, vectorizer_path = find_latest_model_files("models")
+    model, vectorizer = joblib.load(model_path), joblib.load(vectorizer_path)
+    text = " ".join([TEXT, "I feel so sad and hopeless, nothing makes me happy anymore"] * 10)
+    spans = split_segments(text, 150)
+
+    explanation = ExplanationIndex.from_pipeline(model, vectorizer).explain(text, vectorizer, 10_000, spans)
+    expected = aggregate_segments(spans, predict_batch([text[s:e] for s, e in spans], model, vectorizer))
+
+    assert explanation["predicted_class"] == expected["predicted_class"]
+    for name in class_names:
+        assert np.isclose(explanation["raw_scores"][name], expected["raw_scores"][name])
+        total = explanation["intercepts"][name] + sum(t["contributions"][name] for t in explanation["tokens"])
+        assert np.isclose(total, expected["raw_scores"][name])
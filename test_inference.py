@@ -0,0 +1,184 @@
+"""
+Inference Core Tests for Mental Health Classifier
+Checks the shared scoring code against the shipped models/ pickles
+"""
+
+import joblib
+import numpy as np
+import pytest
+
+from featurizer import FastTfidfFeaturizer
+from inference import (
+    LinearKernel,
+    aggregate_segments,
+    class_names,
+    find_latest_model_files,
+    predict_batch,
+    predict_text,
+    score_texts,
+    softmax,
+    split_segments,
+)
+
+MODELS_DIR = "models"
+
+SAMPLE_TEXTS = [
+    "I feel extremely anxious about everything, my heart races and I can't stop worrying",
+    "I feel so sad and hopeless, nothing makes me happy anymore",
+    "Work deadlines are overwhelming me, I feel constant pressure and tension",
+    "My mood swings are extreme, one moment I'm energetic and the next I'm completely down",
+    "I have trouble trusting people and maintaining relationships",
+]
+
+
+@pytest.fixture(scope="module")
+def model_and_vectorizer():
+    """Load the most recent model and vectorizer from models/"""
+    model_path, vectorizer_path = find_latest_model_files(MODELS_DIR)
+    return joblib.load(model_path), joblib.load(vectorizer_path)
+
+
+def test_softmax_rows_sum_to_one():
+    """Softmax is applied per row of the score matrix"""
+    probs = softmax(np.array([[1.0, 2.0, 3.0], [0.0, 0.0, 0.0]]))
+    assert np.allclose(probs.sum(axis=1), 1.0)
+    assert np.allclose(probs[1], 1 / 3)
+
+
+def test_score_texts_matches_sklearn(model_and_vectorizer):
+    """Batched scoring gives the same classes and scores as model.predict"""
+    model, vectorizer = model_and_vectorizer
+    predictions, decision_scores, _ = score_texts(SAMPLE_TEXTS, model, vectorizer)
+
+    X = vectorizer.transform(SAMPLE_TEXTS)
+    assert list(predictions) == list(model.predict(X))
+    assert np.allclose(decision_scores, model.decision_function(X))
+
+
+def test_predict_batch_keeps_invalid_positions(model_and_vectorizer):
+    """Short texts come back as None at their original index"""
+    model, vectorizer = model_and_vectorizer
+    texts = ["too short", SAMPLE_TEXTS[0], "", SAMPLE_TEXTS[1]]
+    results = predict_batch(texts, model, vectorizer)
+
+    assert results[0] is None and results[2] is None
+    for text, result in ((texts[1], results[1]), (texts[3], results[3])):
+        single = predict_batch([text], model, vectorizer)[0]
+        assert result["class_number"] == single["class_number"]
+        assert result["predicted_class"] in class_names
+        assert sum(result["confidence_scores"].values()) == pytest.approx(1.0)
+
+
+def test_predict_text_derives_everything_from_one_score(model_and_vectorizer):
+    """Single-text results carry class, confidences and raw scores that agree"""
+    model, vectorizer = model_and_vectorizer
+    for text in SAMPLE_TEXTS:
+        result = predict_text(text, model, vectorizer)
+        X = vectorizer.transform([text])
+
+        assert result["class_number"] == model.predict(X)[0]
+        assert np.allclose(list(result["raw_scores"].values()), model.decision_function(X)[0])
+        assert max(result["confidence_scores"], key=result["confidence_scores"].get) == result["predicted_class"]
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_linear_kernel_matches_decision_function(model_and_vectorizer, dtype):
+    """The precompiled kernel reproduces sklearn's classes and scores"""
+    model, vectorizer = model_and_vectorizer
+    kernel = LinearKernel.from_model(model, dtype=dtype)
+    X = vectorizer.transform(SAMPLE_TEXTS)
+
+    assert kernel.weights.flags["C_CONTIGUOUS"]
+    assert np.allclose(kernel.decision_function(X), model.decision_function(X), atol=1e-5)
+
+    predictions, _, _ = score_texts(SAMPLE_TEXTS, kernel, vectorizer)
+    assert list(predictions) == list(model.predict(X))
+
+
+def test_fast_featurizer_matches_vectorizer(model_and_vectorizer):
+    """The precompiled featurizer reproduces vectorizer.transform exactly"""
+    _, vectorizer = model_and_vectorizer
+    featurizer = FastTfidfFeaturizer.from_vectorizer(vectorizer)
+    texts = SAMPLE_TEXTS + [
+        "",
+        "THE and OF",
+        "Anxiety ANXIETY anxiety\tpanic attacks\npanic attacks!!",
+        "Ça va? naïve café 42 don't 😀 feel hopeless",
+        " ".join(SAMPLE_TEXTS) * 20,
+    ]
+
+    expected = vectorizer.transform(texts)
+    actual = featurizer.transform(texts)
+
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual.indptr, expected.indptr)
+    assert np.array_equal(actual.indices, expected.indices)
+    assert np.array_equal(actual.data, expected.data)
+
+
+def test_fast_featurizer_matches_sublinear_trigram_vectorizer():
+    """Sublinear tf and trigrams (the search's 'advanced' configs) match too"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    texts = [text + (" " + text.split()[-1]) * 3 for text in SAMPLE_TEXTS] * 4
+    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 3),
+                                 sublinear_tf=True, min_df=2).fit(texts)
+    featurizer = FastTfidfFeaturizer.from_vectorizer(vectorizer)
+
+    expected = vectorizer.transform(texts)
+    actual = featurizer.transform(texts)
+
+    assert np.array_equal(actual.indices, expected.indices)
+    assert np.allclose(actual.data, expected.data)
+
+
+def test_hashing_featurizer_matches_sklearn_tfidf_pipeline(tmp_path):
+    """Hashed TF-IDF equals HashingVectorizer + TfidfTransformer and serves like any pair"""
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.svm import LinearSVC
+
+    from featurizer import HashingTfidfFeaturizer
+    from inference import compile_pipeline, save_model_pair, load_pipeline
+
+    texts = SAMPLE_TEXTS * 4
+    featurizer = HashingTfidfFeaturizer(n_features=2 ** 10).fit(texts)
+    hasher = HashingVectorizer(n_features=2 ** 10, ngram_range=(1, 2), stop_words="english",
+                               alternate_sign=False, norm=None)
+    expected = TfidfTransformer().fit_transform(hasher.transform(texts))
+
+    assert np.allclose(featurizer.transform(texts).toarray(), expected.toarray())
+
+    model = LinearSVC().fit(featurizer.transform(texts), list(range(5)) * 4)
+    assert compile_pipeline(model, featurizer)[1] is featurizer
+    version = save_model_pair(model, featurizer, str(tmp_path))
+    scorer, loaded = load_pipeline(*find_latest_model_files(str(tmp_path)))
+    assert version and predict_text(SAMPLE_TEXTS[1], scorer, loaded)["class_number"] == 1
+
+
+def test_split_segments_cover_the_text_on_word_boundaries():
+    """Spans are contiguous, cut after spaces, and a short tail is merged"""
+    text = " ".join(SAMPLE_TEXTS * 20)
+    spans = split_segments(text, 200)
+
+    assert spans[0][0] == 0 and spans[-1][1] == len(text)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+    assert all(text[end - 1] == " " for _, end in spans[:-1])
+    assert all(100 <= end - start <= 300 for start, end in spans)
+    assert split_segments("too short", 200) == [(0, 9)]
+
+
+def test_aggregate_segments_weights_raw_scores_by_length(model_and_vectorizer):
+    """The document score is the length-weighted mean of the segment scores"""
+    model, vectorizer = model_and_vectorizer
+    text = SAMPLE_TEXTS[0] + " " + SAMPLE_TEXTS[1] * 3
+    spans = [(0, len(SAMPLE_TEXTS[0]) + 1), (len(SAMPLE_TEXTS[0]) + 1, len(text))]
+    segment_results = predict_batch([text[start:end] for start, end in spans] + ["short"], model, vectorizer)
+
+    result = aggregate_segments(spans + [(len(text), len(text) + 5)], segment_results)
+    weights = np.array([end - start for start, end in spans])
+    raw = np.array([[r["raw_scores"][name] for name in class_names] for r in segment_results[:2]])
+    expected = weights @ raw / weights.sum()
+
+    assert np.allclose([result["raw_scores"][name] for name in class_names], expected)
+    assert result["predicted_class"] == class_names[int(expected.argmax())]
+    assert [s["start"] for s in result["segments"]] == [0, spans[1][0]]  # unscorable segment skipped
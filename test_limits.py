@@ -0,0 +1,60 @@
+"""
+Request Size Limit Tests for Mental Health Classifier
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+
+from limits import PayloadLimitMiddleware
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.post("/predict")
+    async def predict(payload: dict):
+        return {"size": len(payload["text"])}
+
+    @app.post("/stream-predict")
+    async def stream(payload: dict):
+        return {"size": len(payload["text"])}
+
+    app.add_middleware(PayloadLimitMiddleware, max_bytes=100, paths=("/predict",))
+    return app
+
+
+def call(app, path, body, content_length=True):
+    """Send `body` in 16-byte messages; returns (status, messages received)"""
+    messages = [{"type": "http.request", "body": body[i:i + 16], "more_body": i + 16 < len(body)}
+                for i in range(0, len(body), 16)]
+    headers = [(b"content-type", b"application/json")]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers, "query_string": b""}
+    sent, received = [], []
+
+    async def receive():
+        received.append(1)
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], len(received)
+
+
+def test_declared_oversized_bodies_are_rejected_unread():
+    """A Content-Length over the cap is a 413 before any body is received"""
+    app = make_app()
+    assert call(app, "/predict", b'{"text": "%s"}' % (b"a" * 200)) == (413, 0)
+    assert call(app, "/predict", b'{"text": "fits"}')[0] == 200
+    assert call(app, "/stream-predict", b'{"text": "%s"}' % (b"a" * 200))[0] == 200  # uncapped path
+
+
+def test_chunked_bodies_stop_at_the_cap():
+    """Without a Content-Length, reading stops as soon as the cap is passed"""
+    status, chunks_read = call(make_app(), "/predict", b'{"text": "%s"}' % (b"a" * 500), content_length=False)
+    assert status == 413
+    assert chunks_read == 7  # 112 bytes, not all 33 chunks
@@ -0,0 +1,53 @@
+"""
+Tests for the Prometheus-style metrics registry
+Run with: pytest test_metrics.py
+"""
+
+import time
+
+from metrics import MetricsRegistry, StartupTimer
+
+
+def test_counter_and_gauge_render_labels():
+    """Counters accumulate per label set; gauges hold the last value"""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests")
+    in_flight = registry.gauge("in_flight", "Jobs in flight")
+
+    requests.inc(endpoint="/predict", status="200")
+    requests.inc(endpoint="/predict", status="200")
+    in_flight.set(3)
+    in_flight.set(1)
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{endpoint="/predict",status="200"} 2' in text
+    assert "# TYPE in_flight gauge" in text
+    assert "in_flight 1" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    """Bucket counts include every smaller bucket and end with +Inf"""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, stage="transform")
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{stage="transform",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="transform",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{stage="transform",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{stage="transform"} 3' in lines
+    assert 'latency_seconds_sum{stage="transform"} 5.55' in lines
+
+
+def test_startup_timer_records_each_phase_once():
+    """Phases are measured from the given start and never overwritten"""
+    timer = StartupTimer(started_at=time.perf_counter() - 1.0)
+    timer.mark("model_ready")
+    first = timer.phases["model_ready"]
+    timer.mark("model_ready")
+
+    assert first >= 1.0
+    assert timer.phases == {"model_ready": first}
@@ -0,0 +1,32 @@
+"""
+Model Registry Tests for Mental Health Classifier
+"""
+
+from inference import find_latest_model_files, find_model_versions
+from registry import load_version
+
+
+def test_only_matched_pairs_are_versions(tmp_path):
+    """A model without its vectorizer (or vice versa) is never picked"""
+    for name in (
+        "mental_health_svm_model_20250101_000000.pkl",
+        "tfidf_vectorizer_20250101_000000.pkl",
+        "mental_health_svm_model_20260101_000000.pkl",  # vectorizer not published yet
+        "tfidf_vectorizer_20270101_000000.pkl",  # orphan vectorizer
+    ):
+        (tmp_path / name).touch()
+
+    assert find_model_versions(str(tmp_path)) == ["20250101_000000"]
+    model_path, vectorizer_path = find_latest_model_files(str(tmp_path))
+    assert model_path.endswith("mental_health_svm_model_20250101_000000.pkl")
+    assert vectorizer_path.endswith("tfidf_vectorizer_20250101_000000.pkl")
+
+
+def test_load_version_is_warm_and_reports_info():
+    """Loading a version returns a compiled, ready-to-serve pipeline"""
+    version = find_model_versions("models")[-1]
+    loaded = load_version(version, "models")
+
+    assert loaded.version == version
+    assert loaded.info()["model_file"] == f"mental_health_svm_model_{version}.pkl"
+    assert loaded.scorer.decision_function(loaded.featurizer.transform(["feeling anxious"])).shape == (1, 5)
@@ -0,0 +1,32 @@
+"""
+Tests for the compact batch response format
+Run with: pytest test_responses.py
+"""
+
+import numpy as np
+
+from inference import class_names
+from responses import COMPACT_MEDIA_TYPE, decode_compact_batch, encode_compact_batch, wants_compact
+
+
+def test_compact_batch_round_trip():
+    """Class indices and float32 scores survive encoding; short texts are -1/NaN"""
+    scores = [0.1, 0.2, 0.3, 0.15, 0.25]
+    prediction = {
+        "class_number": 2,
+        "confidence_scores": dict(zip(class_names, scores)),
+    }
+
+    class_numbers, matrix = decode_compact_batch(encode_compact_batch([prediction, None]))
+
+    assert class_numbers.tolist() == [2, -1]
+    assert matrix.shape == (2, len(class_names))
+    assert np.allclose(matrix[0], scores)
+    assert np.isnan(matrix[1]).all()
+
+
+def test_wants_compact_parses_accept_header():
+    """Only an explicit Accept for the compact media type opts in"""
+    assert wants_compact(f"application/json;q=0.5, {COMPACT_MEDIA_TYPE}")
+    assert not wants_compact("application/json")
+    assert not wants_compact(None)
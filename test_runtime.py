@@ -0,0 +1,62 @@
+"""
+Runtime Backend Tests for Mental Health Classifier
+Parity of the numpy-only backend with the scikit-learn pipeline
+"""
+
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pytest
+
+from artifacts import export_compiled
+from inference import find_latest_model_files, predict_batch, score_texts
+from runtime import load_runtime
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    """The shipped pair plus its compiled export loaded by the runtime backend"""
+    model_path, vectorizer_path = find_latest_model_files("models")
+    model, vectorizer = joblib.load(model_path), joblib.load(vectorizer_path)
+    compiled_dir = str(tmp_path_factory.mktemp("compiled"))
+    export_compiled(model, vectorizer, compiled_dir)
+    return model, vectorizer, compiled_dir
+
+
+def held_out_texts(vectorizer, count=300, seed=7):
+    """Texts the test has never scored: random vocabulary draws of varied length"""
+    rng = np.random.default_rng(seed)
+    words = vectorizer.get_feature_names_out()
+    texts = [" ".join(rng.choice(words, size=rng.integers(1, 80))) for _ in range(count)]
+    return texts + ["", "the and of", "Ça va? naïve café 😀 feel hopeless"]
+
+
+def test_runtime_matches_sklearn_on_held_out_texts(exported):
+    """Decision scores and predicted classes match sklearn for every text"""
+    model, vectorizer, compiled_dir = exported
+    scorer, featurizer = load_runtime(compiled_dir)
+    texts = held_out_texts(vectorizer)
+
+    predictions, decision_scores, _ = score_texts(texts, scorer, featurizer)
+    X = vectorizer.transform(texts)
+
+    assert np.allclose(decision_scores, model.decision_function(X), rtol=0, atol=1e-12)
+    assert list(predictions) == list(model.predict(X))
+    assert predict_batch(["short", texts[0]], scorer, featurizer)[0] is None
+
+
+def test_runtime_imports_only_numpy(exported):
+    """Loading and scoring with the runtime never imports sklearn, scipy or joblib"""
+    _, _, compiled_dir = exported
+    code = (
+        "import sys\n"
+        "from runtime import load_runtime\n"
+        "from inference import predict_text\n"
+        f"scorer, featurizer = load_runtime({compiled_dir!r})\n"
+        "predict_text('I feel so sad and hopeless', scorer, featurizer)\n"
+        "print(','.join(m for m in ('sklearn', 'scipy', 'joblib') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
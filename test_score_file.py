@@ -0,0 +1,61 @@
+"""
+Bulk File Scoring Tests for Mental Health Classifier
+"""
+
+import pandas as pd
+import pytest
+
+from inference import find_latest_model_files, load_pipeline
+from score_file import score_chunk, score_file
+
+
+def test_score_csv_keeps_rows_in_order(tmp_path):
+    """Every input row comes back, in order, with a class and confidences"""
+    texts = [
+        "I feel so sad and hopeless, nothing makes me happy anymore",
+        "short",
+        "I feel extremely anxious about everything, my heart races",
+    ] * 5
+    input_path = tmp_path / "input.csv"
+    output_path = tmp_path / "output.csv"
+    pd.DataFrame({"id": range(len(texts)), "content": texts}).to_csv(input_path, index=False)
+
+    rows, dedup_ratio, _ = score_file(str(input_path), str(output_path), chunk_size=4, workers=1)
+    result = pd.read_csv(output_path)
+
+    assert rows == len(texts)
+    assert dedup_ratio > 0  # repeats within a chunk are scored once
+    assert result["id"].tolist() == list(range(len(texts)))
+    assert (result.loc[result["content"] == "short", "predicted_class"] == "ERROR").all()
+    scored = result[result["class_number"] >= 0].filter(like="confidence_")
+    assert scored.sum(axis=1).round(6).eq(1.0).all()
+
+
+def test_score_chunk_with_explicit_pipeline():
+    """The app scores uploads in-process by passing its own pipeline"""
+    scorer, featurizer = load_pipeline(*find_latest_model_files("models"))
+    class_numbers, confidences, n_scored = score_chunk(
+        ["short", "I feel extremely anxious about everything", "I feel  EXTREMELY anxious about everything"],
+        scorer, featurizer,
+    )
+
+    assert class_numbers[0] == -1 and class_numbers[1] >= 0
+    assert abs(confidences[1].sum() - 1.0) < 1e-6
+    assert n_scored == 1 and class_numbers[2] == class_numbers[1]
+
+
+def test_score_parquet_round_trip(tmp_path):
+    """Parquet in, Parquet out, with the same columns as CSV scoring"""
+    pytest.importorskip("pyarrow")
+    texts = ["I feel so sad and hopeless, nothing makes me happy anymore", "short"] * 3
+    input_path = tmp_path / "input.parquet"
+    output_path = tmp_path / "output.parquet"
+    pd.DataFrame({"id": range(len(texts)), "content": texts}).to_parquet(input_path, index=False)
+
+    rows, _, _ = score_file(str(input_path), str(output_path), chunk_size=4, workers=1)
+    result = pd.read_parquet(output_path)
+
+    assert rows == len(result) == len(texts)
+    assert result["id"].tolist() == list(range(len(texts)))
+    assert result["predicted_class"].tolist()[1::2] == ["ERROR"] * 3
+    assert result.filter(like="confidence_").iloc[0].sum().round(6) == 1.0
@@ -0,0 +1,43 @@
+"""
+Persistent Prediction Store Tests for Mental Health Classifier
+"""
+
+from cache import text_key
+from store import PredictionStore
+
+RESULT = {"predicted_class": "Anxiety", "class_number": 4, "confidence_scores": {"Anxiety": 0.9}}
+
+
+def test_results_are_shared_across_connections_and_restarts(tmp_path):
+    """A second process (here a second connection) reads what the first flushed"""
+    path = str(tmp_path / "predictions.db")
+    writer = PredictionStore(path, batch_size=2, flush_interval=3600)
+    key = text_key("I feel SO anxious", "v1")
+
+    writer.put(key, RESULT)
+    reader = PredictionStore(path)
+    assert writer.get(key) == RESULT  # pending results are visible locally
+    assert reader.get(key) is None  # but not written yet
+
+    writer.put(text_key("I feel sad", "v1"), RESULT)  # fills the batch
+    assert reader.get(text_key("i feel so  anxious", "v1")) == RESULT
+    assert reader.get(text_key("I feel SO anxious", "v2")) is None
+
+    writer.close()
+    assert PredictionStore(path).stats()["size"] == 2
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    """Once over max_entries, rows not written or read recently go first"""
+    store = PredictionStore(str(tmp_path / "predictions.db"), max_entries=2, batch_size=1)
+    store.put("v1:a", RESULT)
+    store.put("v1:b", RESULT)
+    assert store.get_many(["v1:a", "v1:missing"]) == {"v1:a": RESULT}
+
+    store.put("v1:c", RESULT)  # this flush also records the read of "a"
+    assert sorted(store.get_many(["v1:a", "v1:b", "v1:c"])) == ["v1:a", "v1:c"]
+    assert store.stats()["evictions"] == 1
+
+    store.put("v1:c", RESULT)  # replacing a row does not grow the table
+    assert store.stats()["size"] == 2
+    assert PredictionStore(store.path).stats()["size"] == 2  # the count is shared on disk
@@ -0,0 +1,41 @@
+"""
+NDJSON Streaming Tests for Mental Health Classifier
+"""
+
+import asyncio
+
+from streaming import iter_chunks, iter_ndjson_records, skip_until
+
+
+async def byte_stream(*blocks):
+    for block in blocks:
+        yield block
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_records_split_across_blocks():
+    """Lines that span byte chunk boundaries are reassembled"""
+    stream = byte_stream(b'{"id": 1, "text": "first', b' text"}\n\n{"id": 2, ', b'"text": "second"}')
+    records = asyncio.run(collect(iter_ndjson_records(stream)))
+    assert records == [{"id": 1, "text": "first text"}, {"id": 2, "text": "second"}]
+
+
+def test_bad_lines_become_error_records():
+    """Malformed lines are reported instead of aborting the stream"""
+    stream = byte_stream(b'not json\n{"text": "no id"}\n{"id": 3}\n')
+    records = asyncio.run(collect(iter_ndjson_records(stream)))
+    assert [r["id"] for r in records] == [None, None, 3]
+    assert all("error" in r for r in records)
+
+
+def test_resume_and_chunking():
+    """Resuming skips through the acknowledged id, then records are chunked"""
+    async def records():
+        for i in range(7):
+            yield {"id": i, "text": str(i)}
+
+    chunks = asyncio.run(collect(iter_chunks(skip_until(records(), "2"), 3)))
+    assert [[r["id"] for r in chunk] for chunk in chunks] == [[3, 4, 5], [6]]
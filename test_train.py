@@ -0,0 +1,69 @@
+"""
+Tests for the cached hyperparameter search
+Run with: pytest test_train.py
+"""
+
+import os
+
+import numpy as np
+
+from inference import find_latest_model_files, load_pipeline, predict_text
+from train import export_best, run_search
+
+CLASS_WORDS = [
+    "deadline pressure work exams overwhelmed",
+    "hopeless empty sad worthless numb",
+    "manic euphoric racing sleepless impulsive",
+    "identity unstable abandonment relationships trust",
+    "panic worry heart racing nervous",
+]
+
+GRIDS = {"SVM": {"C": [0.1, 1], "dual": [False]}, "LogisticRegression": {"C": [1]}}
+
+
+def make_dataset(per_class=20, seed=0):
+    rng = np.random.default_rng(seed)
+    texts, labels = [], []
+    for label, words in enumerate(CLASS_WORDS):
+        vocab = words.split() + ["today", "really", "feel", "always"]
+        for _ in range(per_class):
+            texts.append(" ".join(rng.choice(vocab, size=12)))
+            labels.append(label)
+    return texts, labels
+
+
+def test_search_caches_fits_and_exports_servable_pair(tmp_path):
+    """A second run reuses cached scores; the export loads through inference.py"""
+    texts, labels = make_dataset()
+    cache_dir, models_dir = str(tmp_path / "cache"), str(tmp_path / "models")
+    kwargs = dict(cache_dir=cache_dir, configs=["basic", "advanced"],
+                  estimators=["SVM", "LogisticRegression"], param_grids=GRIDS, n_jobs=1)
+
+    results, split = run_search(texts, labels, **kwargs)
+    score_files = sorted(os.listdir(os.path.join(cache_dir, "scores")))
+    assert len(results) == 2 * 3
+    assert len(score_files) == 2 * 3 * 3  # configs x grid points x folds
+
+    cached_results, _ = run_search(texts, labels, **kwargs)
+    assert sorted(os.listdir(os.path.join(cache_dir, "scores"))) == score_files
+    assert [r["cv_mean"] for r in cached_results] == [r["cv_mean"] for r in results]
+
+    summary = export_best(texts, labels, results, split, cache_dir=cache_dir, models_dir=models_dir)
+    assert summary["test_accuracy"] > 0.8
+
+    scorer, featurizer = load_pipeline(*find_latest_model_files(models_dir))
+    assert predict_text("panic worry nervous heart racing", scorer, featurizer)["class_number"] == 4
+
+
+def test_cache_is_not_reused_across_fold_counts(tmp_path):
+    """Folds of a 2-fold run hold other rows than a 3-fold run's, so nothing is shared"""
+    texts, labels = make_dataset()
+    kwargs = dict(configs=["basic"], estimators=["SVM"], param_grids=GRIDS, n_jobs=1)
+    shared = str(tmp_path / "shared")
+
+    run_search(texts, labels, cache_dir=shared, n_folds=2, **kwargs)
+    results, _ = run_search(texts, labels, cache_dir=shared, n_folds=3, **kwargs)
+    fresh, _ = run_search(texts, labels, cache_dir=str(tmp_path / "fresh"), n_folds=3, **kwargs)
+
+    assert len(os.listdir(os.path.join(shared, "scores"))) == 2 * (2 + 3)  # grid points x folds
+    assert [r["cv_mean"] for r in results] == [r["cv_mean"] for r in fresh]
@@ -0,0 +1,51 @@
+"""
+Tests for incremental model updates
+Run with: pytest test_train_incremental.py
+"""
+
+import json
+import os
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.svm import LinearSVC
+
+from inference import find_model_versions, load_pipeline, model_files_for_version, predict_text, save_model_pair
+from test_train import make_dataset
+from train_incremental import incremental_update
+
+
+def publish_base(models_dir):
+    texts, labels = make_dataset(seed=0)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    model = LinearSVC().fit(vectorizer.fit_transform(texts), labels)
+    return save_model_pair(model, vectorizer, models_dir)
+
+
+def test_incremental_update_warm_starts_and_chains(tmp_path):
+    """Updates keep the vocabulary, stay accurate and continue from each other"""
+    models_dir = str(tmp_path)
+    base = publish_base(models_dir)
+    texts, labels = make_dataset(seed=1)
+    holdout = make_dataset(seed=2)
+
+    first = incremental_update(texts, labels, models_dir=models_dir, holdout=holdout)
+    assert first["base_version"] == base
+    assert first["holdout_accuracy_after"] >= first["holdout_accuracy_before"] - 0.05
+
+    # Only one class in the next batch: partial_fit still knows all five
+    second = incremental_update(texts[:20], labels[:20], models_dir=models_dir)
+    assert second["base_version"] == first["version"]
+    assert find_model_versions(models_dir) == [base, first["version"], second["version"]]
+
+    base_vectorizer = joblib.load(model_files_for_version(base, models_dir)[1])
+    model_path, vectorizer_path = model_files_for_version(second["version"], models_dir)
+    assert joblib.load(vectorizer_path).vocabulary_ == base_vectorizer.vocabulary_
+    assert joblib.load(model_path).t_ > len(labels)
+
+    scorer, featurizer = load_pipeline(model_path, vectorizer_path)
+    assert predict_text("panic worry nervous heart racing", scorer, featurizer)["class_number"] == 4
+    with open(os.path.join(models_dir, f"incremental_{second['version']}.json")) as f:
+        assert json.load(f)["rows"] == 20
+    assert np.isclose(first["eta0"], 0.01)
@@ -0,0 +1,336 @@
+"""
+Hyperparameter Search for Mental Health Classifier
+Scripted, cached and parallel replacement for the notebook GridSearchCV
+
+TF-IDF features are fitted once per (vectorizer config, fold) and cached on
+disk as sparse .npz files, so every estimator and grid point of a fold reuses
+the same matrices instead of re-vectorizing inside each CV split. Fit scores
+are cached as well: a repeated or interrupted run only fits what is missing.
+The best servable model is refit on the full training split, checked on the
+hold-out split and exported as models/mental_health_svm_model_<ts>.pkl +
+tfidf_vectorizer_<ts>.pkl, the pair that api.py and app.py load.
+
+Run with: python train.py data/cleaned_data.csv [--jobs -1] [--compile]
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.svm import LinearSVC
+
+from featurizer import HashingTfidfFeaturizer
+from inference import model_files_for_version, save_model_pair
+
+# Vectorizer configurations compared in 03_advanced_model.ipynb
+VECTORIZER_CONFIGS = {
+    "basic": {"max_features": 5000, "stop_words": "english", "ngram_range": (1, 1)},
+    "bigrams": {"max_features": 5000, "stop_words": "english", "ngram_range": (1, 2)},
+    "trigrams": {"max_features": 7000, "stop_words": "english", "ngram_range": (1, 3)},
+    "advanced": {
+        "max_features": 10000,
+        "stop_words": "english",
+        "ngram_range": (1, 2),
+        "min_df": 2,
+        "max_df": 0.9,
+        "sublinear_tf": True,
+        "norm": "l2",
+    },
+    # No vocabulary: terms are hashed into buckets (featurizer.HashingTfidfFeaturizer)
+    "hashing": {"featurizer": "hashing", "n_features": 2 ** 14, "stop_words": "english", "ngram_range": (1, 2)},
+}
+
+ESTIMATORS = {
+    "SVM": lambda **params: LinearSVC(random_state=42, **params),
+    "LogisticRegression": lambda **params: LogisticRegression(random_state=42, **params),
+    "RandomForest": lambda **params: RandomForestClassifier(random_state=42, **params),
+}
+
+PARAM_GRIDS = {
+    "SVM": {
+        "C": [0.1, 1, 10, 100],
+        "max_iter": [1000, 2000, 3000],
+        "dual": [False],
+    },
+    "LogisticRegression": {
+        "C": [0.1, 1, 10, 100],
+        "max_iter": [500, 1000, 2000],
+        # liblinear no longer fits multiclass problems directly
+        "solver": ["lbfgs", "saga"],
+    },
+    "RandomForest": {
+        "n_estimators": [100, 200, 300],
+        "max_depth": [10, 20, None],
+        "min_samples_split": [2, 5, 10],
+    },
+}
+
+# Only linear models can be served by the LinearKernel in inference.py
+SERVABLE = ("SVM", "LogisticRegression")
+
+def dataset_fingerprint(texts, labels) -> str:
+    """Hash of the training data, so cached features never outlive it"""
+    digest = hashlib.sha256()
+    for text, label in zip(texts, labels):
+        digest.update(f"{label}\t{text}\0".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _key(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _indices_key(idx) -> str:
+    return hashlib.sha256(np.asarray(idx, dtype=np.int64).tobytes()).hexdigest()[:16]
+
+
+def expand_grid(grid):
+    """All parameter combinations of a GridSearchCV-style grid"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+class FeatureCache:
+    """
+    On-disk TF-IDF matrices per (data, vectorizer config, train/val split)
+
+    Splits are keyed by their row indices, so a run with another fold count,
+    test size or seed never reuses matrices (or scores) fit on other rows.
+
+    Each entry is a directory prefix with X_train.npz, X_val.npz, y_train.npy
+    and y_val.npy; the full-training-split entry also keeps the fitted
+    vectorizer for export.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(os.path.join(cache_dir, "features"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "scores"), exist_ok=True)
+
+    def features_path(self, fingerprint, config_name, train_idx, val_idx):
+        config = VECTORIZER_CONFIGS[config_name]
+        return os.path.join(self.cache_dir, "features",
+                            _key(fingerprint, config, _indices_key(train_idx), _indices_key(val_idx)))
+
+    def score_path(self, features_path, estimator_name, params):
+        return os.path.join(self.cache_dir, "scores",
+                            _key(os.path.basename(features_path), estimator_name, params) + ".json")
+
+
+def make_vectorizer(config_name):
+    """Unfitted vectorizer for one of VECTORIZER_CONFIGS"""
+    config = dict(VECTORIZER_CONFIGS[config_name])
+    if config.pop("featurizer", "tfidf") == "hashing":
+        return HashingTfidfFeaturizer(**config)
+    return TfidfVectorizer(**config)
+
+
+def build_features(texts, labels, train_idx, val_idx, config_name, path):
+    """Fit one vectorizer on the training indices and cache both matrices"""
+    if os.path.exists(path + "_done"):
+        return path
+
+    vectorizer = make_vectorizer(config_name)
+    X_train = vectorizer.fit_transform([texts[i] for i in train_idx])
+    X_val = vectorizer.transform([texts[i] for i in val_idx])
+
+    sp.save_npz(path + "_X_train.npz", X_train, compressed=False)
+    sp.save_npz(path + "_X_val.npz", X_val, compressed=False)
+    np.save(path + "_y_train.npy", labels[train_idx])
+    np.save(path + "_y_val.npy", labels[val_idx])
+    joblib.dump(vectorizer, path + "_vectorizer.pkl")
+    # Written last: a half-written entry from an interrupted run is rebuilt
+    open(path + "_done", "w").close()
+    return path
+
+
+def load_features(path):
+    return (
+        sp.load_npz(path + "_X_train.npz"),
+        sp.load_npz(path + "_X_val.npz"),
+        np.load(path + "_y_train.npy"),
+        np.load(path + "_y_val.npy"),
+    )
+
+
+def fit_and_score(features_path, estimator_name, params, score_path):
+    """Fit one estimator on one cached fold; returns validation accuracy"""
+    if os.path.exists(score_path):
+        with open(score_path, encoding="utf-8") as f:
+            return json.load(f)["accuracy"]
+
+    X_train, X_val, y_train, y_val = load_features(features_path)
+    start = time.perf_counter()
+    model = ESTIMATORS[estimator_name](**params).fit(X_train, y_train)
+    accuracy = float(accuracy_score(y_val, model.predict(X_val)))
+
+    tmp_path = score_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"accuracy": accuracy, "fit_seconds": time.perf_counter() - start}, f)
+    os.replace(tmp_path, score_path)
+    return accuracy
+
+
+def run_search(texts, labels, cache_dir="cache/train", configs=None, estimators=None,
+               param_grids=None, n_folds=3, n_jobs=-1, test_size=0.2):
+    """
+    Cross-validate every (config, estimator, params) combination
+
+    Returns (results, split): results are dicts sorted best first with the
+    mean CV accuracy, split is (fingerprint, train_idx, test_idx).
+    """
+    texts = list(texts)
+    labels = np.asarray(labels)
+    configs = configs or list(VECTORIZER_CONFIGS)
+    estimators = estimators or list(ESTIMATORS)
+    param_grids = param_grids or PARAM_GRIDS
+    cache = FeatureCache(cache_dir)
+    fingerprint = dataset_fingerprint(texts, labels)
+
+    indices = np.arange(len(texts))
+    train_idx, test_idx = train_test_split(indices, test_size=test_size, random_state=42, stratify=labels)
+    folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42)
+    fold_splits = [
+        (train_idx[fit], train_idx[val])
+        for fit, val in folds.split(train_idx, labels[train_idx])
+    ]
+
+    parallel = Parallel(n_jobs=n_jobs)
+
+    # Stage 1: one vectorizer fit per (config, fold), cached on disk
+    feature_jobs = [
+        (config, fold, fit_idx, val_idx)
+        for config in configs
+        for fold, (fit_idx, val_idx) in enumerate(fold_splits)
+    ]
+    print(f"⚙️  Vectorizing {len(configs)} configs x {n_folds} folds")
+    paths = parallel(
+        delayed(build_features)(texts, labels, fit_idx, val_idx, config,
+                                cache.features_path(fingerprint, config, fit_idx, val_idx))
+        for config, fold, fit_idx, val_idx in feature_jobs
+    )
+    feature_paths = {(config, fold): path for (config, fold, _, _), path in zip(feature_jobs, paths)}
+
+    # Stage 2: every estimator and grid point shares those matrices
+    fit_jobs = [
+        (config, estimator, params, fold)
+        for config in configs
+        for estimator in estimators
+        for params in expand_grid(param_grids[estimator])
+        for fold in range(n_folds)
+    ]
+    print(f"⚙️  Fitting {len(fit_jobs)} models on {n_jobs} jobs")
+    scores = parallel(
+        delayed(fit_and_score)(
+            feature_paths[config, fold], estimator, params,
+            cache.score_path(feature_paths[config, fold], estimator, params),
+        )
+        for config, estimator, params, fold in fit_jobs
+    )
+
+    grouped = {}
+    for (config, estimator, params, _), score in zip(fit_jobs, scores):
+        grouped.setdefault((config, estimator, json.dumps(params, sort_keys=True)), []).append(score)
+
+    results = [
+        {
+            "config": config,
+            "estimator": estimator,
+            "params": json.loads(params),
+            "cv_mean": float(np.mean(fold_scores)),
+            "cv_std": float(np.std(fold_scores)),
+        }
+        for (config, estimator, params), fold_scores in grouped.items()
+    ]
+    results.sort(key=lambda r: r["cv_mean"], reverse=True)
+    return results, (fingerprint, train_idx, test_idx)
+
+
+def export_best(texts, labels, results, split, cache_dir="cache/train", models_dir="models",
+                compile_artifacts=False):
+    """
+    Refit the best servable candidate on the full training split, score it on
+    the hold-out split and write the model/vectorizer pair; returns a summary
+    """
+    texts = list(texts)
+    labels = np.asarray(labels)
+    fingerprint, train_idx, test_idx = split
+    cache = FeatureCache(cache_dir)
+
+    if results[0]["estimator"] not in SERVABLE:
+        print(f"⚠️ Best candidate {results[0]['estimator']} cannot be served, exporting the best linear model")
+    best = next(r for r in results if r["estimator"] in SERVABLE)
+
+    path = build_features(texts, labels, train_idx, test_idx, best["config"],
+                          cache.features_path(fingerprint, best["config"], train_idx, test_idx))
+    X_train, X_test, y_train, y_test = load_features(path)
+    model = ESTIMATORS[best["estimator"]](**best["params"]).fit(X_train, y_train)
+    vectorizer = joblib.load(path + "_vectorizer.pkl")
+    test_accuracy = float(accuracy_score(y_test, model.predict(X_test)))
+
+    timestamp = save_model_pair(model, vectorizer, models_dir)
+    model_path, vectorizer_path = model_files_for_version(timestamp, models_dir)
+
+    if compile_artifacts and not hasattr(vectorizer, "vocabulary_"):
+        print("⚠️ Warning: hashing featurizers have no compiled format, skipping --compile")
+    elif compile_artifacts:
+        from artifacts import compiled_dir_for, export_compiled
+
+        export_compiled(model, vectorizer, compiled_dir_for(model_path))
+
+    summary = {**best, "test_accuracy": test_accuracy, "version": timestamp,
+               "model_path": model_path, "vectorizer_path": vectorizer_path}
+    with open(os.path.join(models_dir, f"search_{timestamp}.json"), "w", encoding="utf-8") as f:
+        json.dump({"best": summary, "results": results}, f, indent=2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cached, parallel hyperparameter search")
+    parser.add_argument("data", help="CSV with content and target columns")
+    parser.add_argument("--models-dir", default="models", help="Where to export the best pair")
+    parser.add_argument("--cache-dir", default="cache/train", help="Feature and score cache")
+    parser.add_argument("--configs", nargs="+", choices=list(VECTORIZER_CONFIGS), default=None)
+    parser.add_argument("--estimators", nargs="+", choices=list(ESTIMATORS), default=None)
+    parser.add_argument("--folds", type=int, default=3, help="CV folds (default: 3)")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel jobs (default: all cores)")
+    parser.add_argument("--compile", action="store_true", help="Also export compiled artifacts")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.data).dropna(subset=["content", "target"])
+    start = time.perf_counter()
+    results, split = run_search(
+        df["content"].astype(str), df["target"].astype(int),
+        cache_dir=args.cache_dir, configs=args.configs, estimators=args.estimators,
+        n_folds=args.folds, n_jobs=args.jobs,
+    )
+
+    print(f"\n{'config':>10} {'estimator':>20} {'CV mean':>8} {'CV std':>7}  params")
+    for r in results[:10]:
+        print(f"{r['config']:>10} {r['estimator']:>20} {r['cv_mean']:>8.4f} {r['cv_std']:>7.4f}  {r['params']}")
+
+    summary = export_best(df["content"].astype(str), df["target"].astype(int), results, split,
+                          cache_dir=args.cache_dir, models_dir=args.models_dir,
+                          compile_artifacts=args.compile)
+    print(f"\n🏆 {summary['estimator']} on '{summary['config']}' features: "
+          f"CV {summary['cv_mean']:.4f}, hold-out {summary['test_accuracy']:.4f}")
+    print(f"✅ Model saved: {summary['model_path']}")
+    print(f"✅ Vectorizer saved: {summary['vectorizer_path']}")
+    print(f"⏱️  Finished in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Incremental Training for Mental Health Classifier
+Updates the served model from newly labeled batches without a full retrain
+
+The base version's fitted vectorizer is reused as a fixed vocabulary (its
+terms and idf weights never change), so an update only vectorizes the new
+rows. The classifier is a hinge-loss SGDClassifier, i.e. a linear SVM
+trained with partial_fit: the first update warm-starts it from the base
+model's coefficients (LinearSVC or LogisticRegression), later updates
+continue from the previous SGD model. Every update is written as a new
+timestamped pair that api.py and app.py load like any other version, plus
+an incremental_<ts>.json record of its lineage.
+
+Run with: python train_incremental.py feedback.csv [--base VERSION] [--holdout test.csv]
+"""
+
+import argparse
+import copy
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+
+from inference import find_model_versions, model_files_for_version, save_model_pair
+
+
+def make_learner(base_model, alpha=1e-4, eta0=0.01):
+    """
+    SGD learner that continues from `base_model`
+
+    A previous SGD model is copied as-is. Any other linear model seeds a new
+    learner with its coefficients. The learning rate is constant and small:
+    the "optimal" schedule starts with steps large enough to wipe out the
+    warm start on the first batch.
+    """
+    if isinstance(base_model, SGDClassifier):
+        return copy.deepcopy(base_model)
+
+    learner = SGDClassifier(loss="hinge", alpha=alpha, learning_rate="constant",
+                            eta0=eta0, random_state=42)
+    # partial_fit keeps existing coefficients instead of allocating zeros
+    learner.coef_ = np.array(base_model.coef_, dtype=np.float64, order="C")
+    learner.intercept_ = np.array(base_model.intercept_, dtype=np.float64)
+    learner.n_features_in_ = learner.coef_.shape[1]
+    learner.classes_ = np.asarray(base_model.classes_)
+    return learner
+
+
+def update_model(learner, vectorizer, texts, labels, epochs=1, batch_size=256, seed=42):
+    """Run `epochs` shuffled passes of partial_fit over the new rows"""
+    labels = np.asarray(labels)
+    unknown = set(labels.tolist()) - set(learner.classes_.tolist())
+    if unknown:
+        raise ValueError(f"Labels {sorted(unknown)} are not classes of the base model")
+
+    X = vectorizer.transform(list(texts))
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        order = rng.permutation(X.shape[0])
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            learner.partial_fit(X[rows], labels[rows], classes=learner.classes_)
+    return learner
+
+
+def evaluate(model, vectorizer, texts, labels):
+    return float(accuracy_score(labels, model.predict(vectorizer.transform(list(texts)))))
+
+
+def incremental_update(texts, labels, models_dir="models", base_version=None, epochs=1,
+                       alpha=1e-4, eta0=0.01, holdout=None):
+    """
+    Update `base_version` (default: latest) with new labeled rows and export
+    the result as a new version; returns a summary dict
+    """
+    if base_version is None:
+        versions = find_model_versions(models_dir)
+        if not versions:
+            raise FileNotFoundError(f"Model files not found in {models_dir}/")
+        base_version = versions[-1]
+
+    model_path, vectorizer_path = model_files_for_version(base_version, models_dir)
+    base_model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+
+    learner = make_learner(base_model, alpha=alpha, eta0=eta0)
+    accuracy_before = evaluate(base_model, vectorizer, *holdout) if holdout else None
+    update_model(learner, vectorizer, texts, labels, epochs=epochs)
+    accuracy_after = evaluate(learner, vectorizer, *holdout) if holdout else None
+
+    version = save_model_pair(learner, vectorizer, models_dir)
+    summary = {
+        "version": version,
+        "base_version": base_version,
+        "rows": len(labels),
+        "epochs": epochs,
+        "alpha": learner.alpha,
+        "eta0": learner.eta0,
+        "holdout_accuracy_before": accuracy_before,
+        "holdout_accuracy_after": accuracy_after,
+    }
+    with open(os.path.join(models_dir, f"incremental_{version}.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def read_labeled(path):
+    df = pd.read_csv(path).dropna(subset=["content", "target"])
+    return df["content"].astype(str).tolist(), df["target"].astype(int).to_numpy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the model with newly labeled data")
+    parser.add_argument("data", help="CSV of new labeled rows (content, target)")
+    parser.add_argument("--models-dir", default="models", help="Directory with the model versions")
+    parser.add_argument("--base", default=None, help="Version to update (default: latest)")
+    parser.add_argument("--holdout", default=None, help="Labeled CSV to report accuracy before/after on")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the new rows (default: 1)")
+    parser.add_argument("--alpha", type=float, default=1e-4, help="L2 regularization (default: 1e-4)")
+    parser.add_argument("--eta0", type=float, default=0.01, help="Constant learning rate (default: 0.01)")
+    args = parser.parse_args(argv)
+
+    texts, labels = read_labeled(args.data)
+    summary = incremental_update(
+        texts, labels,
+        models_dir=args.models_dir,
+        base_version=args.base,
+        epochs=args.epochs,
+        alpha=args.alpha,
+        eta0=args.eta0,
+        holdout=read_labeled(args.holdout) if args.holdout else None,
+    )
+
+    print(f"✅ Updated {summary['base_version']} with {summary['rows']:,} rows -> {summary['version']}")
+    if args.holdout:
+        print(f"📊 Hold-out accuracy: {summary['holdout_accuracy_before']:.4f} -> "
+              f"{summary['holdout_accuracy_after']:.4f}")
+
+
+if __name__ == "__main__":
+    main()